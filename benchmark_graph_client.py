@@ -0,0 +1,146 @@
+"""Requests-per-second benchmark of SmartURLManager.process_request.
+
+Spawns `server.py` over stdio in a scratch directory with its external APIs pointed at
+the local HTTP stand-in (fixture_server.py), then pushes a mix of validate, analyze and
+shorten requests through the LangGraph workflow with a fixed number in flight:
+
+    python benchmark_graph_client.py --requests 64 --concurrency 8
+    python benchmark_graph_client.py --mode per-request --requests 8
+
+`--mode shared` (default) sends every request through one manager, so requests share
+the compiled workflow and the session pool. `--mode per-request` builds a new manager
+(new graph and new server sessions) for each request, which is how
+run_smart_url_manager used to work. `--no-checkpoints` runs without the SQLite
+checkpointer, to measure what checkpointing each node costs.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+from fixture_server import FixtureServer, fixture_env
+from benchmark_tools import SERVER_PATH, percentile, git_commit
+
+DEFAULT_REQUESTS = 64
+DEFAULT_CONCURRENCY = 8
+DEFAULT_WARMUP_REQUESTS = 4
+DEFAULT_URLS_PER_REQUEST = 5
+REQUEST_KINDS = ('validate', 'analyze', 'shorten')
+
+def make_requests(fixture: str, count: int, urls_per_request: int, offset: int = 0) -> list:
+    """User requests cycling through REQUEST_KINDS, each with its own fixture URLs"""
+    requests = []
+    for i in range(offset, offset + count):
+        urls = ' '.join(f"{fixture}/page?title=Request{i}&n={j}" for j in range(urls_per_request))
+        requests.append(f"Please {REQUEST_KINDS[i % len(REQUEST_KINDS)]} these links: {urls}")
+    return requests
+
+def request_failed(summary: str) -> bool:
+    return "Errors Encountered" in summary or "Validation failed" in summary
+
+async def run_benchmark(args) -> dict:
+    from fastmcp.client.transports import StdioTransport
+    from url_manager_graph_client import SmartURLManager
+    from graph_checkpoints import DEFAULT_CHECKPOINT_DB
+
+    with FixtureServer(latency_ms=args.latency_ms) as fixture:
+        # A scratch directory keeps the benchmark away from the real urls.db and caches
+        with tempfile.TemporaryDirectory() as workdir:
+            env = {**os.environ, **fixture_env(fixture.base_url)}
+
+            def new_manager() -> SmartURLManager:
+                # A stdio transport instance serves one session, so the pool gets a factory
+                return SmartURLManager(lambda: StdioTransport(command=sys.executable, args=[SERVER_PATH],
+                                                              env=env, cwd=workdir),
+                                       pool_size=args.pool_size,
+                                       checkpoint_db=None if args.no_checkpoints else os.path.join(workdir, DEFAULT_CHECKPOINT_DB))
+
+            latencies = []
+            errors = 0
+            slots = asyncio.Semaphore(args.concurrency)
+            shared = new_manager() if args.mode == 'shared' else None
+
+            async def run(user_input: str, measured: bool):
+                nonlocal errors
+                async with slots:
+                    started = time.perf_counter()
+                    try:
+                        if shared:
+                            summary = await shared.process_request(user_input)
+                        else:
+                            async with new_manager() as manager:
+                                summary = await manager.process_request(user_input)
+                        failed = request_failed(summary)
+                    except Exception:
+                        failed = True
+                    if measured:
+                        latencies.append(time.perf_counter() - started)
+                        errors += failed
+
+            try:
+                warmup = make_requests(fixture.base_url, args.warmup, args.urls_per_request, offset=args.requests)
+                await asyncio.gather(*(run(user_input, False) for user_input in warmup))
+
+                started = time.perf_counter()
+                requests = make_requests(fixture.base_url, args.requests, args.urls_per_request)
+                await asyncio.gather(*(run(user_input, True) for user_input in requests))
+                wall_seconds = time.perf_counter() - started
+                pool_stats = shared.sessions.stats() if shared else {}
+            finally:
+                if shared:
+                    await shared.aclose()
+
+    latencies.sort()
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': git_commit(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'requests': args.requests,
+        'errors': errors,
+        'wall_seconds': wall_seconds,
+        'requests_per_second': args.requests / wall_seconds if wall_seconds else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.5) * 1000,
+            'p90': percentile(latencies, 0.9) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': latencies[-1] * 1000 if latencies else 0.0
+        },
+        'pool': pool_stats
+    }
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark concurrent SmartURLManager requests")
+    parser.add_argument("--mode", choices=('shared', 'per-request'), default='shared')
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS, help="measured requests")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP_REQUESTS, help="unmeasured requests run first")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="requests in flight")
+    parser.add_argument("--pool-size", type=int, default=4, help="server sessions per manager")
+    parser.add_argument("--urls-per-request", type=int, default=DEFAULT_URLS_PER_REQUEST)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency the stand-in adds to every response")
+    parser.add_argument("--no-checkpoints", action="store_true", help="run the workflow without checkpoints")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    print("🏁 Smart URL Manager Throughput")
+    print("=" * 50)
+    print(f"{args.requests} requests ({args.urls_per_request} URLs each), {args.concurrency} in flight, "
+          f"{args.mode} manager")
+    results = asyncio.run(run_benchmark(args))
+
+    latency = results['latency_ms']
+    print(f"\n📊 {results['requests_per_second']:.2f} requests/s over {results['wall_seconds']:.1f}s  "
+          f"p50 {latency['p50']:.0f} ms  p90 {latency['p90']:.0f} ms  p99 {latency['p99']:.0f} ms  "
+          f"errors {results['errors']}/{results['requests']}")
+    if results['pool']:
+        print(f"🔌 Session pool: {results['pool']}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
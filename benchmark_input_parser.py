@@ -0,0 +1,120 @@
+"""Benchmark of the request parser behind SmartURLManager._parse_input_node.
+
+Generates ~1 MB requests of different shapes (prose, dense links, bare domains, one long
+line) and times parse_user_input on each, plus InputParser fed in fixed-size chunks as a
+stream would be. --legacy also times the previous parser (separate findall/search calls
+and an any(domain in url) scan per domain), which is quadratic in the number of links:
+
+    python benchmark_input_parser.py --size-mb 1 --runs 5
+    python benchmark_input_parser.py --legacy --only dense_links
+"""
+import re
+import sys
+import time
+import json
+import random
+import argparse
+import statistics
+
+DEFAULT_SIZE_MB = 1.0
+DEFAULT_RUNS = 5
+STREAM_CHUNK_SIZE = 8 * 1024
+WORDS = ("the quick brown fox jumps over lazy dog research notes about python web frameworks "
+         "and async programming with tests docs guides").split()
+
+def legacy_parse(user_input: str) -> tuple:
+    """The parser _parse_input_node used before the single-pass tokenizer"""
+    urls = re.findall(r'https?://[^\s<>"{}|\\^`\[\]]+', user_input)
+    potential_domains = re.findall(r'\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}\b', user_input)
+    for domain in potential_domains:
+        if not any(domain in url for url in urls) and domain not in ['example.com', 'test.com']:
+            urls.append(f"https://{domain}")
+    collection_match = re.search(r'collection[:\s]+(["\']?)([^"\'\\s]+)\1', user_input, re.IGNORECASE)
+    tags_match = re.search(r'tags?[:\s]+(["\']?)([^"\'\\n]+)\1', user_input, re.IGNORECASE)
+    return urls, collection_match.group(2) if collection_match else None, tags_match.group(2) if tags_match else None
+
+def make_input(shape: str, size: int, seed: int = 0) -> str:
+    """A request of about `size` characters"""
+    rng = random.Random(seed)
+    parts = ["Please shorten and analyze these links for collection: research tags: python, web\n"]
+    length = len(parts[0])
+    i = 0
+    while length < size:
+        if shape == 'prose':
+            token = rng.choice(WORDS)
+        elif shape == 'dense_links':
+            token = f"https://site{i % 5000}.example.org/docs/page-{i}?ref=list"
+        elif shape == 'bare_domains':
+            token = f"host{i % 5000}.docs{i % 7}.org" if i % 2 else rng.choice(WORDS)
+        else:  # mixed
+            token = (f"https://github.com/user{i}/repo" if i % 10 == 0 else
+                     f"docs{i % 300}.python.org" if i % 10 == 5 else rng.choice(WORDS))
+        separator = "\n" if shape != 'one_line' and i % 12 == 11 else " "
+        parts.append(token + separator)
+        length += len(token) + 1
+        i += 1
+    return ''.join(parts)
+
+SHAPES = ('prose', 'dense_links', 'bare_domains', 'mixed', 'one_line')
+
+def time_runs(function, runs: int) -> float:
+    """Median seconds of `runs` calls"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+def stream_parse(text: str) -> tuple:
+    from url_manager_graph_client import InputParser
+    parser = InputParser()
+    for start in range(0, len(text), STREAM_CHUNK_SIZE):
+        parser.feed(text[start:start + STREAM_CHUNK_SIZE])
+    return parser.close()
+
+def main() -> int:
+    from url_manager_graph_client import parse_user_input
+
+    parser = argparse.ArgumentParser(description="Benchmark the LangGraph request parser on large inputs")
+    parser.add_argument("--size-mb", type=float, default=DEFAULT_SIZE_MB)
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--only", nargs="*", choices=SHAPES, help="input shapes to run")
+    parser.add_argument("--legacy", action="store_true", help="also time the previous quadratic parser")
+    parser.add_argument("--output", help="write the results as JSON")
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 * 1024)
+    print("🏁 Request Parser Benchmark")
+    print("=" * 50)
+    results = {}
+    for shape in args.only or SHAPES:
+        text = make_input(shape, size)
+        urls, collection_name, tags = parse_user_input(text)
+        if stream_parse(text) != (urls, collection_name, tags):
+            print(f"❌ {shape}: streamed parse differs from one-shot parse")
+            return 1
+
+        result = {
+            'chars': len(text),
+            'urls': len(urls),
+            'seconds': time_runs(lambda: parse_user_input(text), args.runs),
+            'stream_seconds': time_runs(lambda: stream_parse(text), args.runs)
+        }
+        result['mb_per_second'] = len(text) / 1024 / 1024 / result['seconds']
+        line = (f"{shape:<14} {len(urls):>7} URLs  {result['seconds'] * 1000:>8.1f} ms  "
+                f"({result['mb_per_second']:.1f} MB/s)  streamed {result['stream_seconds'] * 1000:>8.1f} ms")
+        if args.legacy:
+            result['legacy_seconds'] = time_runs(lambda: legacy_parse(text), 1)
+            line += f"  legacy {result['legacy_seconds'] * 1000:>10.1f} ms"
+        print(line)
+        results[shape] = result
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'size_mb': args.size_mb, 'runs': args.runs, 'shapes': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Startup benchmark for the MCP server.
+
+Measures, each in a fresh interpreter and a scratch working directory:
+  * import time of server.py
+  * time from spawning `python server.py` to the first list_tools response
+  * which heavy modules the import pulls in (none are expected)
+
+Exits non-zero when a median exceeds its budget or a deferred module is loaded
+at import time, so it can gate changes to startup behaviour:
+
+    python benchmark_startup.py --runs 5 --import-budget 2.0 --list-tools-budget 4.0
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+
+# Budgets are medians in seconds, with headroom over a cold import of mcp itself
+IMPORT_BUDGET_SECONDS = 2.0
+LIST_TOOLS_BUDGET_SECONDS = 4.0
+DEFAULT_RUNS = 5
+
+# Modules that must only be imported once a tool needs them
+DEFERRED_MODULES = ('tavily', 'requests', 'bs4', 'qrcode', 'PIL', 'pyshorteners', 'validators',
+                    'enhanced_url_tools', 'shortener_services')
+
+IMPORT_PROBE = """
+import sys, time, json
+started = time.perf_counter()
+import server
+elapsed = time.perf_counter() - started
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in %r if m in sys.modules]}))
+""" % (DEFERRED_MODULES,)
+
+def measure_import(workdir: str) -> dict:
+    """Import server.py in a fresh interpreter"""
+    env = {**os.environ, 'PYTHONPATH': os.path.dirname(SERVER_PATH)}
+    output = subprocess.run([sys.executable, "-c", IMPORT_PROBE], cwd=workdir, env=env,
+                            capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+async def _first_list_tools(workdir: str) -> tuple:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    transport = StdioTransport(command=sys.executable, args=[SERVER_PATH], env=dict(os.environ), cwd=workdir)
+    started = time.perf_counter()
+    async with Client(transport) as client:
+        tools = await client.list_tools()
+        return time.perf_counter() - started, len(tools)
+
+def measure_list_tools(workdir: str) -> tuple:
+    """Spawn the server over stdio and time the first list_tools round trip"""
+    return asyncio.run(_first_list_tools(workdir))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark MCP server startup")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--import-budget", type=float, default=IMPORT_BUDGET_SECONDS)
+    parser.add_argument("--list-tools-budget", type=float, default=LIST_TOOLS_BUDGET_SECONDS)
+    args = parser.parse_args()
+
+    import_times, list_tools_times, loaded = [], [], set()
+    tool_count = 0
+    for _ in range(args.runs):
+        # A scratch directory keeps the benchmark away from the real urls.db
+        with tempfile.TemporaryDirectory() as workdir:
+            probe = measure_import(workdir)
+            import_times.append(probe['seconds'])
+            loaded.update(probe['loaded'])
+            seconds, tool_count = measure_list_tools(workdir)
+            list_tools_times.append(seconds)
+
+    import_median = statistics.median(import_times)
+    list_tools_median = statistics.median(list_tools_times)
+
+    print("🚀 MCP Server Startup Benchmark")
+    print("=" * 50)
+    print(f"Runs: {args.runs}")
+    print(f"Import server.py: median {import_median * 1000:.0f} ms, "
+          f"min {min(import_times) * 1000:.0f} ms (budget {args.import_budget * 1000:.0f} ms)")
+    print(f"First list_tools ({tool_count} tools): median {list_tools_median * 1000:.0f} ms, "
+          f"min {min(list_tools_times) * 1000:.0f} ms (budget {args.list_tools_budget * 1000:.0f} ms)")
+    print(f"Deferred modules loaded at import: {', '.join(sorted(loaded)) or 'none'}")
+
+    failures = []
+    if import_median > args.import_budget:
+        failures.append("import time over budget")
+    if list_tools_median > args.list_tools_budget:
+        failures.append("time to first list_tools over budget")
+    if loaded:
+        failures.append("deferred modules imported at startup")
+
+    if failures:
+        print(f"❌ Startup regression: {'; '.join(failures)}")
+        return 1
+    print("✅ Startup within budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
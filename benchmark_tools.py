@@ -0,0 +1,252 @@
+"""Offline throughput and latency benchmark of every MCP tool.
+
+Starts the local HTTP stand-in (fixture_server.py), spawns `server.py` over stdio in a
+scratch directory with its external APIs pointed at the stand-in, and calls each tool
+scenario with a fixed concurrency. Results are written as JSON so runs can be diffed:
+
+    python benchmark_tools.py --calls 50 --concurrency 4 --output baseline.json
+    python benchmark_tools.py --compare baseline.json --max-regression 0.25
+
+The web_search scenarios need network access (Tavily's tokenizer downloads its encoding
+on first use), so they only run with --include-web-search.
+
+Exits non-zero when a tool has no scenario, or when --compare finds a scenario whose
+p50 latency grew (or throughput fell) by more than --max-regression.
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+from fixture_server import FixtureServer, fixture_env, DEFAULT_PAGE_SIZE
+
+SERVER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "server.py")
+RESULTS_FORMAT_VERSION = 1
+DEFAULT_CALLS = 50
+DEFAULT_CONCURRENCY = 4
+DEFAULT_WARMUP_CALLS = 5
+DEFAULT_MAX_REGRESSION = 0.25
+LARGE_PAGE_SIZE = 1024 * 1024
+BATCH_SIZE = 20
+# Scenarios that reach the network even with the stand-in; skipped unless --include-web-search
+NETWORK_SCENARIOS = frozenset({'web_search', 'web_search_cached'})
+
+def scenarios(fixture: str, page_size: int) -> list:
+    """(scenario, tool, make_args(i, setup)) for every tool; `i` is unique per call"""
+    def page(i, size=page_size):
+        return f"{fixture}/page?size={size}&n={i}"
+
+    def page_list(i, count=BATCH_SIZE):
+        return '\n'.join(page(f"{i}-{j}") for j in range(count))
+
+    return [
+        ('web_search', 'web_search', lambda i, setup: {'query': f"benchmark query {i}"}),
+        ('web_search_cached', 'web_search', lambda i, setup: {'query': "benchmark cached query"}),
+        ('roll_dice', 'roll_dice', lambda i, setup: {'notation': "3d6", 'num_rolls': 10}),
+        ('shorten_url', 'shorten_url', lambda i, setup: {'url': page(i)}),
+        ('shorten_url_mirror', 'shorten_url', lambda i, setup: {'url': page(f"m{i}"), 'mirror_external': True}),
+        ('resolve_short_url', 'resolve_short_url', lambda i, setup: {'short_url': setup['short_url']}),
+        ('shortener_status', 'shortener_status', lambda i, setup: {}),
+        ('server_metrics', 'server_metrics', lambda i, setup: {}),
+        ('profile_tool', 'profile_tool', lambda i, setup: {}),
+        ('shorten_url_batch', 'shorten_url_batch', lambda i, setup: {'urls': page_list(i)}),
+        ('get_batch_results', 'get_batch_results', lambda i, setup: {'batch_id': setup['batch_id']}),
+        ('submit_url_job', 'submit_url_job', lambda i, setup: {'kind': "safety", 'urls': page_list(i, 10)}),
+        ('get_job_status', 'get_job_status', lambda i, setup: {'job_id': setup['job_id']}),
+        ('get_job_results', 'get_job_results', lambda i, setup: {'job_id': setup['job_id']}),
+        ('validate_url', 'validate_url', lambda i, setup: {'url': page(i)}),
+        ('get_url_metadata', 'get_url_metadata', lambda i, setup: {'url': page(i)}),
+        ('get_url_metadata_1mb', 'get_url_metadata', lambda i, setup: {'url': page(i, LARGE_PAGE_SIZE)}),
+        ('get_url_metadata_binary', 'get_url_metadata', lambda i, setup: {'url': f"{fixture}/binary?size={LARGE_PAGE_SIZE}&n={i}"}),
+        ('get_url_metadata_error', 'get_url_metadata', lambda i, setup: {'url': f"{fixture}/status/500?n={i}"}),
+        ('get_url_metadata_batch', 'get_url_metadata_batch', lambda i, setup: {'urls': page_list(i)}),
+        ('check_url_safety', 'check_url_safety', lambda i, setup: {'url': page(i)}),
+        ('check_url_safety_batch', 'check_url_safety_batch', lambda i, setup: {'urls': page_list(i)}),
+        ('generate_qr_code', 'generate_qr_code', lambda i, setup: {'url': page(i)}),
+        ('generate_qr_code_svg', 'generate_qr_code', lambda i, setup: {'url': page(i), 'output_format': "svg"}),
+        ('generate_qr_codes_batch', 'generate_qr_codes_batch', lambda i, setup: {'urls': page_list(i)}),
+        ('expand_url', 'expand_url', lambda i, setup: {'shortened_url': f"{fixture}/redirect/3?n={i}"}),
+        ('create_url_collection', 'create_url_collection', lambda i, setup: {'name': f"benchmark-{i}"}),
+        ('list_my_urls', 'list_my_urls', lambda i, setup: {'limit': 20}),
+        ('search_urls', 'search_urls', lambda i, setup: {'search_term': "Fixture"}),
+        ('list_collections', 'list_collections', lambda i, setup: {}),
+    ]
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(q * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+def call_failed(result) -> bool:
+    return result.is_error or bool((result.structured_content or {}).get('error'))
+
+async def prepare(client, fixture: str) -> dict:
+    """Create the short URL, batch and job that the lookup scenarios read"""
+    shortened = await client.call_tool("shorten_url", {'url': f"{fixture}/page?n=setup"})
+    batch = await client.call_tool("shorten_url_batch", {'urls': f"{fixture}/page?n=setup-1,{fixture}/page?n=setup-2"})
+    job = await client.call_tool("submit_url_job", {'kind': "safety", 'urls': f"{fixture}/page?n=setup-job"})
+    return {
+        'short_url': shortened.structured_content['shortened_url'],
+        'batch_id': batch.structured_content['batch_id'],
+        'job_id': job.structured_content['job_id']
+    }
+
+async def run_scenario(client, tool: str, make_args, setup: dict, calls: int, concurrency: int, offset: int = 0) -> dict:
+    """Make `calls` calls, at most `concurrency` at a time, and summarize their latencies"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def call(i):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                failed = call_failed(await client.call_tool(tool, make_args(i, setup), raise_on_error=False))
+            except Exception:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(call(offset + i) for i in range(calls)))
+    wall_seconds = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'tool': tool,
+        'calls': calls,
+        'errors': errors,
+        'concurrency': concurrency,
+        'wall_seconds': wall_seconds,
+        'throughput_rps': calls / wall_seconds if wall_seconds else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.5) * 1000,
+            'p90': percentile(latencies, 0.9) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'mean': sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+            'max': latencies[-1] * 1000 if latencies else 0.0
+        }
+    }
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(SERVER_PATH),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+async def run_benchmark(args) -> dict:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    with FixtureServer(latency_ms=args.latency_ms, page_size=args.page_size) as fixture:
+        # A scratch directory keeps the benchmark away from the real urls.db and caches
+        with tempfile.TemporaryDirectory() as workdir:
+            env = {**os.environ, **fixture_env(fixture.base_url)}
+            transport = StdioTransport(command=sys.executable, args=[SERVER_PATH], env=env, cwd=workdir)
+            async with Client(transport) as client:
+                tool_names = {tool.name for tool in await client.list_tools()}
+                setup = await prepare(client, fixture.base_url)
+
+                selected = [scenario for scenario in scenarios(fixture.base_url, args.page_size)
+                            if (not args.only or scenario[0] in args.only or scenario[1] in args.only)
+                            and (args.include_web_search or scenario[0] not in NETWORK_SCENARIOS)]
+                results = {}
+                for name, tool, make_args in selected:
+                    await run_scenario(client, tool, make_args, setup, args.warmup, args.concurrency)
+                    results[name] = await run_scenario(client, tool, make_args, setup, args.calls,
+                                                       args.concurrency, offset=args.warmup)
+                    print_result(name, results[name])
+
+            fixture_requests = dict(fixture.requests)
+
+    covered = {scenario[1] for scenario in scenarios("", 0)}
+    return {
+        'format_version': RESULTS_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {
+            'calls': args.calls,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+            'latency_ms': args.latency_ms,
+            'page_size': args.page_size
+        },
+        'uncovered_tools': sorted(tool_names - covered),
+        'fixture_requests': fixture_requests,
+        'scenarios': results
+    }
+
+def print_result(name: str, result: dict):
+    latency = result['latency_ms']
+    print(f"{name:<26} {result['throughput_rps']:>8.1f} rps  p50 {latency['p50']:>8.1f} ms  "
+          f"p99 {latency['p99']:>8.1f} ms  errors {result['errors']}/{result['calls']}")
+
+def compare(current: dict, baseline: dict, max_regression: float) -> list:
+    """Print per-scenario changes against a baseline run and return the regressions"""
+    regressions = []
+    print(f"\n📊 Compared with {baseline.get('git_commit') or 'baseline'} ({baseline.get('created_at', '?')})")
+    for name, result in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            print(f"{name:<26} (new)")
+            continue
+        p50_change = result['latency_ms']['p50'] / before['latency_ms']['p50'] - 1 if before['latency_ms']['p50'] else 0.0
+        rps_change = result['throughput_rps'] / before['throughput_rps'] - 1 if before['throughput_rps'] else 0.0
+        regressed = p50_change > max_regression or rps_change < -max_regression
+        print(f"{name:<26} p50 {p50_change:+7.1%}  throughput {rps_change:+7.1%}{'  ❌' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark of every MCP tool against a local HTTP stand-in")
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="measured calls per scenario")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP_CALLS, help="unmeasured calls per scenario")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency the stand-in adds to every response")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="size of the synthetic pages")
+    parser.add_argument("--only", nargs="*", help="scenario or tool names to run")
+    parser.add_argument("--include-web-search", action="store_true",
+                        help="also run the web_search scenarios, which need network access")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="baseline results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION)
+    args = parser.parse_args()
+
+    print("🏁 MCP Tool Benchmark")
+    print("=" * 50)
+    results = asyncio.run(run_benchmark(args))
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results written to {args.output}")
+
+    failures = []
+    if results['uncovered_tools']:
+        failures.append(f"tools without a scenario: {', '.join(results['uncovered_tools'])}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        if regressions:
+            failures.append(f"regressed: {', '.join(regressions)}")
+
+    if failures:
+        print(f"❌ {'; '.join(failures)}")
+        return 1
+    print("✅ Benchmark complete")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
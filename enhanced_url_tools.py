@@ -1,19 +1,51 @@
 import requests
-from bs4 import BeautifulSoup
-import qrcode
-import io
+from requests.adapters import HTTPAdapter
 import base64
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from urllib.parse import urlparse, urljoin
-import validators
 import hashlib
+import os
+import threading
 from typing import Dict, List, Any
-from url_storage import URLStorage
+from single_flight import SingleFlight
+from qr_codes import QRCodeCache, DEFAULT_CACHE_DIR, render_qr, png_dimensions, matrix_modules, ERROR_CORRECTION_LEVELS, OUTPUT_FORMATS
 import json
 
+# Hard upper bound on how much of a response body is held in memory per fetch
+DEFAULT_MAX_BODY_BYTES = 2 * 1024 * 1024
+# Only these content types are read and handed to the HTML parser
+DEFAULT_PARSEABLE_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+FETCH_CHUNK_SIZE = 16 * 1024
+# Below this many uncached codes a batch renders in-process instead of paying pool startup
+QR_BATCH_POOL_THRESHOLD = 8
+# Forking the multi-threaded server can copy a held lock into the worker and hang it,
+# so QR workers are started from a clean forkserver process instead
+QR_POOL_CONTEXT = multiprocessing.get_context('forkserver')
+DEFAULT_QR_OUTPUT_DIR = "qr_output"
+HTTP_POOL_SIZE = 32
+
 class EnhancedURLTools:
-    def __init__(self):
-        self.storage = URLStorage()
+    def __init__(self, max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+                 parseable_content_types: tuple = DEFAULT_PARSEABLE_CONTENT_TYPES,
+                 qr_output_dir: str = DEFAULT_QR_OUTPUT_DIR, qr_cache_dir: str = DEFAULT_CACHE_DIR):
+        self.max_body_bytes = max_body_bytes
+        self.parseable_content_types = tuple(ct.lower() for ct in parseable_content_types)
+        self._qr_cache = None
+        self._qr_cache_lock = threading.Lock()
+        self._qr_pool = None
+        self._qr_pool_lock = threading.Lock()
+        self.qr_output_dir = qr_output_dir
+        self.qr_cache_dir = qr_cache_dir
+        # Concurrent requests for the same URL share one in-flight fetch:
+        # 'head' serves validate_url and expand_url, 'metadata' serves get_url_metadata
+        self.flights = {'head': SingleFlight(), 'metadata': SingleFlight()}
         self.session = requests.Session()
+        # Size the connection pool for concurrent batch work so connections are reused, not churned
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
@@ -26,6 +58,8 @@ class EnhancedURLTools:
     
     def validate_url(self, url: str) -> Dict[str, Any]:
         """Validate if a URL is properly formatted and reachable"""
+        import validators
+        
         try:
             # First, basic format validation
             if not url.startswith(('http://', 'https://')):
@@ -41,7 +75,7 @@ class EnhancedURLTools:
             
             # Check if URL is reachable
             try:
-                response = self.session.head(url, timeout=10, allow_redirects=True)
+                response = self._head(url)
                 is_reachable = response.status_code < 400
                 status_code = response.status_code
                 final_url = response.url
@@ -67,16 +101,78 @@ class EnhancedURLTools:
                 'url': url
             }
     
+    def _head(self, url: str) -> requests.Response:
+        """HEAD a URL following redirects; concurrent calls for the same URL share one request"""
+        return self.flights['head'].do(url, self.session.head, url, timeout=10, allow_redirects=True)
+    
+    def fetch_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-fetch-kind single-flight counters; 'shared' is the number of fetches saved"""
+        return {name: flight.stats() for name, flight in self.flights.items()}
+    
+    def _is_parseable(self, content_type: str) -> bool:
+        """Check whether a content type is on the parsing allowlist"""
+        if not content_type:
+            # Undeclared bodies are still read, but only up to the byte cap
+            return True
+        media_type = content_type.split(';', 1)[0].strip().lower()
+        return media_type in self.parseable_content_types
+    
+    def _fetch(self, url: str) -> Dict[str, Any]:
+        """Stream a GET request, reading at most max_body_bytes of a parseable body"""
+        with self.session.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            
+            content_type = response.headers.get('content-type', '')
+            header_length = response.headers.get('content-length', '')
+            
+            parseable = self._is_parseable(content_type)
+            body = b''
+            truncated = False
+            if parseable:
+                chunks = []
+                received = 0
+                for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                    chunks.append(chunk[:max(self.max_body_bytes - received, 0)])
+                    received += len(chunk)
+                    if received > self.max_body_bytes:
+                        truncated = True
+                        break
+                body = b''.join(chunks)
+            
+            # Prefer the server-declared size so we never read a body just to measure it
+            if header_length.isdigit():
+                content_length = int(header_length)
+            elif parseable and not truncated:
+                content_length = len(body)
+            else:
+                content_length = None
+            
+            return {
+                'body': body,
+                'body_truncated': truncated,
+                'content_length': content_length,
+                'content_type': content_type,
+                'status_code': response.status_code,
+                'final_url': response.url
+            }
+    
     def get_url_metadata(self, url: str) -> Dict[str, Any]:
         """Extract metadata from URL including title, description, and other info"""
+        key = url if url.startswith(('http://', 'https://')) else 'https://' + url
+        # Callers sharing a fetch each get their own copy of the result
+        return dict(self.flights['metadata'].do(key, self._get_url_metadata, url))
+    
+    def _get_url_metadata(self, url: str) -> Dict[str, Any]:
+        # The parser is only loaded by the tools that need it
+        from bs4 import BeautifulSoup
+        
         try:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            fetched = self._fetch(url)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(fetched['body'] or '', 'html.parser')
             
             # Extract title
             title = ""
@@ -129,9 +225,10 @@ class EnhancedURLTools:
                 'is_secure': url.startswith('https://'),
                 'favicon_url': favicon_url,
                 'image_url': image_url,
-                'content_length': len(response.content),
-                'content_type': response.headers.get('content-type', ''),
-                'status_code': response.status_code,
+                'content_length': fetched['content_length'],
+                'content_type': fetched['content_type'],
+                'body_truncated': fetched['body_truncated'],
+                'status_code': fetched['status_code'],
                 'url': url
             }
             
@@ -144,33 +241,88 @@ class EnhancedURLTools:
                 'domain': urlparse(url).netloc if url else ''
             }
     
-    def generate_qr_code(self, url: str, size: int = 10) -> str:
-        """Generate QR code for URL and return as base64 string"""
+    @property
+    def qr_cache(self) -> QRCodeCache:
+        """Disk cache of rendered QR codes; its index is read on the first QR request"""
+        if self._qr_cache is None:
+            with self._qr_cache_lock:
+                if self._qr_cache is None:
+                    self._qr_cache = QRCodeCache(self.qr_cache_dir)
+        return self._qr_cache
+    
+    @property
+    def qr_pool(self) -> ProcessPoolExecutor:
+        """Worker processes for batch QR rendering, started on first use and kept for later batches"""
+        if self._qr_pool is None:
+            with self._qr_pool_lock:
+                if self._qr_pool is None:
+                    self._qr_pool = ProcessPoolExecutor(mp_context=QR_POOL_CONTEXT)
+        return self._qr_pool
+    
+    @staticmethod
+    def _qr_render_format(output_format: str) -> str:
+        # File handles are written from the PNG rendering
+        return 'png' if output_format == 'file' else output_format
+    
+    def _qr_cache_key(self, url: str, size: int, error_correction: str, output_format: str) -> str:
+        render_format = self._qr_render_format(output_format)
+        # The bit matrix does not depend on box size
+        return self.qr_cache.make_key(url, 0 if render_format == 'matrix' else size, error_correction, render_format)
+    
+    @staticmethod
+    def _check_qr_options(error_correction: str, output_format: str):
+        if error_correction not in ERROR_CORRECTION_LEVELS:
+            raise ValueError(f"Unknown error correction level '{error_correction}'. Use L, M, Q or H")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}'. Use {', '.join(OUTPUT_FORMATS)}")
+    
+    def _qr_result(self, url: str, content: bytes, output_format: str, cached: bool, key: str) -> Dict[str, Any]:
+        result = {'url': url, 'cached': cached}
+        
+        if output_format == 'svg':
+            svg = content.decode()
+            width = svg.split('width="', 1)[1].split('"', 1)[0]
+            result.update({'qr_code_svg': svg, 'format': 'SVG', 'size': f"{width}x{width}"})
+        elif output_format == 'matrix':
+            modules = matrix_modules(content)
+            result.update({
+                'qr_matrix_base64': base64.b64encode(content).decode(),
+                'modules': modules,
+                'format': 'MATRIX',
+                'size': f"{modules}x{modules} modules"
+            })
+        else:
+            width, height = png_dimensions(content)
+            result.update({'format': 'PNG', 'size': f"{width}x{height}"})
+            if output_format == 'file':
+                os.makedirs(self.qr_output_dir, exist_ok=True)
+                # Files are named by content address, so re-exports overwrite rather than duplicate
+                file_path = os.path.abspath(os.path.join(self.qr_output_dir, key))
+                if not os.path.exists(file_path):
+                    with open(file_path, 'wb') as f:
+                        f.write(content)
+                result['file_path'] = file_path
+            else:
+                result['qr_code_base64'] = base64.b64encode(content).decode()
+        
+        return result
+    
+    def generate_qr_code(self, url: str, size: int = 10, error_correction: str = 'L',
+                         output_format: str = 'png') -> Dict[str, Any]:
+        """Generate QR code for URL as base64 PNG, SVG, packed bit matrix or PNG file"""
         try:
-            qr = qrcode.QRCode(
-                version=1,
-                error_correction=qrcode.constants.ERROR_CORRECT_L,
-                box_size=size,
-                border=4,
-            )
-            qr.add_data(url)
-            qr.make(fit=True)
-            
-            img = qr.make_image(fill_color="black", back_color="white")
+            error_correction = error_correction.upper()
+            output_format = output_format.lower()
+            self._check_qr_options(error_correction, output_format)
             
-            # Convert to base64
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG')
-            buffer.seek(0)
+            key = self._qr_cache_key(url, size, error_correction, output_format)
+            content = self.qr_cache.get(key)
+            cached = content is not None
+            if not cached:
+                content = render_qr(url, size, error_correction, self._qr_render_format(output_format))
+                self.qr_cache.put(key, content)
             
-            qr_base64 = base64.b64encode(buffer.getvalue()).decode()
-            
-            return {
-                'qr_code_base64': qr_base64,
-                'url': url,
-                'format': 'PNG',
-                'size': f"{img.size[0]}x{img.size[1]}"
-            }
+            return self._qr_result(url, content, output_format, cached, key)
             
         except Exception as e:
             return {
@@ -178,6 +330,67 @@ class EnhancedURLTools:
                 'url': url
             }
     
+    def generate_qr_codes_batch(self, urls: List[str], size: int = 10, error_correction: str = 'L',
+                                output_format: str = 'png', max_workers: int = None) -> List[Dict[str, Any]]:
+        """Generate QR codes for many URLs, rendering cache misses in a process pool"""
+        error_correction = error_correction.upper()
+        output_format = output_format.lower()
+        try:
+            self._check_qr_options(error_correction, output_format)
+        except ValueError as e:
+            return [{'error': str(e), 'url': url} for url in urls]
+        
+        render_format = self._qr_render_format(output_format)
+        results: List[Dict[str, Any]] = [None] * len(urls)
+        misses: Dict[str, List[int]] = {}
+        for i, url in enumerate(urls):
+            key = self._qr_cache_key(url, size, error_correction, output_format)
+            content = self.qr_cache.get(key)
+            if content is not None:
+                results[i] = self._qr_result(url, content, output_format, True, key)
+            else:
+                # Duplicate URLs in one batch are rendered once
+                misses.setdefault(url, []).append(i)
+        
+        pending = list(misses)
+        if len(pending) >= QR_BATCH_POOL_THRESHOLD:
+            # An explicit worker count gets its own pool for this batch
+            pool = self.qr_pool if max_workers is None else ProcessPoolExecutor(max_workers, mp_context=QR_POOL_CONTEXT)
+            try:
+                futures = [pool.submit(render_qr, url, size, error_correction, render_format) for url in pending]
+                rendered = []
+                for url, future in zip(pending, futures):
+                    try:
+                        rendered.append((url, future.result(), None))
+                    except BrokenProcessPool as e:
+                        # A worker died; the next batch starts a fresh pool
+                        self._qr_pool = None
+                        rendered.append((url, None, str(e)))
+                    except Exception as e:
+                        rendered.append((url, None, str(e)))
+            finally:
+                if max_workers is not None:
+                    pool.shutdown()
+        else:
+            rendered = []
+            for url in pending:
+                try:
+                    rendered.append((url, render_qr(url, size, error_correction, render_format), None))
+                except Exception as e:
+                    rendered.append((url, None, str(e)))
+        
+        for url, content, error in rendered:
+            if content is not None:
+                key = self._qr_cache_key(url, size, error_correction, output_format)
+                self.qr_cache.put(key, content)
+                result = self._qr_result(url, content, output_format, False, key)
+            else:
+                result = {'error': error, 'url': url}
+            for i in misses[url]:
+                results[i] = result
+        
+        return results
+    
     def check_url_safety(self, url: str) -> Dict[str, Any]:
         """Check URL safety using basic domain filtering"""
         try:
@@ -230,7 +443,7 @@ class EnhancedURLTools:
     def expand_url(self, shortened_url: str) -> Dict[str, Any]:
         """Expand a shortened URL to see its final destination"""
         try:
-            response = self.session.head(shortened_url, allow_redirects=True, timeout=10)
+            response = self._head(shortened_url)
             final_url = response.url
             
             redirect_chain = []
@@ -0,0 +1,235 @@
+"""Local HTTP stand-in for everything the MCP server talks to.
+
+Serves synthetic pages of configurable size and latency, redirect chains, slow and
+error endpoints, and fake Tavily, TinyURL, Chilp.it and V.gd APIs, so benchmarks and
+load tests run repeatably without network access. Start `server.py` with the
+environment from fixture_env() to point its external calls here.
+
+Endpoints (every one accepts `delay_ms` to add latency):
+  /page?size=BYTES&title=TEXT        HTML page with title, description, og: and favicon tags
+  /binary?size=BYTES                 application/octet-stream body
+  /chunked?size=BYTES&title=TEXT     /page sent with chunked encoding and no Content-Length
+  /redirect/N?size=BYTES             chain of N 302 redirects ending at /page
+  /slow?delay_ms=MS                  /page with a default delay of SLOW_DELAY_MS
+  /status/CODE                       empty response with that status code
+  /s/CODE                            301 to the URL a fake shortener stored under CODE
+  /tavily/search                     POST, Tavily search API
+  /tinyurl/api-create.php?url=       TinyURL API (plain text)
+  /chilpit/api.php?url=              Chilp.it API (plain text)
+  /vgd/create.php?url=&format=json   V.gd API (JSON, optional shorturl= alias)
+
+    python fixture_server.py --port 8765 --latency-ms 20
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from collections import Counter
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, quote
+
+DEFAULT_PAGE_SIZE = 32 * 1024
+SLOW_DELAY_MS = 2000
+MAX_REDIRECTS = 20
+SEARCH_RESULTS = 5
+MAX_CACHED_PAGES = 256
+
+FILLER_PARAGRAPH = ("<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+                    "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam.</p>\n")
+
+def render_page(size: int, title: str = "Fixture Page") -> bytes:
+    """An HTML page of exactly `size` bytes (or its head, if size is smaller)"""
+    head = (f"<!DOCTYPE html>\n<html><head><title>{title}</title>\n"
+            f'<meta name="description" content="Synthetic page of {size} bytes">\n'
+            f'<meta property="og:title" content="{title}">\n'
+            f'<meta property="og:image" content="/static/image.png">\n'
+            f'<link rel="icon" href="/favicon.ico">\n'
+            f"</head><body>\n").encode()
+    tail = b"</body></html>\n"
+    filler = FILLER_PARAGRAPH.encode()
+    body_size = max(size - len(head) - len(tail), 0)
+    body = (filler * (body_size // len(filler) + 1))[:body_size]
+    return head + body + tail
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients reuse connections as they would against real servers
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _params(self) -> dict:
+        return {key: values[-1] for key, values in parse_qs(urlparse(self.path).query).items()}
+
+    def _send(self, status: int, body: bytes = b"", content_type: str = "text/plain", headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _send_chunked(self, body: bytes, content_type: str, chunk_size: int = 8192):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start:start + chunk_size]
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _redirect(self, status: int, location: str):
+        self._send(status, headers={"Location": location})
+
+    def _short_url(self, url: str, alias: str = "") -> str:
+        code = self.server.store_short_url(url, alias)
+        return f"{self.server.base_url}/s/{code}"
+
+    def _route(self, body: bytes = b""):
+        path = urlparse(self.path).path
+        params = self._params()
+        route = path.split('/')[1] if path.count('/') > 1 else path.strip('/')
+        self.server.count(route or 'root')
+
+        delay_ms = float(params.get('delay_ms', SLOW_DELAY_MS if route == 'slow' else 0)) + self.server.latency_ms
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+
+        size = int(params.get('size', self.server.page_size))
+        if route in ('page', 'slow'):
+            self._send(200, self.server.page(size, params.get('title', "Fixture Page")), "text/html; charset=utf-8")
+        elif route == 'chunked':
+            self._send_chunked(self.server.page(size, params.get('title', "Fixture Page")), "text/html; charset=utf-8")
+        elif route == 'binary':
+            self._send(200, b"\0" * size, "application/octet-stream")
+        elif route == 'redirect':
+            remaining = min(int(path.rsplit('/', 1)[1] or 0), MAX_REDIRECTS)
+            target = f"/redirect/{remaining - 1}" if remaining > 1 else "/page"
+            self._redirect(302, f"{target}?size={size}")
+        elif route == 'status':
+            self._send(int(path.rsplit('/', 1)[1]))
+        elif route == 's':
+            url = self.server.short_urls.get(path.rsplit('/', 1)[1])
+            if url:
+                self._redirect(301, url)
+            else:
+                self._send(404)
+        elif route == 'tavily':
+            query = json.loads(body or b"{}").get('query', '')
+            results = [{'url': f"{self.server.base_url}/page?title={quote(query)}&n={i}", 'title': f"{query} {i}",
+                        'content': f"Result {i} for {query}. " + FILLER_PARAGRAPH, 'score': 1.0 - i / 10}
+                       for i in range(SEARCH_RESULTS)]
+            self._send(200, json.dumps({'query': query, 'results': results}).encode(), "application/json")
+        elif route in ('tinyurl', 'chilpit'):
+            self._send(200, self._short_url(params.get('url', '')).encode())
+        elif route == 'vgd':
+            alias = params.get('shorturl', '')
+            if alias and alias in self.server.short_urls:
+                data = {'errorcode': 2, 'errormessage': "Short URL already taken"}
+            else:
+                data = {'shorturl': self._short_url(params.get('url', ''), alias)}
+            self._send(200, json.dumps(data).encode(), "application/json")
+        else:
+            self._send(404)
+
+    def do_GET(self):
+        self._route()
+
+    def do_HEAD(self):
+        self._route()
+
+    def do_POST(self):
+        self._route(self.rfile.read(int(self.headers.get('Content-Length') or 0)))
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded fixture server; use as a context manager to run it in the background"""
+    daemon_threads = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        super().__init__((host, port), FixtureHandler)
+        self.latency_ms = latency_ms
+        self.page_size = page_size
+        self.requests = Counter()
+        self.short_urls = {}
+        self._lock = threading.Lock()
+        self._pages = {}
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def page(self, size: int, title: str) -> bytes:
+        key = (size, title)
+        page = self._pages.get(key)
+        if page is None:
+            page = render_page(size, title)
+            if len(self._pages) < MAX_CACHED_PAGES:
+                self._pages[key] = page
+        return page
+
+    def count(self, route: str):
+        with self._lock:
+            self.requests[route] += 1
+
+    def store_short_url(self, url: str, alias: str = "") -> str:
+        with self._lock:
+            code = alias or f"f{len(self.short_urls):06d}"
+            self.short_urls[code] = url
+            return code
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on purpose, e.g. after the headers of a body they won't read
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, name="fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+def fixture_env(base_url: str) -> dict:
+    """Environment for server.py that sends its external API calls to the fixture server"""
+    return {
+        'TAVILY_API_KEY': "fixture",
+        'TAVILY_API_URL': f"{base_url}/tavily",
+        'TINYURL_API_URL': f"{base_url}/tinyurl/api-create.php",
+        'CHILPIT_API_URL': f"{base_url}/chilpit/api.php",
+        'VGD_API_URL': f"{base_url}/vgd/create.php"
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local HTTP stand-in for benchmarks and load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay added to every response")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="default /page size in bytes")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.host, args.port, args.latency_ms, args.page_size)
+    print(f"🧪 Fixture server on {server.base_url}", file=sys.stderr)
+    print("Point server.py at it with:", file=sys.stderr)
+    for name, value in fixture_env(server.base_url).items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
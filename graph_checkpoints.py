@@ -0,0 +1,139 @@
+import json
+import time
+import asyncio
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import aiosqlite
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+DEFAULT_CHECKPOINT_DB = "workflow_checkpoints.db"
+# Runs whose last checkpoint is older than this are dropped rather than resumed
+DEFAULT_MAX_CHECKPOINT_AGE = 24 * 3600
+
+class WorkflowCheckpoints:
+    """Checkpoints of workflow runs in a local SQLite file, plus a memo of their per-URL results.
+
+    LangGraph's AsyncSqliteSaver (from langgraph-checkpoint-sqlite) leaves a checkpoint after
+    each completed node of a run (a LangGraph thread), so a run that fails partway can be
+    resumed from its last completed node, even by another process. The url_results table in
+    the same file memoizes per-URL tool results of a run (put_url_results), so a resumed node
+    skips the URLs it already finished. delete_thread() drops both once a run is done.
+    Nothing touches the file until open().
+    """
+
+    def __init__(self, db_path: str = DEFAULT_CHECKPOINT_DB, clock=time.time):
+        self.db_path = db_path
+        self.saver: Optional[AsyncSqliteSaver] = None
+        self._clock = clock
+        self._opening = asyncio.Lock()
+
+    async def open(self) -> AsyncSqliteSaver:
+        """Create the tables on first use, drop stale runs and return the LangGraph checkpointer"""
+        async with self._opening:
+            if self.saver is None:
+                await asyncio.to_thread(self.init_database)
+                saver = AsyncSqliteSaver(await aiosqlite.connect(self.db_path))
+                await saver.setup()
+                self.saver = saver
+                await self.prune()
+        return self.saver
+
+    async def close(self):
+        if self.saver is not None:
+            saver, self.saver = self.saver, None
+            await saver.conn.close()
+
+    def init_database(self):
+        """Create the URL result table (the checkpointer creates its own)"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        # WAL lets readers and the single writer proceed without blocking each other
+        cursor.execute('PRAGMA journal_mode=WAL')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS url_results (
+                thread_id TEXT NOT NULL,
+                url TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (thread_id, url, field)
+            )
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    async def last_checkpoint_age(self, thread_id: str) -> Optional[float]:
+        """Seconds since the latest checkpoint of a run, or None if it has none"""
+        checkpoint_tuple = await self.saver.aget_tuple({'configurable': {'thread_id': thread_id, 'checkpoint_ns': ""}})
+        if checkpoint_tuple is None:
+            return None
+        return self._clock() - datetime.fromisoformat(checkpoint_tuple.checkpoint['ts']).timestamp()
+
+    async def delete_thread(self, thread_id: str):
+        """Drop every checkpoint, pending write and memoized URL result of a run"""
+        await self.saver.adelete_thread(thread_id)
+        await asyncio.to_thread(self._delete_url_results, thread_id)
+
+    def _delete_url_results(self, thread_id: str):
+        conn = self.connect()
+        try:
+            conn.execute('DELETE FROM url_results WHERE thread_id = ?', (thread_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    async def prune(self, max_age: float = DEFAULT_MAX_CHECKPOINT_AGE) -> int:
+        """Delete runs whose latest checkpoint or URL result is older than max_age seconds; returns how many"""
+        async with self.saver.lock, self.saver.conn.execute('SELECT DISTINCT thread_id FROM checkpoints') as cursor:
+            checkpointed = [row[0] async for row in cursor]
+        stale = {thread_id for thread_id in checkpointed if await self.last_checkpoint_age(thread_id) > max_age}
+
+        # Runs that failed before their first checkpoint leave only URL results
+        conn = self.connect()
+        try:
+            stale.update(row[0] for row in conn.execute('''
+                SELECT thread_id FROM url_results GROUP BY thread_id HAVING MAX(stored_at) < ?
+            ''', (self._clock() - max_age,)) if row[0] not in checkpointed)
+        finally:
+            conn.close()
+
+        for thread_id in stale:
+            await self.delete_thread(thread_id)
+        return len(stale)
+
+    def get_url_results(self, thread_id: str, field: str, urls: List[str]) -> Dict[str, Any]:
+        """Memoized `field` results of a run for the given URLs, by URL"""
+        results = {}
+        conn = self.connect()
+        try:
+            # Stay well below SQLite's limit on query parameters
+            for start in range(0, len(urls), 500):
+                chunk = urls[start:start + 500]
+                rows = conn.execute(f'''
+                    SELECT url, value FROM url_results
+                    WHERE thread_id = ? AND field = ? AND url IN ({", ".join("?" * len(chunk))})
+                ''', (thread_id, field, *chunk))
+                results.update((url, json.loads(value)) for url, value in rows)
+        finally:
+            conn.close()
+        return results
+
+    def put_url_results(self, thread_id: str, field: str, results: Dict[str, Any]):
+        """Memoize `field` results of a run, by URL"""
+        if not results:
+            return
+        now = self._clock()
+        conn = self.connect()
+        try:
+            conn.executemany('''
+                INSERT OR REPLACE INTO url_results (thread_id, url, field, value, stored_at) VALUES (?, ?, ?, ?, ?)
+            ''', [(thread_id, url, field, json.dumps(value), now) for url, value in results.items()])
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,270 @@
+import sqlite3
+import json
+import time
+import uuid
+import threading
+from typing import Callable, Dict, List, Any, Optional
+
+DEFAULT_WORKERS = 4
+# A claimed item not finished within its lease is handed out again (e.g. after a crash)
+ITEM_LEASE_SECONDS = 300
+# Items that keep getting picked up without finishing are given up on
+MAX_ITEM_ATTEMPTS = 3
+IDLE_POLL_SECONDS = 1.0
+
+JobHandler = Callable[[str, Dict[str, Any]], Dict[str, Any]]
+
+class JobQueue:
+    """Persistent SQLite-backed job queue that processes URL items on a worker pool.
+
+    Every item is checkpointed as it finishes, so a restarted server resumes a job
+    from its first unfinished item.
+    """
+
+    def __init__(self, handlers: Dict[str, JobHandler], db_path: str = "urls.db", workers: int = DEFAULT_WORKERS):
+        self.handlers = handlers
+        self.db_path = db_path
+        self.workers = workers
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._start_lock = threading.Lock()
+        self.init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        # WAL keeps readers (status polls) from blocking the per-item checkpoints
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def init_database(self):
+        """Create job tables"""
+        conn = self._connect()
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS url_jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                params TEXT,
+                status TEXT NOT NULL DEFAULT 'queued',
+                total INTEGER NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                finished_at TIMESTAMP
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS url_job_items (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                input TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_expires_at REAL,
+                PRIMARY KEY (job_id, idx)
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_url_job_items_status ON url_job_items (status, lease_expires_at)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def start(self):
+        """Start the worker pool. Unfinished jobs from earlier runs are picked up automatically"""
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker_loop, name=f"url-job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """Stop the workers; items in flight are resumed on the next start"""
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping.clear()
+
+    def submit(self, kind: str, items: List[str], params: Dict[str, Any] = None) -> str:
+        """Persist a new job and wake the workers"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind '{kind}'. Use one of: {', '.join(self.handlers)}")
+        if not items:
+            raise ValueError("A job needs at least one item")
+
+        job_id = uuid.uuid4().hex[:16]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute('''
+                    INSERT INTO url_jobs (id, kind, params, total) VALUES (?, ?, ?, ?)
+                ''', (job_id, kind, json.dumps(params or {}), len(items)))
+                conn.executemany('''
+                    INSERT INTO url_job_items (job_id, idx, input) VALUES (?, ?, ?)
+                ''', ((job_id, i, item) for i, item in enumerate(items)))
+        finally:
+            conn.close()
+
+        self.start()
+        self._wakeup.set()
+        return job_id
+
+    def _claim(self, conn: sqlite3.Connection) -> Optional[tuple]:
+        """Atomically lease the next runnable item"""
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                # Expired leases first, then pending items in submission order; both are index lookups
+                row = conn.execute('''
+                    SELECT i.job_id, i.idx, i.input, i.attempts, j.kind, j.params
+                    FROM url_job_items i JOIN url_jobs j ON j.id = i.job_id
+                    WHERE i.status = 'running' AND i.lease_expires_at < ?
+                    LIMIT 1
+                ''', (now,)).fetchone() or conn.execute('''
+                    SELECT i.job_id, i.idx, i.input, i.attempts, j.kind, j.params
+                    FROM url_job_items i JOIN url_jobs j ON j.id = i.job_id
+                    WHERE i.status = 'pending'
+                    ORDER BY i.rowid
+                    LIMIT 1
+                ''').fetchone()
+
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                job_id, idx, item, attempts, kind, params = row
+                if attempts < MAX_ITEM_ATTEMPTS:
+                    break
+                # The item has repeatedly outlived its lease; record it as failed
+                self._finish_locked(conn, job_id, idx, None, f"Gave up after {attempts} attempts")
+
+            conn.execute('''
+                UPDATE url_job_items SET status = 'running', attempts = attempts + 1, lease_expires_at = ?
+                WHERE job_id = ? AND idx = ?
+            ''', (now + ITEM_LEASE_SECONDS, job_id, idx))
+            conn.execute('''
+                UPDATE url_jobs SET status = 'running', updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND status = 'queued'
+            ''', (job_id,))
+            conn.execute("COMMIT")
+            return job_id, idx, item, kind, json.loads(params or '{}')
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _finish_locked(self, conn: sqlite3.Connection, job_id: str, idx: int,
+                       result: Optional[Dict[str, Any]], error: Optional[str]):
+        updated = conn.execute('''
+            UPDATE url_job_items SET status = ?, result = ?, error = ?, lease_expires_at = NULL
+            WHERE job_id = ? AND idx = ? AND status NOT IN ('done', 'error')
+        ''', ('error' if error else 'done', json.dumps(result) if result is not None else None,
+              error, job_id, idx)).rowcount
+        if not updated:
+            # Another worker already checkpointed this item after its lease expired
+            return
+
+        conn.execute('''
+            UPDATE url_jobs
+            SET completed = completed + 1, failed = failed + ?, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', (1 if error else 0, job_id))
+        conn.execute('''
+            UPDATE url_jobs SET status = 'complete', finished_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND completed >= total
+        ''', (job_id,))
+
+    def _checkpoint(self, conn: sqlite3.Connection, job_id: str, idx: int,
+                    result: Optional[Dict[str, Any]], error: Optional[str]):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._finish_locked(conn, job_id, idx, result, error)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _worker_loop(self):
+        conn = self._connect()
+        # Transactions are managed explicitly so claims can use BEGIN IMMEDIATE
+        conn.isolation_level = None
+        try:
+            while not self._stopping.is_set():
+                try:
+                    claimed = self._claim(conn)
+                except sqlite3.OperationalError:
+                    # Database busy; back off and retry
+                    time.sleep(IDLE_POLL_SECONDS)
+                    continue
+
+                if claimed is None:
+                    self._wakeup.wait(IDLE_POLL_SECONDS)
+                    self._wakeup.clear()
+                    continue
+
+                job_id, idx, item, kind, params = claimed
+                try:
+                    result, error = self.handlers[kind](item, params), None
+                except Exception as e:
+                    result, error = None, str(e)
+
+                while True:
+                    try:
+                        self._checkpoint(conn, job_id, idx, result, error)
+                        break
+                    except sqlite3.OperationalError:
+                        if self._stopping.is_set():
+                            # The lease will expire and the item is redone on the next start
+                            break
+                        time.sleep(IDLE_POLL_SECONDS)
+        finally:
+            conn.close()
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's progress counters"""
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        row = conn.execute("SELECT * FROM url_jobs WHERE id = ?", (job_id,)).fetchone()
+        conn.close()
+
+        if row is None:
+            return None
+
+        job = dict(row)
+        job['params'] = json.loads(job['params'] or '{}')
+        job['pending'] = job['total'] - job['completed']
+        return job
+
+    def results(self, job_id: str, offset: int = 0, limit: int = 50) -> List[Dict[str, Any]]:
+        """Return checkpointed item results in input order"""
+        conn = self._connect()
+        rows = conn.execute('''
+            SELECT idx, input, status, result, error FROM url_job_items
+            WHERE job_id = ? AND status IN ('done', 'error')
+            ORDER BY idx LIMIT ? OFFSET ?
+        ''', (job_id, limit, offset)).fetchall()
+        conn.close()
+
+        return [
+            {
+                'index': idx,
+                'input': item,
+                'status': status,
+                'result': json.loads(result) if result else None,
+                'error': error
+            }
+            for idx, item, status, result, error in rows
+        ]
@@ -0,0 +1,244 @@
+"""Load generator for the MCP server over stdio or streamable HTTP.
+
+Virtual users call tools back to back, picking each call from a weighted tool mix
+(scenario names from benchmark_tools.py), while the local HTTP stand-in answers every
+external request. Users start according to a ramp profile; calls started during the
+warm-up period are left out of the totals. Reports achieved RPS, latency percentiles
+and error rates overall, per scenario and per time interval:
+
+    python load_test.py --transport http --users 32 --duration 30 --ramp linear --ramp-seconds 10
+    python load_test.py --transport stdio --users 8 --mix shorten_url=1,list_my_urls=3
+
+Over stdio one server process serves one session, so all users share it. Over HTTP
+every user opens its own session to a single server process (or to --url).
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import asyncio
+import argparse
+import itertools
+import tempfile
+import subprocess
+from collections import Counter
+from contextlib import AsyncExitStack
+from fixture_server import FixtureServer, fixture_env
+from benchmark_tools import SERVER_PATH, scenarios, prepare, percentile, call_failed, git_commit
+
+# web_search stays out: Tavily's tokenizer downloads its encoding on first use, so it needs network
+DEFAULT_MIX = "shorten_url=3,list_my_urls=3,get_url_metadata=2"
+RAMP_PROFILES = ('none', 'linear', 'step')
+DEFAULT_USERS = 16
+DEFAULT_DURATION = 30.0
+DEFAULT_WARMUP = 5.0
+DEFAULT_INTERVAL = 1.0
+DEFAULT_RAMP_STEPS = 4
+SERVER_START_TIMEOUT = 30.0
+# Distinct error messages kept in the report
+MAX_ERROR_KINDS = 10
+
+def parse_mix(mix: str) -> dict:
+    """'shorten_url=3,list_my_urls=1' -> {'shorten_url': 3.0, 'list_my_urls': 1.0}"""
+    weights = {}
+    for part in mix.split(','):
+        name, _, weight = part.strip().partition('=')
+        weights[name] = float(weight or 1)
+    return weights
+
+def start_offsets(users: int, ramp: str, ramp_seconds: float, steps: int = DEFAULT_RAMP_STEPS) -> list:
+    """Seconds after the start at which each user begins calling"""
+    if ramp == 'none' or not ramp_seconds or users <= 1:
+        return [0.0] * users
+    if ramp == 'linear':
+        return [ramp_seconds * user / users for user in range(users)]
+    # 'step': equal groups of users, one group joining every ramp_seconds / steps
+    return [(user * steps // users) * ramp_seconds / steps for user in range(users)]
+
+def summarize(samples: list, seconds: float) -> dict:
+    """Totals for (start, scenario, latency, failed, error) samples over a window of `seconds`"""
+    latencies = sorted(sample[2] for sample in samples)
+    errors = sum(1 for sample in samples if sample[3])
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': errors / len(samples) if samples else 0.0,
+        'rps': len(samples) / seconds if seconds else 0.0,
+        'latency_ms': {
+            'p50': percentile(latencies, 0.5) * 1000,
+            'p90': percentile(latencies, 0.9) * 1000,
+            'p99': percentile(latencies, 0.99) * 1000,
+            'max': latencies[-1] * 1000 if latencies else 0.0
+        }
+    }
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_http_server(workdir: str, env: dict, workers: int = 1) -> tuple:
+    """Spawn server.py with the streamable HTTP transport and wait until it accepts connections"""
+    port = free_port()
+    env = {**env, 'MCP_TRANSPORT': "streamable-http", 'MCP_HOST': "127.0.0.1", 'MCP_PORT': str(port),
+           'MCP_WORKERS': str(workers)}
+    process = subprocess.Popen([sys.executable, SERVER_PATH], cwd=workdir, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"server.py exited with code {process.returncode}")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process, f"http://127.0.0.1:{port}/mcp"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("server.py did not start listening in time")
+
+async def open_sessions(stack: AsyncExitStack, args, env: dict, workdir: str) -> list:
+    """One shared stdio session, or one HTTP session per user"""
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport, StreamableHttpTransport
+
+    if args.transport == 'stdio':
+        transport = StdioTransport(command=sys.executable, args=[SERVER_PATH], env=env, cwd=workdir)
+        client = await stack.enter_async_context(Client(transport))
+        return [client] * args.users
+
+    url = args.url
+    if not url:
+        process, url = start_http_server(workdir, env, args.workers)
+        stack.callback(process.wait)
+        stack.callback(process.terminate)
+    clients = [Client(StreamableHttpTransport(url)) for _ in range(args.users)]
+    await asyncio.gather(*(stack.enter_async_context(client) for client in clients))
+    return clients
+
+async def run_load(args) -> dict:
+    weights = parse_mix(args.mix)
+    with FixtureServer(latency_ms=args.latency_ms) as fixture:
+        available = {name: (tool, make_args) for name, tool, make_args in scenarios(fixture.base_url, fixture.page_size)}
+        unknown = set(weights) - set(available)
+        if unknown:
+            raise ValueError(f"Unknown scenarios in mix: {', '.join(sorted(unknown))}")
+        names, name_weights = list(weights), list(weights.values())
+
+        # A scratch directory keeps the load away from the real urls.db and caches
+        with tempfile.TemporaryDirectory() as workdir:
+            env = {**os.environ, **fixture_env(fixture.base_url)}
+            async with AsyncExitStack() as stack:
+                clients = await open_sessions(stack, args, env, workdir)
+                setup = await prepare(clients[0], fixture.base_url)
+
+                offsets = start_offsets(args.users, args.ramp, args.ramp_seconds, args.ramp_steps)
+                call_numbers = itertools.count()
+                samples = []
+                started = time.perf_counter()
+                stop_at = started + args.warmup + args.duration
+
+                async def user(index: int):
+                    rng = random.Random(args.seed + index)
+                    await asyncio.sleep(offsets[index])
+                    while time.perf_counter() < stop_at:
+                        name = rng.choices(names, name_weights)[0]
+                        tool, make_args = available[name]
+                        call_started = time.perf_counter()
+                        error = None
+                        try:
+                            result = await clients[index].call_tool(tool, make_args(next(call_numbers), setup),
+                                                                    raise_on_error=False)
+                            if call_failed(result):
+                                error = ((result.structured_content or {}).get('error')
+                                         or (result.content[0].text if result.content else "tool error"))
+                        except Exception as e:
+                            error = f"{type(e).__name__}: {e}"
+                        samples.append((call_started - started, name, time.perf_counter() - call_started,
+                                        error is not None, error))
+                        if args.think_ms:
+                            await asyncio.sleep(args.think_ms / 1000)
+
+                await asyncio.gather(*(user(index) for index in range(args.users)))
+                elapsed = time.perf_counter() - started
+
+    measured = [sample for sample in samples if sample[0] >= args.warmup]
+    window = max(elapsed - args.warmup, 1e-9)
+    timeline = []
+    for start in range(int(elapsed / args.interval) + 1):
+        low, high = start * args.interval, (start + 1) * args.interval
+        bucket = [sample for sample in samples if low <= sample[0] < high]
+        if bucket:
+            timeline.append({'start_seconds': low, 'users': sum(1 for offset in offsets if offset < high),
+                             'warmup': low < args.warmup, **summarize(bucket, args.interval)})
+
+    errors = Counter(sample[4] for sample in measured if sample[3])
+    return {
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'git_commit': git_commit(),
+        'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        'overall': summarize(measured, window),
+        'scenarios': {name: summarize([sample for sample in measured if sample[1] == name], window) for name in names},
+        'errors': dict(errors.most_common(MAX_ERROR_KINDS)),
+        'timeline': timeline
+    }
+
+def print_report(report: dict):
+    def line(label: str, stats: dict) -> str:
+        latency = stats['latency_ms']
+        return (f"{label:<22} {stats['rps']:>8.1f} rps  p50 {latency['p50']:>8.1f}  p90 {latency['p90']:>8.1f}  "
+                f"p99 {latency['p99']:>8.1f} ms  errors {stats['error_rate']:>6.1%} ({stats['errors']}/{stats['requests']})")
+
+    print("\n⏱️  Timeline")
+    for interval in report['timeline']:
+        label = f"{interval['start_seconds']:>6.1f}s {interval['users']:>4} users{' *' if interval['warmup'] else ''}"
+        print(line(label, interval))
+    print("  (* warm-up, not counted)")
+
+    print("\n📊 Per scenario")
+    for name, stats in report['scenarios'].items():
+        print(line(name, stats))
+    print(line("TOTAL", report['overall']))
+
+    if report['errors']:
+        print("\n❌ Errors")
+        for message, count in report['errors'].items():
+            print(f"{count:>6} × {message[:120]}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Drive concurrent MCP sessions against server.py")
+    parser.add_argument("--transport", choices=('stdio', 'http'), default='http')
+    parser.add_argument("--url", help="load an already running streamable HTTP server instead of spawning one")
+    parser.add_argument("--workers", type=int, default=1, help="worker processes of the spawned HTTP server")
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=DEFAULT_DURATION, help="measured seconds after warm-up")
+    parser.add_argument("--warmup", type=float, default=DEFAULT_WARMUP, help="seconds of calls left out of the totals")
+    parser.add_argument("--ramp", choices=RAMP_PROFILES, default='none')
+    parser.add_argument("--ramp-seconds", type=float, default=0.0, help="time until all users are active")
+    parser.add_argument("--ramp-steps", type=int, default=DEFAULT_RAMP_STEPS, help="groups of users for --ramp step")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="weighted scenarios, e.g. shorten_url=3,list_my_urls=1")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="pause between a user's calls")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency the stand-in adds to every response")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="timeline bucket in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON")
+    args = parser.parse_args()
+
+    print("🔥 MCP Load Test")
+    print("=" * 50)
+    transport = f"http ({args.workers} workers)" if args.transport == 'http' and not args.url else args.transport
+    print(f"{args.users} users over {transport}, ramp {args.ramp} ({args.ramp_seconds:g}s), "
+          f"warm-up {args.warmup:g}s, measured {args.duration:g}s")
+    print(f"Mix: {args.mix}")
+    report = asyncio.run(run_load(args))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Report written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+import sqlite3
+import os
+import re
+from typing import Optional, Dict, Any
+
+BASE62_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+CODE_LENGTH = 7
+CODE_SPACE = 62 ** CODE_LENGTH
+# Odd and not a multiple of 31, so it is coprime with 62**7 and
+# id -> id * CODE_MULTIPLIER mod CODE_SPACE is a bijection: distinct ids never share a code
+CODE_MULTIPLIER = 2147483647
+CUSTOM_ALIAS_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+# Links only work where something serves GET /s/<code>, e.g. server.py over HTTP on port 8000;
+# server.py warns when neither SHORT_URL_BASE is set nor an HTTP app is running
+DEFAULT_SHORT_URL_BASE = "http://localhost:8000/s/"
+
+def encode_base62(number: int, length: int = CODE_LENGTH) -> str:
+    """Encode a non-negative integer as a fixed-width base62 string"""
+    chars = []
+    while number:
+        number, remainder = divmod(number, 62)
+        chars.append(BASE62_ALPHABET[remainder])
+    return ''.join(reversed(chars)).rjust(length, BASE62_ALPHABET[0])
+
+def code_for_id(row_id: int) -> str:
+    """Map a sequence id to a non-sequential but collision-free short code"""
+    return encode_base62((row_id * CODE_MULTIPLIER) % CODE_SPACE)
+
+class LocalShortener:
+    """In-process URL shortener backed by the urls.db SQLite database"""
+
+    def __init__(self, db_path: str = "urls.db", base_url: str = None):
+        self.db_path = db_path
+        self.base_url = base_url or os.getenv("SHORT_URL_BASE", DEFAULT_SHORT_URL_BASE)
+        if not self.base_url.endswith('/'):
+            self.base_url += '/'
+        self.init_database()
+
+    def init_database(self):
+        """Create the short code table and its indexes"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS short_codes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                code TEXT,
+                original_url TEXT NOT NULL,
+                is_custom BOOLEAN DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Generated codes and custom aliases share one namespace
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_short_codes_code ON short_codes (code)
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_short_codes_url ON short_codes (original_url, is_custom)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    def short_url(self, code: str) -> str:
+        """Build the public short URL for a code"""
+        return f"{self.base_url}{code}"
+
+    def shorten(self, url: str, conn: sqlite3.Connection = None) -> str:
+        """Return the generated code for a URL, creating one if needed.
+
+        When a connection is passed, the caller owns the transaction and commits it.
+        """
+        if conn is not None:
+            return self._shorten(conn, url)
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                return self._shorten(conn, url)
+        finally:
+            conn.close()
+
+    def _shorten(self, conn: sqlite3.Connection, url: str) -> str:
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            SELECT code FROM short_codes
+            WHERE original_url = ? AND is_custom = 0 AND code IS NOT NULL
+            LIMIT 1
+        ''', (url,))
+        row = cursor.fetchone()
+        if row:
+            return row[0]
+
+        while True:
+            cursor.execute("INSERT INTO short_codes (original_url, is_custom) VALUES (?, 0)", (url,))
+            row_id = cursor.lastrowid
+            code = code_for_id(row_id)
+            try:
+                cursor.execute("UPDATE short_codes SET code = ? WHERE id = ?", (code, row_id))
+                return code
+            except sqlite3.IntegrityError:
+                # A custom alias already holds this code; burn the id and take the next one
+                cursor.execute("DELETE FROM short_codes WHERE id = ?", (row_id,))
+
+    def reserve_alias(self, url: str, alias: str) -> bool:
+        """Reserve a custom alias for a URL. Returns False if the alias is taken"""
+        if not CUSTOM_ALIAS_PATTERN.match(alias):
+            raise ValueError("Custom alias may only contain letters, digits, '-' and '_' (max 64 characters)")
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                conn.execute('''
+                    INSERT INTO short_codes (code, original_url, is_custom) VALUES (?, ?, 1)
+                ''', (alias, url))
+            return True
+        except sqlite3.IntegrityError:
+            return False
+        finally:
+            conn.close()
+
+    def release_alias(self, alias: str):
+        """Free a reserved custom alias, e.g. when saving its link failed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                conn.execute("DELETE FROM short_codes WHERE code = ? AND is_custom = 1", (alias,))
+        finally:
+            conn.close()
+
+    def resolve(self, code_or_url: str) -> Optional[Dict[str, Any]]:
+        """Resolve a code or full short URL to its original URL"""
+        code = code_or_url.strip()
+        if code.startswith(self.base_url):
+            code = code[len(self.base_url):]
+        code = code.rstrip('/').rsplit('/', 1)[-1]
+
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT code, original_url, is_custom, created_at FROM short_codes WHERE code = ?
+        ''', (code,))
+        row = cursor.fetchone()
+        conn.close()
+
+        if not row:
+            return None
+
+        return {
+            'code': row[0],
+            'original_url': row[1],
+            'is_custom': bool(row[2]),
+            'created_at': row[3],
+            'short_url': self.short_url(row[0])
+        }
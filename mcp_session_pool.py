@@ -0,0 +1,117 @@
+import asyncio
+from typing import Any, Dict, List
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+DEFAULT_POOL_SIZE = 4
+# A call that fails because its session broke is retried this many times on a fresh session
+DEFAULT_RECONNECT_ATTEMPTS = 1
+
+class MCPSessionPool:
+    """Long-lived fastmcp client sessions to one MCP server, shared by concurrent callers.
+
+    `server` is anything fastmcp.Client accepts: a server script path (one subprocess per
+    session), an HTTP URL or an in-process FastMCP instance; or a zero-argument callable
+    returning a transport, since one stdio transport instance serves one session. Sessions open on
+    demand up to `size` and are reused across calls. A session that fails with anything other
+    than a tool error is closed and the call retried on a new one. Use a pool from one event
+    loop; after close() it can be started again.
+
+        async with MCPSessionPool("server.py") as pool:
+            result = await pool.call_tool("shorten_url", {"url": "https://python.org"})
+    """
+
+    def __init__(self, server: Any, size: int = DEFAULT_POOL_SIZE,
+                 reconnect_attempts: int = DEFAULT_RECONNECT_ATTEMPTS):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.server = server
+        self.size = size
+        self.reconnect_attempts = reconnect_attempts
+        self._idle: List[Client] = []
+        self._sessions: List[Client] = []
+        self._slots = None
+        self._closed = False
+        self.connects = 0
+        self.reconnects = 0
+        self.calls = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def start(self):
+        """Open the first session, so a bad server path or URL fails here rather than mid-workflow"""
+        self._closed = False
+        slots = self._get_slots()
+        async with slots:
+            if not self._idle:
+                self._idle.append(await self._connect())
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created lazily so the pool binds to the event loop that first uses it
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.size)
+        return self._slots
+
+    async def _connect(self) -> Client:
+        client = Client(self.server() if callable(self.server) else self.server)
+        await client.__aenter__()
+        self._sessions.append(client)
+        self.connects += 1
+        return client
+
+    async def _discard(self, client: Client):
+        if client in self._sessions:
+            self._sessions.remove(client)
+        try:
+            await client.close()
+        except Exception:
+            pass
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any] = None, **kwargs):
+        """Call a tool on a pooled session; tool errors raise ToolError as with fastmcp.Client"""
+        if self._closed:
+            raise RuntimeError("MCP session pool is closed")
+
+        async with self._get_slots():
+            for attempt in range(self.reconnect_attempts + 1):
+                client = self._idle.pop() if self._idle else await self._connect()
+                try:
+                    result = await client.call_tool(name, arguments or {}, **kwargs)
+                except (ToolError, asyncio.CancelledError):
+                    # The tool failed or the caller gave up waiting (e.g. a timeout); the session is fine
+                    self._idle.append(client)
+                    raise
+                except Exception:
+                    await self._discard(client)
+                    if attempt == self.reconnect_attempts:
+                        raise
+                    self.reconnects += 1
+                    continue
+                self.calls += 1
+                self._idle.append(client)
+                return result
+
+    async def close(self):
+        """Close every session (and stop the server subprocesses they started)"""
+        self._closed = True
+        self._slots = None
+        sessions, self._sessions, self._idle = self._sessions, [], []
+        for client in sessions:
+            try:
+                await client.close()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'sessions': len(self._sessions),
+            'idle': len(self._idle),
+            'connects': self.connects,
+            'reconnects': self.reconnects,
+            'calls': self.calls
+        }
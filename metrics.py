@@ -0,0 +1,188 @@
+import time
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Tuple
+
+# Each power-of-two range of microseconds is split into this many linear sub-buckets,
+# bounding the relative error of any recorded latency to 1/LATENCY_SUB_BUCKETS
+LATENCY_SUB_BUCKETS = 32
+LATENCY_UNIT_SECONDS = 1e-6
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+# Name of the tool whose call is being handled; spans are attributed to it
+current_tool = contextvars.ContextVar('current_tool', default='-')
+
+class LatencyHistogram:
+    """HDR-style log-linear latency histogram with fixed relative precision and O(1) recording"""
+
+    def __init__(self, sub_buckets: int = LATENCY_SUB_BUCKETS, unit: float = LATENCY_UNIT_SECONDS):
+        if sub_buckets & (sub_buckets - 1):
+            raise ValueError("sub_buckets must be a power of two")
+        self.sub_buckets = sub_buckets
+        self.unit = unit
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _index(self, units: int) -> int:
+        if units < self.sub_buckets:
+            return units
+        # units lies in [2**(b+m-1), 2**(b+m)); its top b+1 bits select the sub-bucket
+        magnitude = units.bit_length() - self.sub_buckets.bit_length() + 1
+        return magnitude * self.sub_buckets + (units >> (magnitude - 1)) - self.sub_buckets
+
+    def _upper_bound(self, index: int) -> float:
+        """Highest value (in seconds) that lands in a bucket"""
+        if index < self.sub_buckets:
+            return (index + 1) * self.unit
+        magnitude, offset = divmod(index, self.sub_buckets)
+        return ((offset + self.sub_buckets + 1) << (magnitude - 1)) * self.unit
+
+    def record(self, seconds: float):
+        units = max(int(seconds / self.unit), 0)
+        index = self._index(units)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'sum_seconds': self.total,
+            'mean_seconds': self.total / self.count if self.count else 0.0,
+            'max_seconds': self.max,
+            **{f"p{int(q * 100)}_seconds": self.quantile(q) for q in REPORTED_QUANTILES}
+        }
+
+class Metrics:
+    """Thread-safe registry of tool and operation latency histograms and call counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.tool_latency: Dict[str, LatencyHistogram] = {}
+        self.tool_calls: Dict[Tuple[str, str], int] = {}
+        self.operation_latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self.operation_errors: Dict[Tuple[str, str], int] = {}
+
+    def record_tool(self, tool: str, seconds: float, status: str):
+        with self._lock:
+            self.tool_latency.setdefault(tool, LatencyHistogram()).record(seconds)
+            self.tool_calls[(tool, status)] = self.tool_calls.get((tool, status), 0) + 1
+
+    def record_operation(self, operation: str, seconds: float, failed: bool = False):
+        key = (operation, current_tool.get())
+        with self._lock:
+            self.operation_latency.setdefault(key, LatencyHistogram()).record(seconds)
+            if failed:
+                self.operation_errors[key] = self.operation_errors.get(key, 0) + 1
+
+    @contextmanager
+    def tool_call(self, tool: str):
+        """Time a tool call; spans inside it are attributed to the tool.
+
+        Yields a dict whose 'status' the caller may set to 'error' for failed results.
+        """
+        token = current_tool.set(tool)
+        outcome = {'status': 'ok'}
+        started = time.perf_counter()
+        try:
+            yield outcome
+        except BaseException:
+            outcome['status'] = 'error'
+            raise
+        finally:
+            self.record_tool(tool, time.perf_counter() - started, outcome['status'])
+            current_tool.reset(token)
+
+    @contextmanager
+    def span(self, operation: str):
+        """Time a block of work inside the current tool call"""
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record_operation(operation, time.perf_counter() - started, failed)
+
+    def timed(self, operation: str):
+        """Decorator form of span()"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(operation):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def instrument(self, obj: Any, component: str, methods: List[str]) -> Any:
+        """Wrap the named methods of an object in spans called '<component>.<method>'"""
+        for name in methods:
+            setattr(obj, name, self.timed(f"{component}.{name}")(getattr(obj, name)))
+        return obj
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            tools = []
+            for tool, histogram in sorted(self.tool_latency.items()):
+                errors = self.tool_calls.get((tool, 'error'), 0)
+                tools.append({'name': tool, 'errors': errors, **histogram.snapshot()})
+            operations = []
+            for (operation, tool), histogram in sorted(self.operation_latency.items()):
+                errors = self.operation_errors.get((operation, tool), 0)
+                operations.append({'name': operation, 'tool': tool, 'errors': errors, **histogram.snapshot()})
+        return {'uptime_seconds': time.time() - self.started_at, 'tools': tools, 'operations': operations}
+
+    def prometheus(self, counters: Optional[Dict[str, float]] = None) -> str:
+        """Render the registry in the Prometheus text exposition format"""
+        def labels(**values) -> str:
+            return '{' + ','.join(f'{key}="{value}"' for key, value in values.items()) + '}'
+
+        lines = [
+            "# HELP mcp_tool_duration_seconds Latency of MCP tool calls",
+            "# TYPE mcp_tool_duration_seconds summary"
+        ]
+        with self._lock:
+            for tool, histogram in sorted(self.tool_latency.items()):
+                for q in REPORTED_QUANTILES:
+                    lines.append(f"mcp_tool_duration_seconds{labels(tool=tool, quantile=q)} {histogram.quantile(q):.6f}")
+                lines.append(f"mcp_tool_duration_seconds_sum{labels(tool=tool)} {histogram.total:.6f}")
+                lines.append(f"mcp_tool_duration_seconds_count{labels(tool=tool)} {histogram.count}")
+
+            lines += ["# HELP mcp_tool_calls_total MCP tool calls by outcome", "# TYPE mcp_tool_calls_total counter"]
+            for (tool, status), count in sorted(self.tool_calls.items()):
+                lines.append(f"mcp_tool_calls_total{labels(tool=tool, status=status)} {count}")
+
+            lines += [
+                "# HELP mcp_operation_duration_seconds Latency of internal operations, by calling tool",
+                "# TYPE mcp_operation_duration_seconds summary"
+            ]
+            for (operation, tool), histogram in sorted(self.operation_latency.items()):
+                for q in REPORTED_QUANTILES:
+                    lines.append(f"mcp_operation_duration_seconds{labels(operation=operation, tool=tool, quantile=q)} "
+                                 f"{histogram.quantile(q):.6f}")
+                lines.append(f"mcp_operation_duration_seconds_sum{labels(operation=operation, tool=tool)} {histogram.total:.6f}")
+                lines.append(f"mcp_operation_duration_seconds_count{labels(operation=operation, tool=tool)} {histogram.count}")
+
+        for name, value in sorted((counters or {}).items()):
+            lines += [f"# TYPE mcp_{name} counter", f"mcp_{name} {value}"]
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import cProfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional
+
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.005
+PROFILE_MODES = ('cprofile', 'sampling')
+# Dump paths kept for reporting
+MAX_RECENT_DUMPS = 20
+
+class StackSampler:
+    """Samples the stacks of all other threads at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stopping.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                    frame = frame.f_back
+                frames.append(names.get(thread_id, str(thread_id)))
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def write_collapsed(self, path: str):
+        """Write flamegraph.pl / speedscope compatible 'frame;frame;frame count' lines"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class ToolProfiler:
+    """Runtime-armed profiler for the next N calls of named tools.
+
+    When nothing is armed, profile_call() costs one dictionary lookup. Only one call is
+    profiled at a time; overlapping calls of an armed tool run unprofiled. Both modes see
+    every thread, so work that other requests do meanwhile is included.
+    """
+
+    def __init__(self, output_dir: str = DEFAULT_PROFILE_DIR):
+        self.output_dir = output_dir
+        self._lock = threading.Lock()
+        self._armed: Dict[str, Dict[str, Any]] = {}
+        self._active = False
+        self.recent_dumps: List[str] = []
+
+    def arm(self, tool: str, calls: int = 1, mode: str = 'cprofile', interval: float = DEFAULT_SAMPLE_INTERVAL):
+        """Profile the next `calls` calls of a tool; calls=0 disarms it"""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Use {' or '.join(PROFILE_MODES)}")
+        with self._lock:
+            if calls <= 0:
+                self._armed.pop(tool, None)
+            else:
+                self._armed[tool] = {'remaining': calls, 'mode': mode, 'interval': interval}
+
+    def is_armed(self, tool: str) -> bool:
+        """Cheap unlocked check used on every tool call"""
+        return tool in self._armed
+
+    def armed(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {tool: dict(settings) for tool, settings in self._armed.items()}
+
+    def _take(self, tool: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            settings = self._armed.get(tool)
+            if settings is None or self._active:
+                return None
+            settings['remaining'] -= 1
+            if settings['remaining'] <= 0:
+                del self._armed[tool]
+            self._active = True
+            return dict(settings)
+
+    def _dump_path(self, tool: str, extension: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.abspath(os.path.join(self.output_dir, f"{tool}-{stamp}-{time.time_ns() % 10**9:09d}.{extension}"))
+
+    @contextmanager
+    def profile_call(self, tool: str):
+        if not self._armed:
+            yield
+            return
+
+        settings = self._take(tool)
+        if settings is None:
+            yield
+            return
+
+        try:
+            if settings['mode'] == 'sampling':
+                sampler = StackSampler(settings['interval'])
+                sampler.start()
+                try:
+                    yield
+                finally:
+                    sampler.stop()
+                    path = self._dump_path(tool, 'collapsed')
+                    sampler.write_collapsed(path)
+                    self._record_dump(path)
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    yield
+                finally:
+                    profiler.disable()
+                    path = self._dump_path(tool, 'pstats')
+                    profiler.dump_stats(path)
+                    self._record_dump(path)
+        finally:
+            with self._lock:
+                self._active = False
+
+    def _record_dump(self, path: str):
+        with self._lock:
+            self.recent_dumps.append(path)
+            del self.recent_dumps[:-MAX_RECENT_DUMPS]
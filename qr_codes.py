@@ -0,0 +1,231 @@
+import io
+import os
+import hashlib
+import math
+import time
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Names of the qrcode.constants per level; qrcode (and PIL) are only imported when rendering
+ERROR_CORRECTION_LEVELS = {
+    'L': 'ERROR_CORRECT_L',
+    'M': 'ERROR_CORRECT_M',
+    'Q': 'ERROR_CORRECT_Q',
+    'H': 'ERROR_CORRECT_H',
+}
+
+DEFAULT_CACHE_DIR = ".qr_cache"
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Worker processes share the cache directory; each re-reads it this often before evicting
+DEFAULT_RESCAN_INTERVAL = 5.0
+
+QR_BORDER = 4
+
+OUTPUT_FORMATS = ('png', 'svg', 'matrix', 'file')
+
+def _build_qr(data: str, error_correction: str, border: int = QR_BORDER) -> "qrcode.QRCode":
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=getattr(qrcode.constants, ERROR_CORRECTION_LEVELS[error_correction]),
+        box_size=1,
+        border=border,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+def render_qr_png(data: str, size: int = 10, error_correction: str = 'L') -> bytes:
+    """Render a QR code to PNG bytes (module-level so it can run in a process pool)"""
+    qr = _build_qr(data, error_correction)
+    qr.box_size = size
+
+    img = qr.make_image(fill_color="black", back_color="white")
+
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def render_qr_svg(data: str, size: int = 10, error_correction: str = 'L') -> bytes:
+    """Render a QR code as a single stroked SVG path of run-length encoded rows"""
+    matrix = _build_qr(data, error_correction).get_matrix()
+    modules = len(matrix)
+
+    segments = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < modules:
+            if not row[x]:
+                x += 1
+                continue
+            run = 1
+            while x + run < modules and row[x + run]:
+                run += 1
+            # Each run is a 1-unit-wide stroke along the middle of its row
+            segments.append(f"M{x} {y}.5h{run}")
+            x += run
+
+    pixels = modules * size
+    svg = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {modules} {modules}" shape-rendering="crispEdges">'
+        f'<rect width="{modules}" height="{modules}" fill="#fff"/>'
+        f'<path d="{"".join(segments)}" stroke="#000"/></svg>'
+    )
+    return svg.encode()
+
+def render_qr_matrix(data: str, size: int = 10, error_correction: str = 'L') -> bytes:
+    """Pack the QR module matrix (no quiet zone) into bits, row-major and MSB first"""
+    matrix = _build_qr(data, error_correction, border=0).get_matrix()
+
+    packed = bytearray((len(matrix) ** 2 + 7) // 8)
+    bit = 0
+    for row in matrix:
+        for dark in row:
+            if dark:
+                packed[bit >> 3] |= 0x80 >> (bit & 7)
+            bit += 1
+    return bytes(packed)
+
+def matrix_modules(packed: bytes) -> int:
+    """Recover the side length of a packed square matrix"""
+    return math.isqrt(len(packed) * 8)
+
+RENDERERS = {
+    'png': render_qr_png,
+    'svg': render_qr_svg,
+    'matrix': render_qr_matrix,
+}
+
+def render_qr(data: str, size: int = 10, error_correction: str = 'L', fmt: str = 'png') -> bytes:
+    """Render a QR code in one of the RENDERERS formats"""
+    return RENDERERS[fmt](data, size, error_correction)
+
+def png_dimensions(png: bytes) -> Tuple[int, int]:
+    """Read width and height from a PNG IHDR chunk"""
+    return struct.unpack('>II', png[16:24])
+
+class QRCodeCache:
+    """Content-addressed on-disk cache of rendered QR codes with LRU eviction.
+
+    The bounds hold for the directory, not per process: puts re-read it at most every
+    rescan_interval seconds, so entries written by other processes are counted and evicted too.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 rescan_interval: float = DEFAULT_RESCAN_INTERVAL):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.rescan_interval = rescan_interval
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index, self._total_bytes = self._scan()
+        self._scanned_at = time.monotonic()
+
+    def _scan(self) -> Tuple["OrderedDict[str, int]", int]:
+        """Rebuild the LRU order and total size from the files' modification times"""
+        index = OrderedDict()
+        total_bytes = 0
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.startswith('.') or name.endswith('.tmp'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name, stat.st_size))
+
+        for _, name, size in sorted(entries):
+            index[name] = size
+            total_bytes += size
+        return index, total_bytes
+
+    @staticmethod
+    def make_key(data: str, size: int, error_correction: str, fmt: str = 'png') -> str:
+        """Build the content address for a rendered code"""
+        digest = hashlib.sha256(f"{size}|{error_correction}|{data}".encode()).hexdigest()
+        return f"{digest}.{fmt}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for a key, refreshing its LRU position"""
+        try:
+            with open(self._path(key), 'rb') as f:
+                content = f.read()
+        except OSError:
+            with self._lock:
+                self.misses += 1
+                if key in self._index:
+                    self._total_bytes -= self._index.pop(key)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            if key not in self._index:
+                self._index[key] = len(content)
+                self._total_bytes += len(content)
+            self._index.move_to_end(key)
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+        return content
+
+    def put(self, key: str, content: bytes):
+        """Store bytes atomically and evict least recently used entries"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+        # Pick up what other processes added or evicted since the last scan
+        rescanned = self._scan() if time.monotonic() - self._scanned_at >= self.rescan_interval else None
+
+        with self._lock:
+            if rescanned is not None:
+                self._index, self._total_bytes = rescanned
+                self._scanned_at = time.monotonic()
+            if key in self._index:
+                self._total_bytes -= self._index[key]
+            self._index[key] = len(content)
+            self._index.move_to_end(key)
+            self._total_bytes += len(content)
+            evicted = self._evict_locked()
+
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def _evict_locked(self) -> List[str]:
+        evicted = []
+        while self._index and (len(self._index) > self.max_entries or self._total_bytes > self.max_bytes):
+            old_key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            evicted.append(old_key)
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache occupancy and hit counters"""
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'bytes': self._total_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
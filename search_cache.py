@@ -0,0 +1,141 @@
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Callable, Dict, Any, Optional, Tuple
+from single_flight import SingleFlight
+
+DEFAULT_TTL_SECONDS = 3600
+DEFAULT_MAX_ENTRIES = 1000
+
+# Words dropped from the cache key: articles and politeness only, which never change the results
+# No single letters: "vitamin a" and "vitamin" are different searches
+FILLER_WORDS = frozenset("an the please pls kindly thanks".split())
+
+def normalize_query(query: str) -> str:
+    """Cache key text for a query: case-folded, whitespace-collapsed words in their original order.
+
+    "Please find  the Python release" and "find python release" map to the same key;
+    "python vs java" and "java vs python" do not.
+    """
+    words = query.casefold().split()
+    kept = [word for word in words if word.strip(".,;:!?") not in FILLER_WORDS]
+    # A query made only of filler words still needs a distinct key
+    return ' '.join(kept or words)
+
+class SearchCache:
+    """Persistent web search cache in urls.db with a TTL, LRU size bound and single-flight upstream calls"""
+
+    def __init__(self, db_path: str = "urls.db", ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES, clock=time.time):
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._flight = SingleFlight()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.init_database()
+
+    def init_database(self):
+        """Create the search cache table"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                query TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        ''')
+
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_search_cache_last_used ON search_cache (last_used_at)
+        ''')
+
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(query: str) -> str:
+        return hashlib.sha256(normalize_query(query).encode()).hexdigest()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def get(self, query: str) -> Optional[str]:
+        """Return a fresh cached result for the query, or None"""
+        key = self.make_key(query)
+        now = self._clock()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                row = conn.execute("SELECT result, created_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                result, created_at = row
+                if now - created_at > self.ttl_seconds:
+                    conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                    return None
+                conn.execute("UPDATE search_cache SET last_used_at = ? WHERE key = ?", (now, key))
+                return result
+        finally:
+            conn.close()
+
+    def put(self, query: str, result: str):
+        """Store a result, then drop expired entries and the least recently used beyond max_entries"""
+        now = self._clock()
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                conn.execute('''
+                    INSERT OR REPLACE INTO search_cache (key, query, result, created_at, last_used_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (self.make_key(query), normalize_query(query), result, now, now))
+                evicted = conn.execute("DELETE FROM search_cache WHERE created_at < ?",
+                                       (now - self.ttl_seconds,)).rowcount
+                excess = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0] - self.max_entries
+                if excess > 0:
+                    evicted += conn.execute('''
+                        DELETE FROM search_cache WHERE key IN (
+                            SELECT key FROM search_cache ORDER BY last_used_at LIMIT ?
+                        )
+                    ''', (excess,)).rowcount
+        finally:
+            conn.close()
+        self._count('evictions', evicted)
+
+    def get_or_fetch(self, query: str, fetch: Callable[[str], str]) -> Tuple[str, bool]:
+        """Return (result, from_cache). Concurrent misses for the same key share one fetch"""
+        cached = self.get(query)
+        if cached is not None:
+            self._count('hits')
+            return cached, True
+
+        def load() -> Tuple[str, bool]:
+            # Another caller (or server process) may have stored it since the first lookup
+            cached = self.get(query)
+            if cached is not None:
+                self._count('hits')
+                return cached, True
+            self._count('misses')
+            result = fetch(query)
+            self.put(query, result)
+            return result, False
+
+        return self._flight.do(self.make_key(query), load)
+
+    def stats(self) -> Dict[str, Any]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        entries = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        conn.close()
+        with self._stats_lock:
+            stats = {'entries': entries, 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+        stats['coalesced'] = self._flight.stats()['shared']
+        return stats
@@ -1,133 +1,230 @@
 from dotenv import load_dotenv
-from mcp.server.fastmcp import FastMCP
-from tavily import TavilyClient
+from mcp.server.fastmcp import Context
 import os
-import requests
-import pyshorteners
 from dice_roller import DiceRoller
-from enhanced_url_tools import EnhancedURLTools
-from url_storage import URLStorage
+from metrics import Metrics
+from profiling import ToolProfiler, DEFAULT_PROFILE_DIR
+from tool_results import (
+    SummaryFastMCP, SearchResult, DiceResult, ShortenResult, ResolveResult, BackendStatus, ShortenerStatusResult,
+    BatchItem, BatchShortenResult, BatchResultsPage, JobSubmitted, JobStatusResult, JobItem, JobResultsPage,
+    ValidationResult, URLMetadata, SafetyReport, MetadataBatchResult, SafetyBatchResult, QRCode, QRCodeResult, QRBatchResult, ExpandResult,
+    CollectionResult, SavedURL, URLListResult, Collection, CollectionListResult, LatencyStats, MetricsResult,
+    ArmedProfile, ProfilingStatus
+)
 import json
+import time
+import uuid
+import asyncio
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List
 
 load_dotenv()
 
-mcp = FastMCP("mcp-server")
-client = TavilyClient(os.getenv("TAVILY_API_KEY"))
+# Upper bound on URLs accepted by one batch call
+MAX_BATCH_URLS = 10000
+# Upper bound on a batch call's max_concurrency; the batch thread pool is twice this size
+MAX_BATCH_CONCURRENCY = 64
+# How often the batch engine wakes up to enforce per-item deadlines
+BATCH_POLL_INTERVAL = 0.25
+# Minimum spacing between progress notifications of one batch
+PROGRESS_MIN_INTERVAL = 0.1
+# Partial results are kept for this many recent batches
+MAX_TRACKED_BATCHES = 50
+DEFAULT_JOB_WORKERS = 4
+HTTP_TRANSPORTS = ('streamable-http', 'sse')
+# Set in processes that serve HTTP, where the /s/<code> route makes local short links work
+_serving_http = False
 
-# Initialize enhanced URL tools
-url_tools = EnhancedURLTools()
-url_storage = URLStorage()
+# Latency histograms of every tool call and of the component calls made inside it
+metrics = Metrics()
+
+# Profiles the next calls of tools armed with profile_tool; idle unless armed
+profiler = ToolProfiler(os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR))
+
+# Tools return typed results; the text content of each call is its `result` summary
+mcp = SummaryFastMCP("mcp-server", metrics=metrics, profiler=profiler)
+
+def _lazy_singleton(factory):
+    """Build the object on first call and share it afterwards (thread-safe).
+    
+    Clients often start a server per call, so heavy imports (tavily, requests,
+    BeautifulSoup, qrcode/PIL, pyshorteners) and database setup are deferred
+    until a tool actually needs them.
+    """
+    lock = threading.Lock()
+    instances = []
+    
+    @functools.wraps(factory)
+    def get():
+        if not instances:
+            with lock:
+                if not instances:
+                    instances.append(factory())
+        return instances[0]
+    
+    get.is_built = lambda: bool(instances)
+    return get
+
+@_lazy_singleton
+def tavily_client():
+    from tavily import TavilyClient
+    client = TavilyClient(os.getenv("TAVILY_API_KEY"))
+    # TAVILY_API_URL points searches at a stand-in (see fixture_server.py)
+    client.base_url = os.getenv("TAVILY_API_URL", client.base_url)
+    return metrics.instrument(client, 'tavily', ['get_search_context'])
+
+@_lazy_singleton
+def search_cache():
+    from search_cache import SearchCache, DEFAULT_TTL_SECONDS, DEFAULT_MAX_ENTRIES
+    cache = SearchCache(ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                        max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)))
+    return metrics.instrument(cache, 'search_cache', ['get_or_fetch'])
+
+@_lazy_singleton
+def url_tools():
+    from enhanced_url_tools import EnhancedURLTools, DEFAULT_QR_OUTPUT_DIR
+    from qr_codes import DEFAULT_CACHE_DIR
+    tools = EnhancedURLTools(qr_output_dir=os.getenv("QR_OUTPUT_DIR", DEFAULT_QR_OUTPUT_DIR),
+                             qr_cache_dir=os.getenv("QR_CACHE_DIR", DEFAULT_CACHE_DIR))
+    return metrics.instrument(tools, 'url_tools', [
+        'validate_url', 'get_url_metadata', 'check_url_safety', 'expand_url',
+        'generate_qr_code', 'generate_qr_codes_batch'
+    ])
+
+@_lazy_singleton
+def url_storage():
+    from url_storage import URLStorage
+    return metrics.instrument(URLStorage(), 'url_storage', [
+        'save_urls', 'get_urls', 'search_urls', 'create_collection', 'get_collections'
+    ])
+
+@_lazy_singleton
+def local_shortener():
+    from local_shortener import LocalShortener
+    return metrics.instrument(LocalShortener(), 'local_shortener', ['shorten', 'reserve_alias', 'release_alias', 'resolve'])
+
+def _short_link_warning() -> str:
+    """Why local short links cannot be opened, or "" when something serves them"""
+    from local_shortener import DEFAULT_SHORT_URL_BASE
+    
+    if _serving_http or os.getenv("SHORT_URL_BASE"):
+        return ""
+    return (f"Nothing serves {DEFAULT_SHORT_URL_BASE}<code>: SHORT_URL_BASE is unset and this server is not "
+            "serving HTTP. Use resolve_short_url, or set SHORT_URL_BASE to a host that serves /s/<code>")
+
+@_lazy_singleton
+def external_shorteners():
+    from shortener_services import ExternalShortenerPool, SERVICES
+    # <SERVICE>_API_URL (e.g. VGD_API_URL) overrides a service endpoint
+    api_urls = {name: os.environ[f"{name.upper()}_API_URL"] for name, _ in SERVICES if f"{name.upper()}_API_URL" in os.environ}
+    return metrics.instrument(ExternalShortenerPool(api_urls=api_urls), 'external_shorteners', ['shorten', 'shorten_alias'])
+
+# Running and recently finished batch tool calls, by batch id
+_batch_runs = {}
 
 @mcp.tool()
-def web_search(query: str) -> str:
+async def web_search(query: str) -> SearchResult:
     """Search the web for information about the given query"""
-    search_results = client.get_search_context(query=query)
-    return search_results
+    # Repeated or reworded queries are answered from the cache; identical concurrent
+    # misses share one Tavily call
+    search_results, cached = await asyncio.to_thread(
+        search_cache().get_or_fetch, query, lambda q: tavily_client().get_search_context(query=q)
+    )
+    return SearchResult(result=search_results, query=query, cached=cached)
 
 @mcp.tool()
-def roll_dice(notation: str, num_rolls: int = 1) -> str:
+def roll_dice(notation: str, num_rolls: int = 1) -> DiceResult:
     """Roll the dice with the given notation"""
     roller = DiceRoller(notation, num_rolls)
-    return str(roller)
+    return DiceResult(result=str(roller), notation=notation, num_rolls=num_rolls)
+
+def _normalize_url(url: str) -> str:
+    """Add a scheme to bare URLs"""
+    url = url.strip()
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    return url
+
+def _analyze_link(url: str, custom_alias: str = "", mirror_external: bool = False) -> dict:
+    """Fetch metadata, check safety and optionally mirror a URL before it is saved"""
+    # Get metadata for the URL
+    metadata = url_tools().get_url_metadata(url)
+    
+    # Check URL safety
+    safety_check = url_tools().check_url_safety(url)
+    
+    # External services are only an optional mirror of the local link
+    mirror = {}
+    if mirror_external:
+        mirror = external_shorteners().shorten_alias(url, custom_alias) if custom_alias else external_shorteners().shorten(url)
+        if 'shortened_url' in mirror:
+            metadata = {**metadata, 'mirror_url': mirror['shortened_url'], 'mirror_service': mirror['service']}
+    
+    return {'url': url, 'metadata': metadata, 'safety': safety_check, 'mirror': mirror}
+
+def _url_record(link: dict, shortened_url: str, custom_alias: str, collection_name: str, tag_list: List[str]) -> dict:
+    """Build the URLStorage record for an analyzed link"""
+    metadata = link['metadata']
+    return {
+        'original': link['url'],
+        'shortened': shortened_url,
+        'custom_alias': custom_alias,
+        'title': metadata.get('title', ''),
+        'description': metadata.get('description', ''),
+        'tags': tag_list,
+        'collection_name': collection_name,
+        'service_used': "Local",
+        'is_safe': link['safety'].get('is_safe', True),
+        'metadata': metadata
+    }
+
+def _parse_url_list(urls: str) -> List[str]:
+    """Split a newline- or comma-separated URL list"""
+    separator = '\n' if '\n' in urls else ','
+    return [url.strip() for url in urls.split(separator) if url.strip()]
 
 @mcp.tool()
-def shorten_url(url: str, custom_alias: str = "", collection_name: str = "", tags: str = "") -> str:
-    """Shorten a URL using multiple services. Supports custom aliases and collections."""
+def shorten_url(url: str, custom_alias: str = "", collection_name: str = "", tags: str = "",
+                mirror_external: bool = False) -> ShortenResult:
+    """Shorten a URL with the built-in shortener. Supports custom aliases, collections and optional mirroring to external services."""
     try:
-        # Validate URL format
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
-        
-        # Get metadata for the URL
-        metadata = url_tools.get_url_metadata(url)
-        
-        # Check URL safety
-        safety_check = url_tools.check_url_safety(url)
-        
-        # If custom alias is requested, try v.gd first
-        service_used = "Unknown"
-        shortened_url = ""
+        url = _normalize_url(url)
         
+        # Reserve the alias first so a clash fails before any network work
         if custom_alias:
             try:
-                api_url = "https://v.gd/create.php"
-                params = {
-                    'url': url,
-                    'shorturl': custom_alias,
-                    'format': 'json'
-                }
-                
-                response = requests.get(api_url, params=params, timeout=10)
-                
-                if response.status_code == 200:
-                    try:
-                        data = response.json()
-                        if 'shorturl' in data:
-                            shortened_url = f"https://v.gd/{custom_alias}"
-                            service_used = "V.gd"
-                        elif 'errorcode' in data:
-                            if data['errorcode'] == 2:
-                                return f"❌ Custom alias '{custom_alias}' already exists. Please choose a different alias."
-                            else:
-                                return f"❌ V.gd service error: {data.get('errormessage', 'Unknown error')}"
-                    except:
-                        return f"❌ Invalid response from V.gd service: {response.text}"
-                else:
-                    return f"❌ HTTP Error {response.status_code} from V.gd service"
-                    
-            except Exception as e:
-                return f"❌ Error with V.gd service: {str(e)}"
-        
-        # For basic shortening (no custom alias), use multiple services as fallback
-        if not shortened_url:
-            shortener = pyshorteners.Shortener()
-            services_to_try = [
-                ('tinyurl', 'TinyURL'),
-                ('chilpit', 'Chilp.it'),
-                ('vgd', 'V.gd')
-            ]
-            
-            last_error = None
-            
-            for service_name, service_display in services_to_try:
-                try:
-                    if service_name == 'tinyurl':
-                        shortened_url = shortener.tinyurl.short(url)
-                    elif service_name == 'chilpit':
-                        shortened_url = shortener.chilpit.short(url)
-                    elif service_name == 'vgd':
-                        shortened_url = shortener.vgd.short(url)
-                    else:
-                        continue
-                    
-                    if shortened_url:
-                        service_used = service_display
-                        break
-                            
-                except Exception as e:
-                    last_error = str(e)
-                    continue
-            
-            if not shortened_url:
-                return f"❌ Unable to shorten URL. All services failed.\nLast error: {last_error}"
+                if not local_shortener().reserve_alias(url, custom_alias):
+                    error = f"Custom alias '{custom_alias}' already exists. Please choose a different alias."
+                    return ShortenResult(result=f"❌ {error}", error=error, url=url)
+            except ValueError as e:
+                return ShortenResult(result=f"❌ {str(e)}", error=str(e), url=url)
+            code = custom_alias
+        else:
+            code = local_shortener().shorten(url)
+        
+        shortened_url = local_shortener().short_url(code)
+        service_used = "Local"
         
         # Parse tags
         tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
         
-        # Save to database
-        url_id = url_storage.save_url(
-            original=url,
-            shortened=shortened_url,
-            custom_alias=custom_alias,
-            title=metadata.get('title', ''),
-            description=metadata.get('description', ''),
-            tags=tag_list,
-            collection_name=collection_name,
-            service_used=service_used,
-            is_safe=safety_check.get('is_safe', True),
-            metadata=metadata
-        )
+        try:
+            link = _analyze_link(url, custom_alias, mirror_external)
+            
+            # Save to database
+            url_id = url_storage().save_urls([_url_record(link, shortened_url, custom_alias, collection_name, tag_list)])[0]
+        except Exception:
+            # A link that was never saved must not keep its alias taken
+            if custom_alias:
+                local_shortener().release_alias(custom_alias)
+            raise
+        
+        metadata = link['metadata']
+        safety_check = link['safety']
+        mirror = link['mirror']
+        link_warning = _short_link_warning()
         
         # Format response
         result = f"✅ URL successfully shortened!\n"
@@ -138,6 +235,11 @@ def shorten_url(url: str, custom_alias: str = "", collection_name: str = "", tag
         if custom_alias:
             result += f"Custom alias: {custom_alias}\n"
         
+        if mirror.get('shortened_url'):
+            result += f"Mirror ({mirror['service']}): {mirror['shortened_url']}\n"
+        elif mirror.get('error'):
+            result += f"⚠️ Mirror failed: {mirror['error']}\n"
+        
         if metadata.get('title'):
             result += f"Title: {metadata['title']}\n"
         
@@ -150,65 +252,594 @@ def shorten_url(url: str, custom_alias: str = "", collection_name: str = "", tag
         if not safety_check.get('is_safe', True):
             result += f"⚠️ Safety warnings: {', '.join(safety_check.get('warnings', []))}\n"
         
+        if link_warning:
+            result += f"⚠️ {link_warning}\n"
+        
         result += f"Saved to database with ID: {url_id}"
         
-        return result
+        return ShortenResult(
+            result=result,
+            id=url_id,
+            url=url,
+            shortened_url=shortened_url,
+            service=service_used,
+            custom_alias=custom_alias or None,
+            mirror_url=mirror.get('shortened_url'),
+            mirror_service=mirror.get('service'),
+            mirror_error=mirror.get('error'),
+            title=metadata.get('title') or None,
+            collection_name=collection_name or None,
+            tags=tag_list,
+            is_safe=safety_check.get('is_safe', True),
+            safety_warnings=safety_check.get('warnings', []),
+            link_warning=link_warning or None
+        )
                 
     except Exception as e:
-        return f"❌ Unexpected error: {str(e)}"
+        return ShortenResult(result=f"❌ Unexpected error: {str(e)}", error=str(e))
+
+@mcp.tool()
+def resolve_short_url(short_url: str) -> ResolveResult:
+    """Resolve a short URL or code created by the built-in shortener to its original URL"""
+    try:
+        resolved = local_shortener().resolve(short_url)
+        
+        if not resolved:
+            error = f"No URL found for '{short_url}'"
+            return ResolveResult(result=f"❌ {error}", error=error)
+        
+        result = f"🔗 Short URL Resolved\n"
+        result += f"Short URL: {resolved['short_url']}\n"
+        result += f"Original: {resolved['original_url']}\n"
+        if resolved['is_custom']:
+            result += f"Custom alias: {resolved['code']}\n"
+        result += f"Created: {resolved['created_at']}\n"
+        
+        return ResolveResult(result=result, **resolved)
+        
+    except Exception as e:
+        return ResolveResult(result=f"❌ Resolve error: {str(e)}", error=str(e))
+
+@mcp.custom_route("/s/{code}", methods=["GET", "HEAD"])
+async def redirect_short_url(request):
+    """Follow a built-in short link (SHORT_URL_BASE + code) when serving over HTTP"""
+    from starlette.responses import PlainTextResponse, RedirectResponse
+    
+    resolved = await asyncio.to_thread(local_shortener().resolve, request.path_params["code"])
+    if not resolved:
+        return PlainTextResponse("Short link not found", status_code=404)
+    return RedirectResponse(resolved['original_url'], status_code=301)
 
 @mcp.tool()
-def shorten_url_batch(urls: str, collection_name: str = "", tags: str = "") -> str:
-    """Shorten multiple URLs at once. Separate URLs with newlines or commas."""
+def shortener_status() -> ShortenerStatusResult:
+    """Report health, latency and circuit breaker state of the shortener backends"""
     try:
-        # Parse URLs - support both newline and comma separation
-        url_list = []
-        if '\n' in urls:
-            url_list = [url.strip() for url in urls.split('\n') if url.strip()]
+        result = f"🩺 Shortener Backend Status\n"
+        link_warning = _short_link_warning()
+        result += f"Local: {'⚠️' if link_warning else '✅'} in-process ({local_shortener().base_url})\n"
+        if link_warning:
+            result += f"   {link_warning}\n"
+        result += "\n🌐 External mirrors (in preference order):\n"
+        
+        state_icons = {'closed': '✅', 'half_open': '🟡', 'open': '⛔'}
+        backends = []
+        
+        for i, (name, status) in enumerate(external_shorteners().status().items(), 1):
+            breaker = status['breaker']
+            backends.append(BackendStatus(name=name, service=status['service'], **breaker))
+            result += f"{i}. {state_icons.get(breaker['state'], '❔')} {status['service']} - circuit {breaker['state'].replace('_', '-')}\n"
+            result += f"   Calls (last {int(external_shorteners().breakers[name].window_seconds)}s): {breaker['window_calls']}, "
+            result += f"errors: {breaker['error_rate']:.0%}, slow: {breaker['slow_call_rate']:.0%}\n"
+            if breaker['p50_seconds'] is not None:
+                result += f"   Latency p50: {breaker['p50_seconds'] * 1000:.0f} ms, p95: {breaker['p95_seconds'] * 1000:.0f} ms\n"
+            if 'retry_in_seconds' in breaker:
+                result += f"   Retry in: {breaker['retry_in_seconds']:.0f}s\n"
+            result += f"   Times opened: {breaker['times_opened']}\n"
+        
+        return ShortenerStatusResult(result=result, local_base_url=local_shortener().base_url, backends=backends)
+        
+    except Exception as e:
+        return ShortenerStatusResult(result=f"❌ Status error: {str(e)}", error=str(e))
+
+def _metric_counters() -> dict:
+    """Counters of components that have been used so far (unused ones are not built for this)"""
+    counters = {}
+    if url_tools.is_built():
+        for kind, stats in url_tools().fetch_stats().items():
+            counters[f"single_flight_{kind}_executed_total"] = stats['executed']
+            counters[f"single_flight_{kind}_shared_total"] = stats['shared']
+    if search_cache.is_built():
+        stats = search_cache().stats()
+        for name in ('hits', 'misses', 'coalesced', 'evictions'):
+            counters[f"search_cache_{name}_total"] = stats[name]
+    return counters
+
+def _latency_stats(entry: dict) -> LatencyStats:
+    return LatencyStats(
+        name=entry['name'],
+        tool=entry.get('tool'),
+        count=entry['count'],
+        errors=entry['errors'],
+        mean_ms=entry['mean_seconds'] * 1000,
+        p50_ms=entry['p50_seconds'] * 1000,
+        p90_ms=entry['p90_seconds'] * 1000,
+        p99_ms=entry['p99_seconds'] * 1000,
+        max_ms=entry['max_seconds'] * 1000
+    )
+
+@mcp.tool()
+def server_metrics(output_format: str = "text") -> MetricsResult:
+    """Report per-tool and per-operation latency percentiles and counters. output_format: text or prometheus"""
+    try:
+        snapshot = metrics.snapshot()
+        counters = _metric_counters()
+        tools = [_latency_stats(entry) for entry in snapshot['tools']]
+        operations = [_latency_stats(entry) for entry in snapshot['operations']]
+        
+        if output_format == "prometheus":
+            result = metrics.prometheus(counters)
+        elif output_format == "text":
+            def line(stats: LatencyStats) -> str:
+                return (f"{stats.count} calls, {stats.errors} errors - p50 {stats.p50_ms:.1f} ms, "
+                        f"p90 {stats.p90_ms:.1f} ms, p99 {stats.p99_ms:.1f} ms, max {stats.max_ms:.1f} ms")
+            
+            result = f"📈 Server Metrics (uptime {snapshot['uptime_seconds']:.0f}s)\n"
+            result += "\n🛠️ Tools:\n"
+            for stats in tools:
+                result += f"• {stats.name}: {line(stats)}\n"
+            if operations:
+                result += "\n⏱️ Operations (by calling tool):\n"
+                for stats in operations:
+                    result += f"• {stats.tool} → {stats.name}: {line(stats)}\n"
+            if counters:
+                result += "\n🔢 Counters:\n"
+                for name, value in sorted(counters.items()):
+                    result += f"• {name}: {value}\n"
         else:
-            url_list = [url.strip() for url in urls.split(',') if url.strip()]
+            error = f"Unknown output format '{output_format}'. Use text or prometheus"
+            return MetricsResult(result=f"❌ {error}", error=error)
+        
+        return MetricsResult(
+            result=result,
+            uptime_seconds=snapshot['uptime_seconds'],
+            tools=tools,
+            operations=operations,
+            counters=counters
+        )
+        
+    except Exception as e:
+        return MetricsResult(result=f"❌ Metrics error: {str(e)}", error=str(e))
+
+@mcp.tool()
+async def profile_tool(tool_name: str = "", calls: int = 1, mode: str = "cprofile", interval_ms: float = 5.0) -> ProfilingStatus:
+    """Profile the next N calls of a tool without restarting the server. mode: cprofile (.pstats dumps)
+    or sampling (collapsed-stack dumps for flame graphs). calls=0 disarms; no tool_name just reports status."""
+    try:
+        if tool_name:
+            known_tools = {tool.name for tool in await mcp.list_tools()}
+            if tool_name not in known_tools:
+                error = f"Unknown tool '{tool_name}'"
+                return ProfilingStatus(result=f"❌ {error}", error=error)
+            profiler.arm(tool_name, calls, mode, interval_ms / 1000)
+        
+        armed = [ArmedProfile(tool=tool, remaining=settings['remaining'], mode=settings['mode'])
+                 for tool, settings in profiler.armed().items()]
+        
+        result = f"🔬 Tool Profiling\n"
+        result += f"Output directory: {os.path.abspath(profiler.output_dir)}\n"
+        if tool_name:
+            result += f"{'Armed' if calls > 0 else 'Disarmed'}: {tool_name}\n"
+        result += "\n🎯 Armed tools:\n"
+        result += ''.join(f"• {profile.tool}: next {profile.remaining} calls ({profile.mode})\n" for profile in armed) or "None\n"
+        if profiler.recent_dumps:
+            result += "\n📂 Recent dumps:\n"
+            result += ''.join(f"• {path}\n" for path in profiler.recent_dumps)
+        
+        return ProfilingStatus(result=result, output_dir=os.path.abspath(profiler.output_dir), armed=armed,
+                               recent_dumps=list(profiler.recent_dumps))
+        
+    except Exception as e:
+        return ProfilingStatus(result=f"❌ Profiling error: {str(e)}", error=str(e))
+
+def _run_batch(items: list, worker, max_concurrency: int, item_timeout: float, on_result=None, on_poll=None) -> list:
+    """Run worker over items with bounded concurrency and a deadline per item.
+    
+    Returns ('ok', value) / ('error', message) pairs in input order. max_concurrency is
+    capped at MAX_BATCH_CONCURRENCY. An item's deadline starts when a worker picks it up,
+    not when it is queued. A timed-out item stops counting against max_concurrency, so
+    hanging items do not throttle the rest; once every thread is stuck on one, items
+    that wait item_timeout without starting fail too. on_result(index, outcome) is called
+    as soon as each item finishes, and on_poll() after each pass over finished items
+    (at least every BATCH_POLL_INTERVAL).
+    """
+    results = [None] * len(items)
+    submitted_at = {}
+    started_at = {}
+    limit = max(1, min(max_concurrency, MAX_BATCH_CONCURRENCY))
+    queued = iter(enumerate(items))
+    
+    def finish(index, outcome):
+        results[index] = outcome
+        if on_result:
+            on_result(index, outcome)
+    
+    def run(index, item):
+        started_at[index] = time.monotonic()
+        return worker(item)
+    
+    # Threads stuck on timed-out items cannot be reclaimed; up to `limit` more stand in for them
+    executor = ThreadPoolExecutor(max_workers=2 * limit, thread_name_prefix="batch")
+    try:
+        pending = {}
+        
+        def launch():
+            # Only items still within their deadline count against the limit
+            while len(pending) < limit:
+                next_item = next(queued, None)
+                if next_item is None:
+                    return
+                submitted_at[next_item[0]] = time.monotonic()
+                pending[executor.submit(run, *next_item)] = next_item[0]
+        
+        launch()
+        while pending:
+            done, _ = wait(pending, timeout=BATCH_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    finish(index, ('ok', future.result()))
+                except Exception as e:
+                    finish(index, ('error', str(e)))
+            
+            now = time.monotonic()
+            for future, index in list(pending.items()):
+                if index in started_at:
+                    if now - started_at[index] > item_timeout:
+                        # The worker thread cannot be interrupted; its late result is dropped
+                        pending.pop(future)
+                        finish(index, ('error', f"Timed out after {item_timeout:g}s"))
+                elif now - submitted_at[index] > item_timeout and future.cancel():
+                    # Every thread is stuck on a timed-out item, so this one may never start
+                    pending.pop(future)
+                    finish(index, ('error', f"Not started within {item_timeout:g}s: all batch workers are busy with timed-out items"))
+            if on_poll:
+                on_poll()
+            launch()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+class _BatchRun:
+    """Progress and partial results of one running batch tool call"""
+    
+    def __init__(self, tool_name: str, total: int, ctx: Context = None):
+        self.batch_id = uuid.uuid4().hex[:12]
+        self.tool_name = tool_name
+        self.total = total
+        self.completed = 0
+        self.status = "running"
+        self.results = {}  # input index -> BatchItem
+        self._ctx = ctx
+        self._loop = asyncio.get_running_loop()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+        
+        _batch_runs[self.batch_id] = self
+        while len(_batch_runs) > MAX_TRACKED_BATCHES:
+            _batch_runs.pop(next(iter(_batch_runs)))
+    
+    def item_done(self, item: BatchItem):
+        """Record a finished item and emit a progress notification (thread-safe)"""
+        with self._lock:
+            self.results[item.index] = item
+            self.completed += 1
+            completed = self.completed
+            now = time.monotonic()
+            # Large batches report per chunk rather than flooding the client
+            if completed < self.total and now - self._last_report < PROGRESS_MIN_INTERVAL:
+                return
+            self._last_report = now
+        
+        if self._ctx is not None:
+            asyncio.run_coroutine_threadsafe(
+                self._ctx.report_progress(completed, self.total, f"[batch {self.batch_id}] {item.line()}"),
+                self._loop
+            )
+    
+    def finish(self, status: str = "complete"):
+        self.status = status
+
+def _save_shortened(links: List[dict], collection_name: str, tag_list: List[str]) -> List[str]:
+    """Create (or reuse) local short links for analyzed URLs and save their records in one transaction"""
+    conn = url_storage().connect()
+    try:
+        with conn:
+            shortened_urls = [local_shortener().short_url(local_shortener().shorten(link['url'], conn=conn))
+                              for link in links]
+            url_storage().save_urls([_url_record(link, shortened_url, "", collection_name, tag_list)
+                                     for link, shortened_url in zip(links, shortened_urls)], conn=conn)
+        return shortened_urls
+    finally:
+        conn.close()
+
+@mcp.tool()
+async def shorten_url_batch(urls: str, collection_name: str = "", tags: str = "", max_concurrency: int = 16,
+                            item_timeout: float = 30.0, mirror_external: bool = False,
+                            ctx: Context = None) -> BatchShortenResult:
+    """Shorten many URLs at once (thousands per call). Separate URLs with newlines or commas.
+    
+    Sends a progress notification per item (or per chunk for large batches); partial results
+    are available from get_batch_results with the batch id shown in the progress messages.
+    """
+    try:
+        url_list = [_normalize_url(url) for url in _parse_url_list(urls)]
         
         if not url_list:
-            return "❌ No valid URLs provided"
+            return BatchShortenResult(result="❌ No valid URLs provided", error="No valid URLs provided")
         
-        if len(url_list) > 20:
-            return "❌ Too many URLs. Maximum 20 URLs per batch."
+        if len(url_list) > MAX_BATCH_URLS:
+            error = f"Too many URLs. Maximum {MAX_BATCH_URLS} URLs per batch."
+            return BatchShortenResult(result=f"❌ {error}", error=error, total=len(url_list))
         
-        results = []
-        success_count = 0
+        tag_list = [tag.strip() for tag in tags.split(",")] if tags else []
         
-        for i, url in enumerate(url_list, 1):
-            try:
-                result = shorten_url(url, collection_name=collection_name, tags=tags)
-                if "✅" in result:
-                    success_count += 1
-                    # Extract just the shortened URL from the result
-                    lines = result.split('\n')
-                    shortened = next((line.split(': ', 1)[1] for line in lines if line.startswith('Shortened:')), 'N/A')
-                    results.append(f"{i}. {url} → {shortened}")
-                else:
-                    results.append(f"{i}. {url} → ERROR: {result}")
-            except Exception as e:
-                results.append(f"{i}. {url} → ERROR: {str(e)}")
+        run = _BatchRun("shorten_url_batch", len(url_list), ctx)
+        try:
+            unsaved = []  # (index, analyzed link) pairs waiting for the next save
+            last_save = [0.0]
+            
+            def save_pending(force: bool = False):
+                # Short links exist only for analyzed URLs, and an item is reported once its record is saved.
+                # Saves are grouped into one transaction per progress interval
+                if not unsaved or (not force and time.monotonic() - last_save[0] < PROGRESS_MIN_INTERVAL):
+                    return
+                batch = unsaved[:]
+                del unsaved[:]
+                last_save[0] = time.monotonic()
+                shortened_urls = _save_shortened([link for _, link in batch], collection_name, tag_list)
+                for (index, _), shortened_url in zip(batch, shortened_urls):
+                    run.item_done(BatchItem(index=index, url=url_list[index], shortened_url=shortened_url))
+            
+            def on_result(index, outcome):
+                status, value = outcome
+                if status == 'error':
+                    run.item_done(BatchItem(index=index, url=url_list[index], error=value))
+                    return
+                unsaved.append((index, value))
+            
+            # Network work (metadata, safety, mirrors) runs concurrently
+            await asyncio.to_thread(
+                _run_batch, url_list, lambda url: _analyze_link(url, mirror_external=mirror_external),
+                max_concurrency, item_timeout, on_result, save_pending
+            )
+            await asyncio.to_thread(save_pending, True)
+            run.finish()
+        finally:
+            if run.status == "running":
+                # Partial results stay available from get_batch_results
+                run.finish("failed")
+        
+        items = [run.results[i] for i in range(len(url_list))]
+        success_count = sum(1 for item in items if item.error is None)
+        link_warning = _short_link_warning()
         
         summary = f"📊 Batch URL Shortening Complete!\n"
+        summary += f"🆔 Batch: {run.batch_id}\n"
         summary += f"✅ Successfully shortened: {success_count}/{len(url_list)} URLs\n"
         if collection_name:
             summary += f"📁 Collection: {collection_name}\n"
         if tags:
             summary += f"🏷️ Tags: {tags}\n"
-        summary += "\n📋 Results:\n" + '\n'.join(results)
+        if link_warning:
+            summary += f"⚠️ {link_warning}\n"
+        summary += "\n📋 Results:\n" + '\n'.join(item.line() for item in items)
+        
+        return BatchShortenResult(
+            result=summary,
+            batch_id=run.batch_id,
+            total=len(url_list),
+            succeeded=success_count,
+            collection_name=collection_name or None,
+            tags=tag_list,
+            items=items,
+            link_warning=link_warning or None
+        )
+        
+    except Exception as e:
+        return BatchShortenResult(result=f"❌ Batch processing error: {str(e)}", error=str(e))
+
+@mcp.tool()
+def get_batch_results(batch_id: str, offset: int = 0, limit: int = 100) -> BatchResultsPage:
+    """Get the results completed so far by a running or finished batch tool call"""
+    try:
+        run = _batch_runs.get(batch_id)
+        
+        if run is None:
+            error = f"Unknown batch '{batch_id}'. Only the last {MAX_TRACKED_BATCHES} batches of this server process are kept."
+            return BatchResultsPage(result=f"❌ {error}", error=error, batch_id=batch_id)
+        
+        completed = sorted(run.results.items())
+        page = completed[offset:offset + limit]
+        
+        result = f"📊 Batch {batch_id} ({run.tool_name})\n"
+        result += f"Status: {run.status}\n"
+        result += f"Progress: {run.completed}/{run.total}\n"
+        result += f"\n📋 Completed results {offset + 1}-{offset + len(page)} of {len(completed)}:\n"
+        result += '\n'.join(item.line() for _, item in page)
+        
+        return BatchResultsPage(
+            result=result,
+            batch_id=batch_id,
+            tool_name=run.tool_name,
+            status=run.status,
+            completed=run.completed,
+            total=run.total,
+            items=[item for _, item in page]
+        )
+        
+    except Exception as e:
+        return BatchResultsPage(result=f"❌ Batch results error: {str(e)}", error=str(e), batch_id=batch_id)
+
+def _job_shorten(url: str, params: dict) -> dict:
+    """Job handler: analyze, shorten and save one URL"""
+    url = _normalize_url(url)
+    link = _analyze_link(url, mirror_external=params.get('mirror_external', False))
+    shortened_url = local_shortener().short_url(local_shortener().shorten(url))
+    record = _url_record(link, shortened_url, "", params.get('collection_name', ''), params.get('tags', []))
+    url_id = url_storage().save_urls([record])[0]
+    return {
+        'url': url,
+        'shortened_url': shortened_url,
+        'id': url_id,
+        'title': record['title'],
+        'is_safe': record['is_safe']
+    }
+
+@_lazy_singleton
+def job_queue():
+    from job_queue import JobQueue
+    return JobQueue({
+        'shorten': _job_shorten,
+        'validate': lambda url, params: url_tools().validate_url(url),
+        'metadata': lambda url, params: url_tools().get_url_metadata(_normalize_url(url)),
+        'safety': lambda url, params: url_tools().check_url_safety(_normalize_url(url)),
+    }, workers=int(os.getenv("URL_JOB_WORKERS", DEFAULT_JOB_WORKERS)))
+
+def _job_item_summary(kind: str, item: dict) -> str:
+    """One-line summary of a finished job item"""
+    if item['status'] == 'error':
+        return f"{item['input']} → ERROR: {item['error']}"
+    
+    result = item['result'] or {}
+    if 'error' in result:
+        return f"{item['input']} → ERROR: {result['error']}"
+    if kind == 'shorten':
+        return f"{result.get('url')} → {result.get('shortened_url')}"
+    if kind == 'validate':
+        reachable = "reachable" if result.get('is_reachable') else "not reachable"
+        return f"{item['input']} → {'valid' if result.get('is_valid') else 'invalid'}, {reachable} ({result.get('status_code')})"
+    if kind == 'metadata':
+        return f"{item['input']} → {result.get('title') or 'No title'}"
+    return f"{item['input']} → risk {result.get('risk_level', 'unknown')}"
+
+def _read_url_file(name: str) -> List[str]:
+    """Read one URL per line from a file inside URL_JOBS_DIR"""
+    jobs_dir = os.getenv("URL_JOBS_DIR")
+    if not jobs_dir:
+        raise ValueError("URL files are disabled. Set URL_JOBS_DIR to the directory clients may read from.")
+    
+    # Resolve symlinks and '..' before the check so a name cannot escape the directory
+    root = os.path.realpath(jobs_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"'{name}' is not a file inside URL_JOBS_DIR")
+    
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+@mcp.tool()
+def submit_url_job(kind: str, urls: str = "", urls_file: str = "", collection_name: str = "", tags: str = "",
+                   mirror_external: bool = False) -> JobSubmitted:
+    """Queue a background job over many URLs. kind: shorten, validate, metadata or safety.
+    Pass URLs inline (newline/comma separated) or as the name of a file in the server's URL_JOBS_DIR
+    with one URL per line."""
+    try:
+        if urls_file:
+            url_list = _read_url_file(urls_file)
+        else:
+            url_list = _parse_url_list(urls)
         
-        return summary
+        if not url_list:
+            return JobSubmitted(result="❌ No valid URLs provided", error="No valid URLs provided")
+        
+        params = {
+            'collection_name': collection_name,
+            'tags': [tag.strip() for tag in tags.split(",")] if tags else [],
+            'mirror_external': mirror_external
+        }
+        job_id = job_queue().submit(kind, url_list, params)
+        
+        result = f"✅ Job submitted!\n"
+        result += f"Job ID: {job_id}\n"
+        result += f"Kind: {kind}\n"
+        result += f"URLs: {len(url_list)}\n"
+        result += "💡 Use get_job_status and get_job_results to follow it"
+        
+        return JobSubmitted(result=result, job_id=job_id, kind=kind, total=len(url_list))
+        
+    except Exception as e:
+        return JobSubmitted(result=f"❌ Job submission error: {str(e)}", error=str(e), kind=kind)
+
+@mcp.tool()
+def get_job_status(job_id: str) -> JobStatusResult:
+    """Get the progress of a background URL job"""
+    try:
+        job_queue().start()
+        job = job_queue().status(job_id)
+        
+        if not job:
+            return JobStatusResult(result=f"❌ Job '{job_id}' not found", error="Job not found", job_id=job_id)
+        
+        percent = job['completed'] / job['total'] if job['total'] else 1.0
+        
+        result = f"⚙️ Job {job_id}\n"
+        result += f"Kind: {job['kind']}\n"
+        result += f"Status: {job['status']}\n"
+        result += f"Progress: {job['completed']}/{job['total']} ({percent:.0%})\n"
+        result += f"Failed: {job['failed']}\n"
+        result += f"Created: {job['created_at']}\n"
+        result += f"Updated: {job['updated_at']}\n"
+        if job['finished_at']:
+            result += f"Finished: {job['finished_at']}\n"
+        
+        return JobStatusResult(
+            result=result,
+            job_id=job_id,
+            **{key: job[key] for key in ('kind', 'status', 'total', 'completed', 'failed',
+                                         'created_at', 'updated_at', 'finished_at')}
+        )
         
     except Exception as e:
-        return f"❌ Batch processing error: {str(e)}"
+        return JobStatusResult(result=f"❌ Job status error: {str(e)}", error=str(e), job_id=job_id)
 
 @mcp.tool()
-def validate_url(url: str) -> str:
+def get_job_results(job_id: str, offset: int = 0, limit: int = 50) -> JobResultsPage:
+    """Get checkpointed results of a background URL job, in input order"""
+    try:
+        job = job_queue().status(job_id)
+        
+        if not job:
+            return JobResultsPage(result=f"❌ Job '{job_id}' not found", error="Job not found", job_id=job_id)
+        
+        items = job_queue().results(job_id, offset, limit)
+        
+        result = f"📋 Job {job_id} results ({job['status']}, {job['completed']}/{job['total']} done)\n\n"
+        
+        if not items:
+            result += "No finished items in this range yet"
+        
+        for item in items:
+            result += f"{item['index'] + 1}. {_job_item_summary(job['kind'], item)}\n"
+        
+        return JobResultsPage(
+            result=result,
+            job_id=job_id,
+            status=job['status'],
+            completed=job['completed'],
+            total=job['total'],
+            items=[JobItem(**item) for item in items]
+        )
+        
+    except Exception as e:
+        return JobResultsPage(result=f"❌ Job results error: {str(e)}", error=str(e), job_id=job_id)
+
+@mcp.tool()
+async def validate_url(url: str) -> ValidationResult:
     """Validate if a URL is properly formatted and reachable"""
     try:
-        result = url_tools.validate_url(url)
+        # Fetching tools run off the event loop so concurrent requests overlap (and coalesce)
+        result = await asyncio.to_thread(url_tools().validate_url, url)
         
         if result.get('is_valid'):
             status = "✅ URL is valid"
@@ -225,101 +856,269 @@ def validate_url(url: str) -> str:
             if result.get('redirected'):
                 response += "🔄 URL redirects to a different location\n"
             
-            return response
+            return ValidationResult(
+                result=response,
+                url=result.get('original_url'),
+                is_valid=True,
+                is_reachable=result.get('is_reachable', False),
+                final_url=result.get('final_url'),
+                status_code=result.get('status_code'),
+                redirected=result.get('redirected', False)
+            )
         else:
-            return f"❌ URL validation failed: {result.get('error', 'Unknown error')}"
+            error = result.get('error', 'Unknown error')
+            return ValidationResult(result=f"❌ URL validation failed: {error}", error=error, url=url)
             
     except Exception as e:
-        return f"❌ Validation error: {str(e)}"
+        return ValidationResult(result=f"❌ Validation error: {str(e)}", error=str(e), url=url)
+
+def _metadata_result(url: str, metadata: dict) -> URLMetadata:
+    if 'error' in metadata:
+        return URLMetadata(result=f"❌ Failed to extract metadata: {metadata['error']}", error=metadata['error'],
+                           url=url, domain=metadata.get('domain') or None)
+    
+    result = f"📄 URL Metadata\n"
+    result += f"URL: {metadata.get('url', 'N/A')}\n"
+    result += f"Title: {metadata.get('title', 'No title found')}\n"
+    result += f"Description: {metadata.get('description', 'No description found')}\n"
+    result += f"Domain: {metadata.get('domain', 'N/A')}\n"
+    result += f"Secure (HTTPS): {'Yes' if metadata.get('is_secure') else 'No'}\n"
+    result += f"Content Type: {metadata.get('content_type', 'N/A')}\n"
+    content_length = metadata.get('content_length')
+    result += f"Content Length: {f'{content_length} bytes' if content_length is not None else 'Unknown'}\n"
+    
+    if metadata.get('favicon_url'):
+        result += f"Favicon: {metadata['favicon_url']}\n"
+    
+    if metadata.get('image_url'):
+        result += f"Preview Image: {metadata['image_url']}\n"
+    
+    return URLMetadata(result=result, **{key: metadata.get(key) for key in URLMetadata.model_fields
+                                         if key not in ('result', 'error')})
 
 @mcp.tool()
-def get_url_metadata(url: str) -> str:
+async def get_url_metadata(url: str) -> URLMetadata:
     """Extract metadata from a URL including title, description, and other information"""
     try:
-        metadata = url_tools.get_url_metadata(url)
+        metadata = await asyncio.to_thread(url_tools().get_url_metadata, url)
+        return _metadata_result(url, metadata)
+        
+    except Exception as e:
+        return URLMetadata(result=f"❌ Metadata extraction error: {str(e)}", error=str(e), url=url)
+
+@mcp.tool()
+async def get_url_metadata_batch(urls: str, max_concurrency: int = 16, item_timeout: float = 30.0,
+                                 ctx: Context = None) -> MetadataBatchResult:
+    """Extract metadata from many URLs in one call, fetching them concurrently. Separate URLs with newlines or commas.
+    
+    Reports progress like shorten_url_batch; partial results are available from get_batch_results.
+    """
+    try:
+        url_list = _parse_url_list(urls)
         
-        if 'error' in metadata:
-            return f"❌ Failed to extract metadata: {metadata['error']}"
+        if not url_list:
+            return MetadataBatchResult(result="❌ No valid URLs provided", error="No valid URLs provided")
         
-        result = f"📄 URL Metadata\n"
-        result += f"URL: {metadata.get('url', 'N/A')}\n"
-        result += f"Title: {metadata.get('title', 'No title found')}\n"
-        result += f"Description: {metadata.get('description', 'No description found')}\n"
-        result += f"Domain: {metadata.get('domain', 'N/A')}\n"
-        result += f"Secure (HTTPS): {'Yes' if metadata.get('is_secure') else 'No'}\n"
-        result += f"Content Type: {metadata.get('content_type', 'N/A')}\n"
-        result += f"Content Length: {metadata.get('content_length', 0)} bytes\n"
+        if len(url_list) > MAX_BATCH_URLS:
+            error = f"Too many URLs. Maximum {MAX_BATCH_URLS} URLs per batch."
+            return MetadataBatchResult(result=f"❌ {error}", error=error, total=len(url_list))
         
-        if metadata.get('favicon_url'):
-            result += f"Favicon: {metadata['favicon_url']}\n"
+        items = [None] * len(url_list)
+        run = _BatchRun("get_url_metadata_batch", len(url_list), ctx)
+        try:
+            def on_result(index, outcome):
+                status, value = outcome
+                items[index] = item = _metadata_result(url_list[index], value if status == 'ok' else {'error': value})
+                run.item_done(BatchItem(index=index, url=url_list[index], summary=item.title or "No title found",
+                                        error=item.error))
+            
+            await asyncio.to_thread(_run_batch, url_list, url_tools().get_url_metadata,
+                                    max_concurrency, item_timeout, on_result)
+            run.finish()
+        finally:
+            if run.status == "running":
+                run.finish("failed")
+        
+        succeeded = sum(1 for item in items if not item.error)
         
-        if metadata.get('image_url'):
-            result += f"Preview Image: {metadata['image_url']}\n"
+        result = f"📄 Batch URL Metadata: {succeeded}/{len(url_list)} extracted\n"
+        result += f"🆔 Batch: {run.batch_id}\n\n📋 Results:\n"
+        for i, item in enumerate(items, 1):
+            result += f"{i}. {item.url} → {f'ERROR: {item.error}' if item.error else item.title or 'No title found'}\n"
         
-        return result
+        return MetadataBatchResult(result=result, batch_id=run.batch_id, total=len(url_list), succeeded=succeeded,
+                                   items=items)
         
     except Exception as e:
-        return f"❌ Metadata extraction error: {str(e)}"
+        return MetadataBatchResult(result=f"❌ Batch metadata extraction error: {str(e)}", error=str(e))
+
+def _safety_report(url: str, safety_result: dict) -> SafetyReport:
+    if 'error' in safety_result:
+        return SafetyReport(result=f"❌ Safety check failed: {safety_result['error']}", error=safety_result['error'],
+                            url=url, is_safe=False, warnings=safety_result.get('warnings', []))
+    
+    result = f"🔒 URL Safety Report\n"
+    result += f"URL: {safety_result.get('url', 'N/A')}\n"
+    result += f"Domain: {safety_result.get('domain', 'N/A')}\n"
+    result += f"Risk Level: {safety_result.get('risk_level', 'unknown').upper()}\n"
+    
+    if safety_result.get('is_safe'):
+        result += "✅ URL appears to be safe\n"
+    else:
+        result += "⚠️ URL has potential safety concerns\n"
+    
+    warnings = safety_result.get('warnings', [])
+    if warnings:
+        result += "\n🚨 Warnings:\n"
+        for warning in warnings:
+            result += f"• {warning}\n"
+    
+    return SafetyReport(
+        result=result,
+        url=safety_result.get('url'),
+        domain=safety_result.get('domain'),
+        is_safe=safety_result.get('is_safe'),
+        risk_level=safety_result.get('risk_level'),
+        warnings=warnings
+    )
 
 @mcp.tool()
-def check_url_safety(url: str) -> str:
+def check_url_safety(url: str) -> SafetyReport:
     """Check if a URL is safe and identify potential security risks"""
     try:
-        safety_result = url_tools.check_url_safety(url)
+        return _safety_report(url, url_tools().check_url_safety(url))
         
-        if 'error' in safety_result:
-            return f"❌ Safety check failed: {safety_result['error']}"
+    except Exception as e:
+        return SafetyReport(result=f"❌ Safety check error: {str(e)}", error=str(e), url=url)
+
+@mcp.tool()
+async def check_url_safety_batch(urls: str, max_concurrency: int = 16, item_timeout: float = 30.0,
+                                 ctx: Context = None) -> SafetyBatchResult:
+    """Check many URLs for security risks in one call. Separate URLs with newlines or commas.
+    
+    Reports progress like shorten_url_batch; partial results are available from get_batch_results.
+    """
+    try:
+        url_list = _parse_url_list(urls)
+        
+        if not url_list:
+            return SafetyBatchResult(result="❌ No valid URLs provided", error="No valid URLs provided")
         
-        result = f"🔒 URL Safety Report\n"
-        result += f"URL: {safety_result.get('url', 'N/A')}\n"
-        result += f"Domain: {safety_result.get('domain', 'N/A')}\n"
-        result += f"Risk Level: {safety_result.get('risk_level', 'unknown').upper()}\n"
+        if len(url_list) > MAX_BATCH_URLS:
+            error = f"Too many URLs. Maximum {MAX_BATCH_URLS} URLs per batch."
+            return SafetyBatchResult(result=f"❌ {error}", error=error, total=len(url_list))
         
-        if safety_result.get('is_safe'):
-            result += "✅ URL appears to be safe\n"
-        else:
-            result += "⚠️ URL has potential safety concerns\n"
+        items = [None] * len(url_list)
+        run = _BatchRun("check_url_safety_batch", len(url_list), ctx)
+        try:
+            def on_result(index, outcome):
+                status, value = outcome
+                url = url_list[index]
+                if status == 'ok':
+                    items[index] = item = _safety_report(url, value)
+                else:
+                    items[index] = item = SafetyReport(result=f"❌ Safety check error: {value}", error=value, url=url)
+                summary = f"{'✅' if item.is_safe else '⚠️'} {(item.risk_level or 'unknown').upper()}"
+                run.item_done(BatchItem(index=index, url=url, summary=summary, error=item.error))
+            
+            await asyncio.to_thread(_run_batch, url_list, url_tools().check_url_safety,
+                                    max_concurrency, item_timeout, on_result)
+            run.finish()
+        finally:
+            if run.status == "running":
+                run.finish("failed")
+        
+        safe = sum(1 for item in items if item.is_safe)
         
-        warnings = safety_result.get('warnings', [])
-        if warnings:
-            result += "\n🚨 Warnings:\n"
-            for warning in warnings:
-                result += f"• {warning}\n"
+        result = f"🔒 Batch URL Safety: {safe}/{len(url_list)} appear safe\n"
+        result += f"🆔 Batch: {run.batch_id}\n\n📋 Results:\n"
+        for i, item in enumerate(items, 1):
+            if item.error:
+                result += f"{i}. {item.url} → ERROR: {item.error}\n"
+            else:
+                result += f"{i}. {item.url} → {'✅' if item.is_safe else '⚠️'} {(item.risk_level or 'unknown').upper()}\n"
         
-        return result
+        return SafetyBatchResult(result=result, batch_id=run.batch_id, total=len(url_list), safe=safe, items=items)
         
     except Exception as e:
-        return f"❌ Safety check error: {str(e)}"
+        return SafetyBatchResult(result=f"❌ Batch safety check error: {str(e)}", error=str(e))
+
+def _qr_payload(qr_result: dict) -> str:
+    """Say where a QR result's payload is; the payload itself is only sent as structured content"""
+    if 'file_path' in qr_result:
+        return f"File: {qr_result['file_path']}"
+    if 'qr_code_svg' in qr_result:
+        return f"SVG in qr_code_svg ({len(qr_result['qr_code_svg'])} chars)"
+    if 'qr_matrix_base64' in qr_result:
+        return f"{qr_result['modules']}x{qr_result['modules']} row-major bits in qr_matrix_base64"
+    return f"Base64 PNG in qr_code_base64 ({len(qr_result.get('qr_code_base64', ''))} chars)"
 
 @mcp.tool()
-def generate_qr_code(url: str, size: int = 10) -> str:
-    """Generate a QR code for a URL and return it as base64 encoded image"""
+def generate_qr_code(url: str, size: int = 10, error_correction: str = "L", output_format: str = "png") -> QRCodeResult:
+    """Generate a QR code for a URL. output_format: matrix (packed bits, smallest), png (base64), svg (vector,
+    largest) or file (a path on the server)"""
     try:
-        qr_result = url_tools.generate_qr_code(url, size)
+        qr_result = url_tools().generate_qr_code(url, size, error_correction, output_format)
         
         if 'error' in qr_result:
-            return f"❌ QR code generation failed: {qr_result['error']}"
+            return QRCodeResult(result=f"❌ QR code generation failed: {qr_result['error']}", **qr_result)
         
         result = f"📱 QR Code Generated\n"
         result += f"URL: {qr_result.get('url', 'N/A')}\n"
         result += f"Format: {qr_result.get('format', 'N/A')}\n"
         result += f"Size: {qr_result.get('size', 'N/A')}\n"
-        result += f"\n🖼️ QR Code (Base64):\n"
-        result += f"data:image/png;base64,{qr_result.get('qr_code_base64', '')}"
+        result += f"🖼️ {_qr_payload(qr_result)}"
         
-        return result
+        return QRCodeResult(result=result, **qr_result)
         
     except Exception as e:
-        return f"❌ QR code generation error: {str(e)}"
+        return QRCodeResult(result=f"❌ QR code generation error: {str(e)}", error=str(e), url=url)
 
 @mcp.tool()
-def expand_url(shortened_url: str) -> str:
+def generate_qr_codes_batch(urls: str, size: int = 10, error_correction: str = "L",
+                            output_format: str = "png") -> QRBatchResult:
+    """Generate QR codes for many URLs at once. Separate URLs with newlines or commas. Use output_format="file" for exports."""
+    try:
+        url_list = _parse_url_list(urls)
+        
+        if not url_list:
+            return QRBatchResult(result="❌ No valid URLs provided", error="No valid URLs provided")
+        
+        qr_results = url_tools().generate_qr_codes_batch(url_list, size, error_correction, output_format)
+        
+        success_count = sum(1 for qr_result in qr_results if 'error' not in qr_result)
+        cached_count = sum(1 for qr_result in qr_results if qr_result.get('cached'))
+        
+        result = f"📱 Batch QR Code Generation Complete!\n"
+        result += f"✅ Generated: {success_count}/{len(url_list)} QR codes ({cached_count} from cache)\n"
+        result += "\n📋 Results:\n"
+        
+        for i, qr_result in enumerate(qr_results, 1):
+            if 'error' in qr_result:
+                result += f"{i}. {qr_result.get('url')} → ERROR: {qr_result['error']}\n"
+            else:
+                result += f"{i}. {qr_result.get('url')} ({qr_result.get('size')}) → {_qr_payload(qr_result)}\n"
+        
+        return QRBatchResult(
+            result=result,
+            total=len(url_list),
+            succeeded=success_count,
+            cached=cached_count,
+            codes=[QRCode(**qr_result) for qr_result in qr_results]
+        )
+        
+    except Exception as e:
+        return QRBatchResult(result=f"❌ Batch QR code generation error: {str(e)}", error=str(e))
+
+@mcp.tool()
+async def expand_url(shortened_url: str) -> ExpandResult:
     """Expand a shortened URL to see its final destination"""
     try:
-        expand_result = url_tools.expand_url(shortened_url)
+        expand_result = await asyncio.to_thread(url_tools().expand_url, shortened_url)
         
         if 'error' in expand_result:
-            return f"❌ URL expansion failed: {expand_result['error']}"
+            return ExpandResult(result=f"❌ URL expansion failed: {expand_result['error']}", error=expand_result['error'],
+                                original_shortened=shortened_url)
         
         result = f"🔗 URL Expansion\n"
         result += f"Original: {expand_result.get('original_shortened', 'N/A')}\n"
@@ -332,44 +1131,52 @@ def expand_url(shortened_url: str) -> str:
             for i, redirect_url in enumerate(expand_result['redirect_chain'], 1):
                 result += f"{i}. {redirect_url}\n"
         
-        return result
+        return ExpandResult(
+            result=result,
+            original_shortened=expand_result.get('original_shortened'),
+            final_url=expand_result.get('final_url'),
+            redirect_count=expand_result.get('redirect_count', 0),
+            redirect_chain=expand_result.get('redirect_chain', []),
+            status_code=expand_result.get('status_code')
+        )
         
     except Exception as e:
-        return f"❌ URL expansion error: {str(e)}"
+        return ExpandResult(result=f"❌ URL expansion error: {str(e)}", error=str(e), original_shortened=shortened_url)
 
 @mcp.tool()
-def create_url_collection(name: str, description: str = "") -> str:
+def create_url_collection(name: str, description: str = "") -> CollectionResult:
     """Create a new URL collection for organizing shortened URLs"""
     try:
-        success = url_storage.create_collection(name, description)
+        success = url_storage().create_collection(name, description)
         
         if success:
             result = f"✅ Collection created successfully!\n"
             result += f"Name: {name}\n"
             if description:
                 result += f"Description: {description}\n"
-            return result
+            return CollectionResult(result=result, name=name, description=description or None, created=True)
         else:
-            return f"❌ Collection '{name}' already exists"
+            error = f"Collection '{name}' already exists"
+            return CollectionResult(result=f"❌ {error}", error=error, name=name)
             
     except Exception as e:
-        return f"❌ Collection creation error: {str(e)}"
+        return CollectionResult(result=f"❌ Collection creation error: {str(e)}", error=str(e), name=name)
 
 @mcp.tool()
-def list_my_urls(collection: str = "", tags: str = "", limit: int = 20) -> str:
+def list_my_urls(collection: str = "", tags: str = "", limit: int = 20) -> URLListResult:
     """List saved URLs with optional filtering by collection or tags"""
     try:
         # Parse tags if provided
         tag_list = [tag.strip() for tag in tags.split(",")] if tags else None
         
-        urls = url_storage.get_urls(
+        urls = url_storage().get_urls(
             collection=collection if collection else None,
             tags=tag_list,
             limit=limit
         )
         
         if not urls:
-            return "📝 No URLs found matching your criteria"
+            return URLListResult(result="📝 No URLs found matching your criteria")
         
         result = f"📋 Your Saved URLs ({len(urls)} found)\n"
         
@@ -399,19 +1206,19 @@ def list_my_urls(collection: str = "", tags: str = "", limit: int = 20) -> str:
             result += f"   📅 Created: {url_data.get('created_at', 'N/A')}\n"
             result += "\n"
         
-        return result
+        return URLListResult(result=result, count=len(urls), urls=[SavedURL.from_row(url_data) for url_data in urls])
         
     except Exception as e:
-        return f"❌ Error retrieving URLs: {str(e)}"
+        return URLListResult(result=f"❌ Error retrieving URLs: {str(e)}", error=str(e))
 
 @mcp.tool()
-def search_urls(search_term: str, limit: int = 20) -> str:
+def search_urls(search_term: str, limit: int = 20) -> URLListResult:
     """Search through saved URLs by title, description, or original URL"""
     try:
-        urls = url_storage.search_urls(search_term, limit)
+        urls = url_storage().search_urls(search_term, limit)
         
         if not urls:
-            return f"🔍 No URLs found matching '{search_term}'"
+            return URLListResult(result=f"🔍 No URLs found matching '{search_term}'")
         
         result = f"🔍 Search Results for '{search_term}' ({len(urls)} found)\n\n"
         
@@ -426,19 +1233,19 @@ def search_urls(search_term: str, limit: int = 20) -> str:
             result += f"   📅 Created: {url_data.get('created_at', 'N/A')}\n"
             result += "\n"
         
-        return result
+        return URLListResult(result=result, count=len(urls), urls=[SavedURL.from_row(url_data) for url_data in urls])
         
     except Exception as e:
-        return f"❌ Search error: {str(e)}"
+        return URLListResult(result=f"❌ Search error: {str(e)}", error=str(e))
 
 @mcp.tool()
-def list_collections() -> str:
+def list_collections() -> CollectionListResult:
     """List all URL collections"""
     try:
-        collections = url_storage.get_collections()
+        collections = url_storage().get_collections()
         
         if not collections:
-            return "📁 No collections found"
+            return CollectionListResult(result="📁 No collections found")
         
         result = f"📁 Your Collections ({len(collections)} found)\n\n"
         
@@ -449,10 +1256,56 @@ def list_collections() -> str:
             result += f"   📅 Created: {collection.get('created_at', 'N/A')}\n"
             result += "\n"
         
-        return result
+        return CollectionListResult(
+            result=result,
+            collections=[Collection(**{key: collection.get(key) for key in Collection.model_fields})
+                         for collection in collections]
+        )
         
     except Exception as e:
-        return f"❌ Error retrieving collections: {str(e)}"
+        return CollectionListResult(result=f"❌ Error retrieving collections: {str(e)}", error=str(e))
+
+def _resume_jobs():
+    """Resume jobs left unfinished by a previous run, off the path to the first request"""
+    threading.Thread(target=lambda: job_queue().start(), name="job-resume", daemon=True).start()
+
+def _prepare_shared_store(db_path: str = "urls.db"):
+    """Switch urls.db to WAL before worker processes open it, so readers never block the writer"""
+    import sqlite3
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+
+def http_app():
+    """ASGI app for MCP_TRANSPORT (streamable-http or sse); each uvicorn worker builds its own"""
+    global _serving_http
+    _serving_http = True
+    if int(os.getenv("MCP_WORKERS", "1")) > 1:
+        # Calls of one client may reach any worker, so no session state may live in a process
+        mcp.settings.stateless_http = True
+    _resume_jobs()
+    return mcp.sse_app() if os.getenv("MCP_TRANSPORT") == "sse" else mcp.streamable_http_app()
+
+def serve_http(transport: str, host: str, port: int, workers: int = 1):
+    """Serve over streamable HTTP or SSE. Worker processes share urls.db and the on-disk caches"""
+    import uvicorn
+    
+    if transport not in HTTP_TRANSPORTS:
+        raise ValueError(f"Unknown transport '{transport}'. Use stdio or {' or '.join(HTTP_TRANSPORTS)}")
+    if workers > 1 and transport == "sse":
+        raise ValueError("SSE sessions are bound to one process; use streamable-http for more than one worker")
+    
+    # Worker processes read their configuration from the environment
+    os.environ.update(MCP_TRANSPORT=transport, MCP_WORKERS=str(workers))
+    # Short links point at this server's /s/ route unless a public prefix is configured
+    os.environ.setdefault("SHORT_URL_BASE", f"http://{host}:{port}/s/")
+    _prepare_shared_store()
+    log_level = mcp.settings.log_level.lower()
+    if workers > 1:
+        uvicorn.run("server:http_app", factory=True, host=host, port=port, workers=workers,
+                    app_dir=os.path.dirname(os.path.abspath(__file__)), log_level=log_level)
+    else:
+        uvicorn.run(http_app(), host=host, port=port, log_level=log_level)
 
 if __name__ == "__main__":
     import sys
@@ -460,7 +1313,7 @@ if __name__ == "__main__":
     # Print startup messages to stderr so they don't interfere with MCP protocol
     print("🚀 Enhanced URL Shortener MCP Server", file=sys.stderr)
     print("=" * 50, file=sys.stderr)
-    print("📡 Starting MCP server with 11 specialized tools...", file=sys.stderr)
+    print("📡 Starting MCP server with 24 specialized tools...", file=sys.stderr)
     print("🔗 URL shortening, validation, metadata extraction", file=sys.stderr)
     print("🛡️  Safety analysis, QR code generation", file=sys.stderr)
     print("📁 Collection management and search capabilities", file=sys.stderr)
@@ -470,7 +1323,17 @@ if __name__ == "__main__":
     print("=" * 50, file=sys.stderr)
     
     try:
-        mcp.run(transport="stdio")
+        transport = os.getenv("MCP_TRANSPORT", "stdio")
+        if transport == "stdio":
+            link_warning = _short_link_warning()
+            if link_warning:
+                print(f"⚠️ {link_warning}", file=sys.stderr)
+            _resume_jobs()
+            mcp.run(transport="stdio")
+        else:
+            # HTTP transports listen on MCP_HOST:MCP_PORT with MCP_WORKERS processes
+            serve_http(transport, os.getenv("MCP_HOST", "127.0.0.1"), int(os.getenv("MCP_PORT", "8000")),
+                       int(os.getenv("MCP_WORKERS", "1")))
     except KeyboardInterrupt:
         print("\n🛑 Server shutting down gracefully...", file=sys.stderr)
         print("👋 Goodbye!", file=sys.stderr)
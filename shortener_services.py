@@ -0,0 +1,328 @@
+import time
+import threading
+import statistics
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Dict, List, Any, Optional
+import requests
+import pyshorteners
+
+VGD_API_URL = "https://v.gd/create.php"
+REQUEST_TIMEOUT = 10
+# Number of recent calls per service used for latency and success statistics
+STATS_WINDOW = 50
+# Hedge delay used until a service has latency samples, and the bounds applied after
+DEFAULT_HEDGE_DELAY = 1.0
+MIN_HEDGE_DELAY = 0.05
+MAX_HEDGE_DELAY = 5.0
+
+# Circuit breaker defaults: judge a backend on the calls of the last minute
+BREAKER_WINDOW_SECONDS = 60.0
+BREAKER_MIN_CALLS = 5
+BREAKER_ERROR_RATE = 0.5
+BREAKER_SLOW_CALL_SECONDS = 5.0
+BREAKER_SLOW_CALL_RATE = 0.8
+BREAKER_OPEN_SECONDS = 30.0
+
+# Default preference order, used as the tie-breaker when statistics are equal
+SERVICES = [
+    ('tinyurl', 'TinyURL'),
+    ('chilpit', 'Chilp.it'),
+    ('vgd', 'V.gd')
+]
+
+class ServiceStats:
+    """Rolling latency and outcome window for one shortener service"""
+
+    def __init__(self, window: int = STATS_WINDOW):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+
+    def record(self, success: bool, latency: float):
+        with self._lock:
+            self.outcomes.append(success)
+            if success:
+                self.latencies.append(latency)
+
+    def p50(self) -> Optional[float]:
+        with self._lock:
+            return statistics.median(self.latencies) if self.latencies else None
+
+    def success_rate(self) -> Optional[float]:
+        with self._lock:
+            return sum(self.outcomes) / len(self.outcomes) if self.outcomes else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'calls': len(self.outcomes),
+            'p50_seconds': self.p50(),
+            'success_rate': self.success_rate()
+        }
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker over a rolling time window of call outcomes and latencies"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, window_seconds: float = BREAKER_WINDOW_SECONDS,
+                 min_calls: int = BREAKER_MIN_CALLS,
+                 error_rate_threshold: float = BREAKER_ERROR_RATE,
+                 slow_call_seconds: float = BREAKER_SLOW_CALL_SECONDS,
+                 slow_call_rate_threshold: float = BREAKER_SLOW_CALL_RATE,
+                 open_seconds: float = BREAKER_OPEN_SECONDS,
+                 clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._calls = deque()  # (timestamp, success, latency)
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.times_opened = 0
+
+    def _prune_locked(self, now: float):
+        while self._calls and now - self._calls[0][0] > self.window_seconds:
+            self._calls.popleft()
+
+    def _rates_locked(self):
+        total = len(self._calls)
+        if not total:
+            return 0.0, 0.0
+        failures = sum(1 for _, success, _ in self._calls if not success)
+        slow = sum(1 for _, _, latency in self._calls if latency >= self.slow_call_seconds)
+        return failures / total, slow / total
+
+    def _open_locked(self, now: float):
+        self._state = self.OPEN
+        self._opened_at = now
+        self._trial_in_flight = False
+        self.times_opened += 1
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.open_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if a call may go through; in half-open state only one trial call is allowed"""
+        with self._lock:
+            now = self._clock()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN:
+                if now - self._opened_at < self.open_seconds:
+                    return False
+                self._state = self.HALF_OPEN
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record(self, success: bool, latency: float):
+        """Record a finished call and move between states"""
+        with self._lock:
+            now = self._clock()
+            if self._state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if success and latency < self.slow_call_seconds:
+                    self._state = self.CLOSED
+                    self._calls.clear()
+                else:
+                    self._open_locked(now)
+                return
+            if self._state == self.OPEN:
+                # A straggler that started before the breaker opened
+                return
+
+            self._calls.append((now, success, latency))
+            self._prune_locked(now)
+            if len(self._calls) < self.min_calls:
+                return
+            error_rate, slow_rate = self._rates_locked()
+            if error_rate >= self.error_rate_threshold or slow_rate >= self.slow_call_rate_threshold:
+                self._open_locked(now)
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self.state
+        with self._lock:
+            now = self._clock()
+            self._prune_locked(now)
+            error_rate, slow_rate = self._rates_locked()
+            latencies = sorted(latency for _, _, latency in self._calls)
+            snapshot = {
+                'state': state,
+                'window_calls': len(self._calls),
+                'error_rate': error_rate,
+                'slow_call_rate': slow_rate,
+                'p50_seconds': latencies[len(latencies) // 2] if latencies else None,
+                'p95_seconds': latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)] if latencies else None,
+                'times_opened': self.times_opened
+            }
+            if state != self.CLOSED:
+                snapshot['retry_in_seconds'] = max(self.open_seconds - (now - self._opened_at), 0.0)
+            return snapshot
+
+class ExternalShortenerPool:
+    """External shortener services with latency-ranked ordering, hedged requests and circuit breakers"""
+
+    def __init__(self, timeout: int = REQUEST_TIMEOUT, api_urls: Dict[str, str] = None):
+        self.timeout = timeout
+        # Optional per-service API endpoint overrides, e.g. for local stand-ins
+        self.api_urls = dict(api_urls or {})
+        self.display_names = dict(SERVICES)
+        self.stats = {name: ServiceStats() for name, _ in SERVICES}
+        # One breaker per backend, shared by every path that calls it
+        self.breakers = {name: CircuitBreaker() for name, _ in SERVICES}
+        self._shortener = pyshorteners.Shortener(timeout=timeout)
+        self._executor = ThreadPoolExecutor(max_workers=4 * len(SERVICES), thread_name_prefix="shortener")
+
+    def _vgd_request(self, url: str, custom_alias: str = None) -> Dict[str, Any]:
+        params = {'url': url, 'format': 'json'}
+        if custom_alias:
+            params['shorturl'] = custom_alias
+
+        response = requests.get(self.api_urls.get('vgd', VGD_API_URL), params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP Error {response.status_code} from V.gd service")
+
+        try:
+            return response.json()
+        except ValueError:
+            raise RuntimeError(f"Invalid response from V.gd service: {response.text}")
+
+    def _short_with(self, name: str, url: str) -> str:
+        if name == 'vgd':
+            # pyshorteners has no v.gd backend, so v.gd is called directly
+            data = self._vgd_request(url)
+            if 'shorturl' not in data:
+                raise RuntimeError(f"V.gd service error: {data.get('errormessage', 'Unknown error')}")
+            return data['shorturl']
+
+        backend = getattr(self._shortener, name)
+        if name in self.api_urls:
+            backend.api_url = self.api_urls[name]
+        return backend.short(url)
+
+    def _record(self, name: str, success: bool, latency: float):
+        self.stats[name].record(success, latency)
+        self.breakers[name].record(success, latency)
+
+    def _call(self, name: str, url: str) -> Dict[str, Any]:
+        """Run one service call, recording its latency and outcome"""
+        started = time.perf_counter()
+        try:
+            shortened_url = self._short_with(name, url)
+            if not shortened_url:
+                raise RuntimeError("Empty response")
+        except Exception as e:
+            self._record(name, False, time.perf_counter() - started)
+            return {'error': f"{self.display_names[name]}: {str(e)}"}
+
+        self._record(name, True, time.perf_counter() - started)
+        return {'shortened_url': shortened_url, 'service': self.display_names[name]}
+
+    def ranked_services(self) -> List[str]:
+        """Order services by expected cost: median latency inflated by failure rate"""
+        def expected_cost(name: str) -> float:
+            stats = self.stats[name]
+            p50 = stats.p50()
+            success_rate = stats.success_rate()
+            if success_rate is None:
+                return DEFAULT_HEDGE_DELAY
+            if p50 is None:
+                # Only failures in the window
+                return float('inf')
+            return p50 / max(success_rate, 0.05)
+
+        # sorted() is stable, so ties keep the default preference order
+        return sorted(self.stats, key=expected_cost)
+
+    def hedge_delay(self, name: str) -> float:
+        """How long to wait on a service before launching the next one"""
+        p50 = self.stats[name].p50()
+        if p50 is None:
+            return DEFAULT_HEDGE_DELAY
+        return min(max(p50, MIN_HEDGE_DELAY), MAX_HEDGE_DELAY)
+
+    def shorten(self, url: str) -> Dict[str, Any]:
+        """Shorten with the best-ranked service, hedging to the next one when it is slow"""
+        order = self.ranked_services()
+        pending = {}
+        next_index = 0
+        last_launched = None
+        last_error = "every backend circuit is open"
+
+        while pending or next_index < len(order):
+            if not pending or next_index >= len(order):
+                timeout = None
+            else:
+                timeout = self.hedge_delay(last_launched)
+
+            if pending:
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            else:
+                done = set()
+
+            if not done:
+                # Nothing running, or the latest service overran its latency budget: launch the
+                # next service whose circuit allows it, without waiting on the ones that refuse
+                while next_index < len(order):
+                    name = order[next_index]
+                    next_index += 1
+                    if self.breakers[name].allow_request():
+                        pending[self._executor.submit(self._call, name, url)] = name
+                        last_launched = name
+                        break
+                continue
+
+            for future in done:
+                pending.pop(future)
+                result = future.result()
+                if 'shortened_url' in result:
+                    # Slower hedges keep running in the background and still feed the statistics
+                    return result
+                last_error = result['error']
+
+        return {'error': f"All external services failed. Last error: {last_error}"}
+
+    def shorten_alias(self, url: str, custom_alias: str) -> Dict[str, Any]:
+        """Create a custom alias on v.gd"""
+        if not self.breakers['vgd'].allow_request():
+            return {'error': "V.gd service is unavailable (circuit open)"}
+
+        started = time.perf_counter()
+        try:
+            data = self._vgd_request(url, custom_alias)
+        except Exception as e:
+            self._record('vgd', False, time.perf_counter() - started)
+            return {'error': f"Error with V.gd service: {str(e)}"}
+
+        # An alias clash is a valid answer from a healthy service
+        self._record('vgd', True, time.perf_counter() - started)
+
+        if 'shorturl' in data:
+            return {'shortened_url': data['shorturl'], 'service': "V.gd"}
+        if data.get('errorcode') == 2:
+            return {'error': f"Custom alias '{custom_alias}' already exists on V.gd"}
+        return {'error': f"V.gd service error: {data.get('errormessage', 'Unknown error')}"}
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-service statistics and breaker health in ranked order"""
+        return {
+            name: {
+                'service': self.display_names[name],
+                **self.stats[name].snapshot(),
+                'breaker': self.breakers[name].snapshot()
+            }
+            for name in self.ranked_services()
+        }
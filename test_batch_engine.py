@@ -0,0 +1,116 @@
+import os
+import re
+import sys
+import time
+import asyncio
+import sqlite3
+import threading
+import tempfile
+import server
+from fixture_server import FixtureServer, fixture_env
+from benchmark_tools import SERVER_PATH
+
+def test_timed_out_items_do_not_stall_the_rest():
+    """Hanging items time out and free their slots, so the remaining items run at full concurrency"""
+    items = ["hang", "hang"] + [f"quick-{i}" for i in range(8)]
+
+    def worker(item):
+        time.sleep(3.0 if item == "hang" else 0.1)
+        return item.upper()
+
+    started = time.perf_counter()
+    outcomes = server._run_batch(items, worker, max_concurrency=2, item_timeout=0.3)
+    elapsed = time.perf_counter() - started
+
+    assert outcomes[:2] == [('error', "Timed out after 0.3s")] * 2
+    assert outcomes[2:] == [('ok', item.upper()) for item in items[2:]]
+    # Waiting for the hanging threads would take at least 3s
+    assert elapsed < 2.0, elapsed
+
+def test_items_queued_behind_hanging_items_time_out():
+    """Once every thread hangs, queued items fail after item_timeout instead of waiting forever"""
+    items = ["hang"] * 4 + ["quick"]
+
+    def worker(item):
+        time.sleep(3.0 if item == "hang" else 0.0)
+        return item.upper()
+
+    started = time.perf_counter()
+    # Two slots get four threads; the four hanging items occupy all of them
+    outcomes = server._run_batch(items, worker, max_concurrency=2, item_timeout=0.3)
+    elapsed = time.perf_counter() - started
+
+    assert outcomes[:4] == [('error', "Timed out after 0.3s")] * 4
+    assert outcomes[4][1].startswith("Not started within 0.3s")
+    assert elapsed < 2.0, elapsed
+
+def test_concurrency_is_capped():
+    """max_concurrency above MAX_BATCH_CONCURRENCY runs at the cap"""
+    running = []
+    peak = [0]
+    lock = threading.Lock()
+
+    def worker(item):
+        with lock:
+            running.append(item)
+            peak[0] = max(peak[0], len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(item)
+
+    server._run_batch(list(range(3 * server.MAX_BATCH_CONCURRENCY)), worker, max_concurrency=10 ** 6, item_timeout=5.0)
+    assert peak[0] <= server.MAX_BATCH_CONCURRENCY
+
+async def _shorten_with_progress(fixture: FixtureServer, workdir: str, urls: list) -> tuple:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    messages = []
+
+    async def on_progress(progress, total, message):
+        messages.append(message)
+
+    transport = StdioTransport(command=sys.executable, args=[SERVER_PATH], cwd=workdir,
+                               env={**os.environ, **fixture_env(fixture.base_url)})
+    async with Client(transport, progress_handler=on_progress) as client:
+        batch = asyncio.ensure_future(client.call_tool(
+            "shorten_url_batch", {'urls': "\n".join(urls), 'max_concurrency': 4, 'item_timeout': 1.0}))
+        while not messages:
+            await asyncio.sleep(0.05)
+        batch_id = re.match(r"\[batch (\w+)\]", messages[0]).group(1)
+        # Poll while the slow item is still running
+        partial = {'completed': 0}
+        while partial['completed'] < len(urls) - 1:
+            await asyncio.sleep(0.05)
+            partial = (await client.call_tool("get_batch_results", {'batch_id': batch_id})).structured_content
+        resolved = [(await client.call_tool("resolve_short_url", {'short_url': item['shortened_url']})).structured_content
+                    for item in partial['items']]
+        final = (await batch).structured_content
+    return messages, partial, resolved, final
+
+def test_progress_and_partial_results():
+    """Items are reported once saved; partial results are readable mid-run and failed items get no short link"""
+    with FixtureServer() as fixture, tempfile.TemporaryDirectory() as workdir:
+        urls = [fixture.url(f"/page?title=Page{i}") for i in range(4)] + [fixture.url("/page?delay_ms=3000")]
+        messages, partial, resolved, final = asyncio.run(_shorten_with_progress(fixture, workdir, urls))
+        with sqlite3.connect(os.path.join(workdir, "urls.db")) as conn:
+            short_codes = conn.execute("SELECT original_url FROM short_codes").fetchall()
+
+    # Items finishing together share a notification; the last one is always reported
+    assert messages[-1].endswith("ERROR: Timed out after 1s")
+    assert partial['status'] == "running" and partial['completed'] == 4 and partial['total'] == 5
+    assert [item['url'] for item in partial['items']] == urls[:4]
+    assert [item['original_url'] for item in resolved] == urls[:4]
+
+    assert final['succeeded'] == 4
+    assert final['items'][4]['error'] == "Timed out after 1s"
+    assert sorted(url for url, in short_codes) == sorted(urls[:4])
+
+if __name__ == "__main__":
+    print("🧪 Testing Batch Engine")
+    print("=" * 40)
+    test_timed_out_items_do_not_stall_the_rest()
+    test_items_queued_behind_hanging_items_time_out()
+    test_concurrency_is_capped()
+    test_progress_and_partial_results()
+    print("✅ Batch engine tests passed!")
@@ -0,0 +1,54 @@
+import os
+import sys
+import asyncio
+import tempfile
+from fixture_server import FixtureServer, fixture_env
+from benchmark_tools import SERVER_PATH
+
+async def _call_batch_tools(fixture: FixtureServer, workdir: str) -> tuple:
+    from fastmcp import Client
+    from fastmcp.client.transports import StdioTransport
+
+    urls = [fixture.url(f"/page?title=Page{i}") for i in range(4)] + [fixture.url("/status/500")]
+    messages = []
+
+    async def on_progress(progress, total, message):
+        messages.append(message)
+
+    transport = StdioTransport(command=sys.executable, args=[SERVER_PATH], cwd=workdir,
+                               env={**os.environ, **fixture_env(fixture.base_url)})
+    async with Client(transport, progress_handler=on_progress) as client:
+        metadata = await client.call_tool("get_url_metadata_batch", {'urls': "\n".join(urls)})
+        safety = await client.call_tool("check_url_safety_batch", {'urls': ",".join(urls[:2] + ["https://malware-site.com/login"])})
+        runs = [(await client.call_tool("get_batch_results", {'batch_id': batch.structured_content['batch_id']})).structured_content
+                for batch in (metadata, safety)]
+    return urls, {**metadata.structured_content, 'result': metadata.content[0].text}, safety.structured_content, runs, messages
+
+def test_metadata_and_safety_batches():
+    """Batch tools return one item per URL in input order, with per-item errors"""
+    with FixtureServer(latency_ms=100) as fixture, tempfile.TemporaryDirectory() as workdir:
+        urls, metadata, safety, runs, messages = asyncio.run(_call_batch_tools(fixture, workdir))
+
+    assert metadata['total'] == 5
+    assert metadata['succeeded'] == 4
+    assert [item['title'] for item in metadata['items'][:4]] == [f"Page{i}" for i in range(4)]
+    assert metadata['items'][4]['url'] == urls[4]
+    assert metadata['items'][4]['error']
+    assert "4/5 extracted" in metadata['result']
+
+    assert safety['total'] == 3
+    assert [item['is_safe'] for item in safety['items']] == [True, True, False]
+
+    # Both batches report progress and keep their results for get_batch_results
+    assert any(message.startswith(f"[batch {metadata['batch_id']}]") for message in messages)
+    assert any(message.startswith(f"[batch {safety['batch_id']}]") for message in messages)
+    assert [(run['tool_name'], run['status'], run['completed']) for run in runs] == [
+        ("get_url_metadata_batch", "complete", 5), ("check_url_safety_batch", "complete", 3)]
+    assert runs[0]['items'][0]['summary'] == "Page0" and runs[0]['items'][4]['error']
+    assert runs[1]['items'][2]['summary'].startswith("⚠️")
+
+if __name__ == "__main__":
+    print("🧪 Testing Batch URL Tools")
+    print("=" * 40)
+    test_metadata_and_safety_batches()
+    print("✅ Batch URL tool tests passed!")
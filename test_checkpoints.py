@@ -0,0 +1,143 @@
+import os
+import time
+import asyncio
+import tempfile
+from collections import Counter
+from url_manager_graph_client import SmartURLManager
+from langgraph.checkpoint.base import empty_checkpoint
+from graph_checkpoints import WorkflowCheckpoints
+from test_graph_fanout import _slow_url_server, TOOL_DELAY
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-run; tool call wrappers do not catch it"""
+
+def _crash_once(manager: SmartURLManager, should_crash, fetched: list = None):
+    """Make the manager's tool calls raise Crash the first time should_crash(tool, parameters) holds"""
+    call = manager._call_mcp_tool
+    crashed = []
+
+    async def wrapper(tool_name, parameters, timeout=None):
+        if not crashed and should_crash(tool_name, parameters):
+            crashed.append(tool_name)
+            # Let calls already in flight finish first
+            await asyncio.sleep(TOOL_DELAY * 2)
+            raise Crash(tool_name)
+        if fetched is not None and tool_name == "get_url_metadata_batch":
+            fetched.append(parameters["urls"].split())
+        return await call(tool_name, parameters, timeout)
+
+    manager._call_mcp_tool = wrapper
+
+def test_failed_run_resumes_after_last_completed_node():
+    """A new manager on the same checkpoint file finishes the run without analyzing again"""
+    urls = [f"https://example.org/page{i}" for i in range(3)]
+    request = "Please analyze " + " ".join(urls)
+    calls = Counter()
+
+    async def run(db_path):
+        async with SmartURLManager(_slow_url_server(calls), checkpoint_db=db_path) as manager:
+            _crash_once(manager, lambda tool, parameters: tool == "create_url_collection")
+            try:
+                await manager.process_request(request, request_id="resumable")
+                raise AssertionError("the first run should crash")
+            except Crash:
+                pass
+        async with SmartURLManager(_slow_url_server(calls), checkpoint_db=db_path) as manager:
+            summary = await manager.process_request(request, request_id="resumable")
+        checkpoints = WorkflowCheckpoints(db_path)
+        await checkpoints.open()
+        try:
+            # The completed run left nothing behind
+            return summary, await checkpoints.prune(max_age=0)
+        finally:
+            await checkpoints.close()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        summary, leftover_runs = asyncio.run(run(os.path.join(workdir, "checkpoints.db")))
+
+    assert leftover_runs == 0
+
+    assert "Content Analysis Results" in summary
+    assert all(url in summary for url in urls)
+    assert calls['get_url_metadata_batch'] == 1
+
+def test_requests_without_an_id_start_a_new_run():
+    """Sending the same text again without a request_id does not replay a crashed run"""
+    request = "Please analyze https://example.org/fresh"
+    calls = Counter()
+
+    async def run(db_path):
+        async with SmartURLManager(_slow_url_server(calls), checkpoint_db=db_path) as manager:
+            _crash_once(manager, lambda tool, parameters: tool == "create_url_collection")
+            try:
+                await manager.process_request(request)
+                raise AssertionError("the first run should crash")
+            except Crash:
+                pass
+        async with SmartURLManager(_slow_url_server(calls), checkpoint_db=db_path) as manager:
+            return await manager.process_request(request)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        summary = asyncio.run(run(os.path.join(workdir, "checkpoints.db")))
+
+    assert "https://example.org/fresh" in summary
+    assert calls['get_url_metadata_batch'] == 2
+
+def test_resumed_node_skips_urls_finished_before_the_failure():
+    """URL batches that completed before a crash are memoized; the retry fetches only the rest"""
+    urls = [f"https://example.org/item{i}" for i in range(24)] + ["https://example.org/crash"]
+    request = "Please analyze " + " ".join(urls)
+    first_fetches, second_fetches = [], []
+
+    async def run(db_path):
+        async with SmartURLManager(_slow_url_server(Counter()), checkpoint_db=db_path) as manager:
+            _crash_once(manager, lambda tool, parameters: "crash" in parameters.get("urls", ""), first_fetches)
+            try:
+                await manager.process_request(request, request_id="resumable")
+                raise AssertionError("the first run should crash")
+            except Crash:
+                pass
+        async with SmartURLManager(_slow_url_server(Counter()), checkpoint_db=db_path) as manager:
+            _crash_once(manager, lambda tool, parameters: False, second_fetches)
+            return await manager.process_request(request, request_id="resumable")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        summary = asyncio.run(run(os.path.join(workdir, "checkpoints.db")))
+
+    assert first_fetches == [urls[:20]]
+    assert second_fetches == [urls[20:]]
+    assert summary.count("**URL**:") == len(urls)
+
+def test_stale_runs_are_pruned():
+    now = [time.time()]
+
+    async def run(db_path):
+        checkpoints = WorkflowCheckpoints(db_path, clock=lambda: now[0])
+        saver = await checkpoints.open()
+        try:
+            checkpoints.put_url_results("old-run", "validation", {"https://example.org": {"is_valid": True}})
+            checkpoints.put_url_results("crashed-early", "validation", {"https://example.org": {"is_valid": True}})
+            await saver.aput({'configurable': {'thread_id': "old-run", 'checkpoint_ns': ""}}, empty_checkpoint(), {}, {})
+            ages = [await checkpoints.last_checkpoint_age("old-run")]
+            now[0] += 100
+            pruned = [await checkpoints.prune(max_age=200), await checkpoints.prune(max_age=50)]
+            ages.append(await checkpoints.last_checkpoint_age("old-run"))
+            return ages, pruned, checkpoints.get_url_results("old-run", "validation", ["https://example.org"])
+        finally:
+            await checkpoints.close()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        ages, pruned, memoized = asyncio.run(run(os.path.join(workdir, "checkpoints.db")))
+
+    assert abs(ages[0]) < 5 and ages[1] is None
+    assert pruned == [0, 2]
+    assert memoized == {}
+
+if __name__ == "__main__":
+    print("🧪 Testing Workflow Checkpoints")
+    print("=" * 40)
+    test_failed_run_resumes_after_last_completed_node()
+    test_requests_without_an_id_start_a_new_run()
+    test_resumed_node_skips_urls_finished_before_the_failure()
+    test_stale_runs_are_pruned()
+    print("✅ Workflow checkpoint tests passed!")
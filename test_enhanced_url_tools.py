@@ -0,0 +1,50 @@
+from fixture_server import FixtureServer
+from enhanced_url_tools import EnhancedURLTools
+
+def test_oversized_body_is_truncated_at_the_cap():
+    """Only max_body_bytes are read; the declared size is still reported and the head still parses"""
+    with FixtureServer() as fixture:
+        tools = EnhancedURLTools(max_body_bytes=4096)
+        fetched = tools._fetch(fixture.url("/page?size=200000&title=Big"))
+        metadata = tools.get_url_metadata(fixture.url("/page?size=200000&title=Big"))
+
+    assert fetched['body_truncated']
+    assert len(fetched['body']) == 4096
+    assert fetched['content_length'] == 200000
+    assert metadata['title'] == "Big"
+    assert metadata['body_truncated']
+
+def test_non_html_body_is_not_read():
+    """Content types off the allowlist are reported without reading or parsing the body"""
+    with FixtureServer() as fixture:
+        tools = EnhancedURLTools()
+        fetched = tools._fetch(fixture.url("/binary?size=100000"))
+        metadata = tools.get_url_metadata(fixture.url("/binary?size=100000"))
+
+    assert fetched['body'] == b''
+    assert not fetched['body_truncated']
+    assert fetched['content_length'] == 100000
+    assert fetched['content_type'] == "application/octet-stream"
+    assert metadata['title'] == ''
+    assert 'error' not in metadata
+
+def test_missing_content_length():
+    """Without Content-Length the size is measured from the body, unless the cap cut it short"""
+    with FixtureServer() as fixture:
+        complete = EnhancedURLTools()._fetch(fixture.url("/chunked?size=30000&title=Chunked"))
+        capped = EnhancedURLTools(max_body_bytes=10000)._fetch(fixture.url("/chunked?size=30000"))
+
+    assert complete['content_length'] == 30000
+    assert not complete['body_truncated']
+    assert b"<title>Chunked</title>" in complete['body']
+    assert capped['content_length'] is None
+    assert capped['body_truncated']
+    assert len(capped['body']) == 10000
+
+if __name__ == "__main__":
+    print("🧪 Testing Enhanced URL Tools")
+    print("=" * 40)
+    test_oversized_body_is_truncated_at_the_cap()
+    test_non_html_body_is_not_read()
+    test_missing_content_length()
+    print("✅ Enhanced URL tool tests passed!")
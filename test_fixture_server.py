@@ -0,0 +1,66 @@
+import requests
+from fixture_server import FixtureServer
+from shortener_services import ExternalShortenerPool
+from enhanced_url_tools import EnhancedURLTools
+from benchmark_tools import compare, percentile
+
+def test_pages_redirects_and_errors():
+    """Pages have the requested size and metadata; redirect chains and status codes are served"""
+    with FixtureServer() as fixture:
+        tools = EnhancedURLTools()
+        metadata = tools.get_url_metadata(fixture.url("/page?size=50000&title=Bench"))
+        assert metadata['title'] == "Bench"
+        assert metadata['content_length'] == 50000
+
+        expanded = tools.expand_url(fixture.url("/redirect/3"))
+        assert expanded['redirect_count'] == 3
+        assert expanded['final_url'].startswith(fixture.url("/page"))
+
+        assert requests.get(fixture.url("/status/503")).status_code == 503
+        assert fixture.requests['redirect'] == 3
+
+def test_fake_shortener_apis():
+    """The external shortener pool works against the stand-in and its links redirect back"""
+    with FixtureServer() as fixture:
+        pool = ExternalShortenerPool(api_urls={
+            'tinyurl': fixture.url("/tinyurl/api-create.php"),
+            'chilpit': fixture.url("/chilpit/api.php"),
+            'vgd': fixture.url("/vgd/create.php")
+        })
+        shortened = pool.shorten("https://example.com/a")
+        assert shortened['shortened_url'].startswith(fixture.url("/s/"))
+
+        aliased = pool.shorten_alias("https://example.com/b", "bench-alias")
+        assert aliased['shortened_url'] == fixture.url("/s/bench-alias")
+        response = requests.get(aliased['shortened_url'], allow_redirects=False)
+        assert response.headers['Location'] == "https://example.com/b"
+
+def test_compare_flags_regressions():
+    """A scenario regresses when p50 grows or throughput falls by more than the threshold"""
+    def run(p50, rps):
+        return {'scenarios': {'shorten_url': {'latency_ms': {'p50': p50}, 'throughput_rps': rps}}}
+
+    assert compare(run(10.0, 100.0), run(9.0, 100.0), 0.25) == []
+    assert compare(run(15.0, 100.0), run(10.0, 100.0), 0.25) == ['shorten_url']
+    assert compare(run(10.0, 50.0), run(10.0, 100.0), 0.25) == ['shorten_url']
+
+def test_percentile_nearest_rank():
+    """The q-th percentile is the ceil(q * n)-th smallest value, for even and odd sizes"""
+    assert percentile([1, 2], 0.5) == 1
+    assert percentile([1, 2, 3, 4], 0.25) == 1
+    assert percentile([1, 2, 3, 4], 0.5) == 2
+    assert percentile([1, 2, 3, 4], 0.99) == 4
+    assert percentile(list(range(1, 11)), 0.9) == 9
+    assert percentile(list(range(1, 11)), 0.99) == 10
+    assert percentile([1, 2, 3], 0.5) == 2
+    assert percentile([1, 2, 3], 0.0) == 1
+    assert percentile([], 0.5) == 0.0
+
+if __name__ == "__main__":
+    print("🧪 Testing Fixture Server")
+    print("=" * 40)
+    test_pages_redirects_and_errors()
+    test_fake_shortener_apis()
+    test_compare_flags_regressions()
+    test_percentile_nearest_rank()
+    print("✅ All fixture server tests passed!")
@@ -0,0 +1,240 @@
+import time
+import asyncio
+from collections import Counter
+from mcp.server.fastmcp import FastMCP
+from url_manager_graph_client import SmartURLManager, shared_manager, URL_CACHE_TTL
+from tool_results import (URLMetadata, SafetyReport, MetadataBatchResult, SafetyBatchResult, QRCode, QRBatchResult,
+                          ValidationResult, BatchItem, BatchShortenResult)
+
+TOOL_DELAY = 0.2
+
+def _slow_url_server(calls: Counter) -> FastMCP:
+    """Stand-in for server.py whose tools take TOOL_DELAY seconds per URL (10s for "hang" URLs).
+
+    Like server.py, the metadata and safety batches turn URLs slower than item_timeout into item errors.
+    """
+    server = FastMCP("slow-urls")
+
+    async def fetch(url: str):
+        await asyncio.sleep(10 if "hang" in url else TOOL_DELAY)
+
+    async def each(tool: str, urls: str, make_item, make_error=None, item_timeout: float = None) -> list:
+        calls[tool] += 1
+        url_list = [url for url in urls.split("\n") if url]
+
+        async def run(url):
+            try:
+                await asyncio.wait_for(fetch(url), item_timeout)
+                return make_item(url)
+            except asyncio.TimeoutError:
+                return make_error(url, f"Timed out after {item_timeout:g}s")
+
+        return await asyncio.gather(*(run(url) for url in url_list))
+
+    @server.tool()
+    async def get_url_metadata_batch(urls: str, max_concurrency: int = 16, item_timeout: float = 30.0) -> MetadataBatchResult:
+        items = await each("get_url_metadata_batch", urls, lambda url: URLMetadata(result="ok", url=url, domain="example.com"),
+                           lambda url, error: URLMetadata(result=error, error=error, url=url), item_timeout)
+        return MetadataBatchResult(result="ok", total=len(items), succeeded=sum(not item.error for item in items), items=items)
+
+    @server.tool()
+    async def check_url_safety_batch(urls: str, max_concurrency: int = 16, item_timeout: float = 30.0) -> SafetyBatchResult:
+        items = await each("check_url_safety_batch", urls, lambda url: SafetyReport(result="ok", url=url, is_safe=True),
+                           lambda url, error: SafetyReport(result=error, error=error, url=url), item_timeout)
+        return SafetyBatchResult(result="ok", total=len(items), safe=sum(bool(item.is_safe) for item in items), items=items)
+
+    @server.tool()
+    async def shorten_url_batch(urls: str, collection_name: str = "", tags: str = "",
+                                item_timeout: float = 30.0) -> BatchShortenResult:
+        indexed = iter(range(len(urls.split("\n"))))
+        items = await each("shorten_url_batch", urls,
+                           lambda url: BatchItem(index=next(indexed), url=url, shortened_url=f"{url}/short"),
+                           lambda url, error: BatchItem(index=next(indexed), url=url, error=error), item_timeout)
+        return BatchShortenResult(result="ok", total=len(items), succeeded=sum(item.error is None for item in items),
+                                  items=items)
+
+    @server.tool()
+    async def generate_qr_codes_batch(urls: str, size: int = 10) -> QRBatchResult:
+        codes = await each("generate_qr_codes_batch", urls, lambda url: QRCode(url=url))
+        return QRBatchResult(result="ok", total=len(codes), succeeded=len(codes), codes=codes)
+
+    @server.tool()
+    async def validate_url(url: str) -> ValidationResult:
+        calls["validate_url"] += 1
+        await fetch(url)
+        return ValidationResult(result="ok", url=url, is_valid=True)
+
+    return server
+
+def _state(urls: list) -> dict:
+    return {'messages': [], 'urls': urls, 'analysis_results': {}, 'processed_urls': [], 'error_messages': []}
+
+def test_content_analysis_batches_urls_and_runs_tools_in_parallel():
+    """Three URLs cost one batch call per tool, and the calls overlap"""
+    urls = ["https://github.com/a", "https://docs.python.org/b", "https://example.org/c"]
+    calls = Counter()
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(calls), checkpoint_db=None) as manager:
+            started = time.perf_counter()
+            state = await manager._analyze_content_node(_state(urls))
+            return state, time.perf_counter() - started
+
+    state, elapsed = asyncio.run(run())
+    results = state['analysis_results']['content_analysis']
+    assert [item['url'] for item in results] == urls
+    assert [item['qr_code'] for item in results] == ["Generated", "Generated", None]
+    assert all(item['metadata']['domain'] == "example.com" for item in results)
+    assert elapsed < TOOL_DELAY * 3, elapsed
+    assert calls == {'get_url_metadata_batch': 1, 'check_url_safety_batch': 1, 'generate_qr_codes_batch': 1}
+
+def test_slow_calls_time_out_without_blocking_the_rest():
+    """A call past call_timeout is reported as an error; the other URLs still validate"""
+    urls = ["https://example.org/hang", "https://example.org/ok"]
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(Counter()), pool_size=2, call_timeout=0.5, checkpoint_db=None) as manager:
+            started = time.perf_counter()
+            state = await manager._validate_urls_node(_state(urls))
+            # The session used by the timed-out call is still usable
+            again = await manager._call_mcp_tool("validate_url", {'url': "https://example.org/again"})
+            return state, time.perf_counter() - started, again, manager.sessions.stats()
+
+    state, elapsed, again, stats = asyncio.run(run())
+    hung, ok = state['processed_urls']
+    assert "timed out" in hung['validation']['error']
+    assert ok['validation']['is_valid']
+    assert again['is_valid']
+    assert stats['reconnects'] == 0
+    assert elapsed < 2, elapsed
+
+def test_budget_defers_urls_and_prefers_uncached_ones():
+    """Only max_url_fetches uncached URLs are fetched; cached ones are free on the next request"""
+    urls = [f"https://example.org/{i}" for i in range(10)]
+    calls = Counter()
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(calls), max_url_fetches=4, checkpoint_db=None) as manager:
+            first = await manager._analyze_content_node(_state(urls))
+            second = await manager._analyze_content_node(_state(urls))
+            summary = manager._generate_summary_node({**second, 'operation': "content_analysis"})['workflow_summary']
+            return first, second, summary
+
+    first, second, summary = asyncio.run(run())
+    assert [item['url'] for item in first['processed_urls']] == urls[:4]
+    assert first['deferred_urls'] == urls[4:]
+    assert [item['url'] for item in second['processed_urls']] == urls[:8]
+    assert second['deferred_urls'] == urls[8:]
+    assert "2 URLs were not analyzed" in summary
+    assert all(url in summary for url in urls[8:])
+    assert calls['get_url_metadata_batch'] == 2
+
+def test_slow_urls_time_out_before_the_deadline():
+    """The server gives up on a hanging URL before analysis_deadline, so the rest of its batch is kept"""
+    urls = ["https://example.org/a", "https://example.org/hang", "https://example.org/b"]
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(Counter()), analysis_deadline=1.0, checkpoint_db=None) as manager:
+            await manager._analyze_content_node(_state(urls[:1]))
+            started = time.perf_counter()
+            state = await manager._analyze_content_node(_state(urls))
+            return state, time.perf_counter() - started
+
+    state, elapsed = asyncio.run(run())
+    assert [item['url'] for item in state['processed_urls']] == urls
+    assert state['deferred_urls'] == []
+    hang, b = state['processed_urls'][1:]
+    assert hang['metadata']['error'] == "Timed out after 0.75s"
+    assert not b['metadata']['error'] and b['safety']['is_safe']
+    assert elapsed < 2, elapsed
+
+def test_deadline_keeps_fields_of_finished_calls():
+    """A batch cut off at analysis_deadline is deferred, but the tool calls that finished are cached"""
+    urls = ["https://example.org/hang", "https://example.org/b"]
+    calls = Counter()
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(calls), analysis_deadline=1.0, checkpoint_db=None) as manager:
+            # The QR batch takes no item timeout and hangs past the deadline
+            details, deferred = await manager._analyze_within_budget(urls, with_qr=lambda url: True)
+            return details, deferred, manager._cached_details(urls[1])
+
+    details, deferred, cached = asyncio.run(run())
+    assert details == [] and deferred == urls
+    assert set(cached) == {"metadata", "safety"}
+    assert calls['generate_qr_codes_batch'] == 1
+
+def test_cached_fields_expire_on_their_own_schedule():
+    """Caching a new field keeps earlier fields and does not extend their TTL"""
+    url = "https://example.org/a"
+    manager = SmartURLManager(checkpoint_db=None)
+    manager._cache_details(url, {"metadata": {"title": "A"}, "safety": {"error": "boom"}})
+    stored_at, metadata = manager._url_cache[url]["metadata"]
+    manager._cache_details(url, {"safety": {"is_safe": True}})
+
+    assert manager._cached_details(url) == {"metadata": {"title": "A"}, "safety": {"is_safe": True}}
+    assert manager._url_cache[url]["metadata"] == (stored_at, metadata)
+
+    manager._url_cache[url]["metadata"] = (stored_at - URL_CACHE_TTL, metadata)
+    assert manager._cached_details(url) == {"safety": {"is_safe": True}}
+
+def test_hanging_url_does_not_fail_the_shorten_batch():
+    """shorten_url_batch gets an item timeout below call_timeout, so a hanging URL fails on its own"""
+    urls = ["https://example.org/a", "https://example.org/hang", "https://example.org/b"]
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(Counter()), call_timeout=1.0, analysis_deadline=1.0,
+                                   checkpoint_db=None) as manager:
+            started = time.perf_counter()
+            state = await manager._process_batch_node(_state(urls))
+            return state, time.perf_counter() - started
+
+    state, elapsed = asyncio.run(run())
+    batch = state['analysis_results']['batch_processing']
+    assert not batch['error'] and batch['succeeded'] == 2
+    assert [item['shortened_url'] for item in batch['items']] == [f"{urls[0]}/short", None, f"{urls[2]}/short"]
+    assert batch['items'][1]['error'] == "Timed out after 0.75s"
+    assert elapsed < 2, elapsed
+
+def test_concurrent_requests_keep_their_own_state():
+    """Requests run concurrently on one manager and each summary covers only its own URLs"""
+    requests = [f"{'validate' if i % 2 else 'analyze'} https://example.org/req{i}-a https://example.org/req{i}-b"
+                for i in range(6)]
+
+    async def run():
+        async with SmartURLManager(_slow_url_server(Counter()), pool_size=16, checkpoint_db=None) as manager:
+            started = time.perf_counter()
+            summaries = await manager.process_requests(requests)
+            return summaries, time.perf_counter() - started
+
+    summaries, elapsed = asyncio.run(run())
+    for i, summary in enumerate(summaries):
+        assert ("Validation Results" if i % 2 else "Content Analysis Results") in summary
+        assert f"req{i}-a" in summary and f"req{i}-b" in summary
+        assert all(f"req{j}-" not in summary for j in range(6) if j != i)
+    # One after another the six requests wait for at least six TOOL_DELAY rounds
+    assert elapsed < TOOL_DELAY * 5, elapsed
+
+def test_shared_manager_is_reused_per_event_loop():
+    """run_smart_url_manager reuses one manager within an event loop and a new one per loop"""
+    async def get_twice():
+        return shared_manager(), shared_manager()
+
+    first, again = asyncio.run(get_twice())
+    second, _ = asyncio.run(get_twice())
+    assert first is again
+    assert second is not first
+
+if __name__ == "__main__":
+    print("🧪 Testing Graph Node Fan-out")
+    print("=" * 40)
+    test_content_analysis_batches_urls_and_runs_tools_in_parallel()
+    test_slow_calls_time_out_without_blocking_the_rest()
+    test_budget_defers_urls_and_prefers_uncached_ones()
+    test_slow_urls_time_out_before_the_deadline()
+    test_deadline_keeps_fields_of_finished_calls()
+    test_cached_fields_expire_on_their_own_schedule()
+    test_hanging_url_does_not_fail_the_shorten_batch()
+    test_concurrent_requests_keep_their_own_state()
+    test_shared_manager_is_reused_per_event_loop()
+    print("✅ All fan-out tests passed!")
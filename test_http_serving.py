@@ -0,0 +1,57 @@
+import os
+import asyncio
+import tempfile
+import requests
+from load_test import start_http_server
+
+async def _shorten_and_list(url: str, count: int) -> tuple:
+    from fastmcp import Client
+    from fastmcp.client.transports import StreamableHttpTransport
+
+    async def shorten(i):
+        async with Client(StreamableHttpTransport(url)) as client:
+            result = await client.call_tool("shorten_url", {'url': f"http://127.0.0.1:9/page-{i}"})
+            return result.structured_content['shortened_url']
+
+    shortened = await asyncio.gather(*(shorten(i) for i in range(count)))
+    async with Client(StreamableHttpTransport(url)) as client:
+        listed = await client.call_tool("list_my_urls", {'limit': 100})
+    return shortened, listed.structured_content['urls']
+
+def test_workers_share_the_url_store():
+    """Links created through any worker get distinct codes and are listed by every worker"""
+    with tempfile.TemporaryDirectory() as workdir:
+        process, url = start_http_server(workdir, dict(os.environ), workers=2)
+        try:
+            shortened, listed = asyncio.run(_shorten_and_list(url, 6))
+        finally:
+            process.terminate()
+            process.wait()
+
+    assert len(set(shortened)) == 6
+    assert {saved['shortened_url'] for saved in listed} == set(shortened)
+
+def test_short_links_redirect():
+    """Links from shorten_url resolve through the server's /s/<code> route"""
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {key: value for key, value in os.environ.items() if key != 'SHORT_URL_BASE'}
+        process, url = start_http_server(workdir, env)
+        try:
+            (short_url,), _ = asyncio.run(_shorten_and_list(url, 1))
+            response = requests.get(short_url, allow_redirects=False, timeout=10)
+            missing = requests.get(url.replace("/mcp", "/s/nothing"), allow_redirects=False, timeout=10)
+        finally:
+            process.terminate()
+            process.wait()
+
+    assert short_url.startswith(url.replace("/mcp", "/s/"))
+    assert response.status_code == 301
+    assert response.headers['Location'] == "http://127.0.0.1:9/page-0"
+    assert missing.status_code == 404
+
+if __name__ == "__main__":
+    print("🧪 Testing Multi-Worker HTTP Serving")
+    print("=" * 40)
+    test_workers_share_the_url_store()
+    test_short_links_redirect()
+    print("✅ HTTP serving test passed!")
@@ -0,0 +1,53 @@
+import time
+from url_manager_graph_client import InputParser, parse_user_input
+from benchmark_input_parser import make_input, legacy_parse
+
+SAMPLE = """Please shorten https://github.com/user/repo and docs.python.org, then
+save https://github.com/user/repo again to collection: docs with tags: "python, web"
+Also see api.github.com, github.com, python.org, example.com and fastapi.tiangolo.com."""
+
+def test_extracts_urls_domains_collection_and_tags():
+    """URLs come first without duplicates; domains an earlier URL or domain covers are dropped"""
+    urls, collection_name, tags = parse_user_input(SAMPLE)
+    assert urls == ["https://github.com/user/repo", "https://docs.python.org", "https://api.github.com",
+                    "https://fastapi.tiangolo.com"]
+    assert collection_name == "docs"
+    assert tags == "python, web"
+    assert parse_user_input("nothing to see here") == ([], None, None)
+
+def test_chunked_input_matches_a_single_feed():
+    """Chunk boundaries inside URLs, keywords or values do not change the result"""
+    text = make_input('mixed', 200 * 1024) + "\ncollection:\n  'late'\ntags:\nlast, ones"
+    expected = parse_user_input(text)
+    for size in (7, 1000, 64 * 1024 + 3):
+        parser = InputParser()
+        for start in range(0, len(text), size):
+            parser.feed(text[start:start + size])
+        assert parser.close() == expected, size
+    assert expected[1:] == ("research", "python, web")
+
+def test_keywords_split_across_chunks():
+    parser = InputParser().feed("x" * 70000 + "\nsave to collection:\n")
+    assert parser.feed("reading tags: a, b\n").close() == ([], "reading", "a, b")
+
+def test_megabyte_input_parses_in_linear_time():
+    """A 1 MB request with thousands of links parses quickly and agrees with the old parser"""
+    text = make_input('dense_links', 1024 * 1024)
+    started = time.perf_counter()
+    urls, _, _ = parse_user_input(text)
+    elapsed = time.perf_counter() - started
+    assert len(urls) > 10000
+    assert elapsed < 2, elapsed
+
+    small = make_input('mixed', 20 * 1024)
+    legacy_urls, _, _ = legacy_parse(small)
+    assert parse_user_input(small)[0] == list(dict.fromkeys(legacy_urls))
+
+if __name__ == "__main__":
+    print("🧪 Testing Request Parser")
+    print("=" * 40)
+    test_extracts_urls_domains_collection_and_tags()
+    test_chunked_input_matches_a_single_feed()
+    test_keywords_split_across_chunks()
+    test_megabyte_input_parses_in_linear_time()
+    print("✅ Request parser tests passed!")
@@ -0,0 +1,101 @@
+import os
+import time
+import sqlite3
+import tempfile
+from job_queue import JobQueue
+
+def _db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "urls.db")
+
+def _wait_for(queue: JobQueue, job_id: str, timeout: float = 10.0) -> dict:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.status(job_id)
+        if job['status'] == 'complete':
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish: {queue.status(job_id)}")
+
+def test_job_runs_and_checkpoints_results():
+    """Items are processed by the pool and results come back in input order"""
+    def handler(url, params):
+        if 'bad' in url:
+            raise RuntimeError("boom")
+        return {'url': url, 'tag': params['tag']}
+
+    queue = JobQueue({'echo': handler}, db_path=_db_path(), workers=3)
+    urls = [f"https://example.org/{i}" for i in range(25)] + ["https://bad.example"]
+    job_id = queue.submit('echo', urls, {'tag': 'x'})
+
+    job = _wait_for(queue, job_id)
+    queue.stop()
+    assert job['completed'] == 26
+    assert job['failed'] == 1
+
+    results = queue.results(job_id, limit=100)
+    assert [item['index'] for item in results] == list(range(26))
+    assert results[3]['result'] == {'url': "https://example.org/3", 'tag': 'x'}
+    assert results[-1]['status'] == 'error'
+
+def test_job_resumes_after_restart():
+    """Finished items are kept and leased items from a dead process are redone"""
+    db_path = _db_path()
+    calls = []
+
+    def handler(url, params):
+        calls.append(url)
+        return {'url': url}
+
+    queue = JobQueue({'echo': handler}, db_path=db_path, workers=1)
+    # Persist the job without starting workers, then fake a crash mid-run
+    queue.start = lambda: None
+    job_id = queue.submit('echo', ["https://a.example", "https://b.example", "https://c.example"])
+
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE url_job_items SET status = 'done', result = '{}' WHERE idx = 0", ())
+        conn.execute("UPDATE url_jobs SET completed = 1, status = 'running'")
+        conn.execute("UPDATE url_job_items SET status = 'running', attempts = 1, lease_expires_at = 0 WHERE idx = 1")
+    conn.close()
+
+    restarted = JobQueue({'echo': handler}, db_path=db_path, workers=2)
+    restarted.start()
+    job = _wait_for(restarted, job_id)
+    restarted.stop()
+
+    assert job['completed'] == 3
+    assert sorted(calls) == ["https://b.example", "https://c.example"]
+
+def test_url_files_stay_inside_jobs_dir():
+    """submit_url_job only reads URL files from URL_JOBS_DIR"""
+    import server
+
+    with tempfile.TemporaryDirectory() as workdir:
+        jobs_dir = os.path.join(workdir, "jobs")
+        os.mkdir(jobs_dir)
+        with open(os.path.join(jobs_dir, "urls.txt"), "w") as f:
+            f.write("https://a.example\n\nhttps://b.example\n")
+        with open(os.path.join(workdir, "secret.txt"), "w") as f:
+            f.write("not for clients\n")
+        os.symlink(os.path.join(workdir, "secret.txt"), os.path.join(jobs_dir, "link.txt"))
+
+        os.environ.pop("URL_JOBS_DIR", None)
+        disabled = server.submit_url_job("validate", urls_file="urls.txt")
+        os.environ["URL_JOBS_DIR"] = jobs_dir
+        try:
+            assert server._read_url_file("urls.txt") == ["https://a.example", "https://b.example"]
+            escapes = [server.submit_url_job("validate", urls_file=name)
+                       for name in ("../secret.txt", os.path.join(workdir, "secret.txt"), "link.txt")]
+        finally:
+            del os.environ["URL_JOBS_DIR"]
+
+    assert "URL_JOBS_DIR" in disabled.error
+    assert all("not a file inside URL_JOBS_DIR" in result.error for result in escapes)
+
+if __name__ == "__main__":
+    print("🧪 Testing Job Queue")
+    print("=" * 40)
+    test_job_runs_and_checkpoints_results()
+    test_job_resumes_after_restart()
+    test_url_files_stay_inside_jobs_dir()
+    print("✅ All job queue tests passed!")
@@ -11,17 +11,17 @@ async def test_basic_langgraph_integration():
     try:
         # Initialize the Smart URL Manager
         print("🔧 Initializing Smart URL Manager...")
-        manager = SmartURLManager()
-        print("✅ Smart URL Manager initialized successfully")
-        
-        # Test simple URL validation workflow
-        print("\n📝 Testing URL Validation Workflow...")
-        test_request = "Please check if this URL works: https://www.python.org"
-        
-        print(f"Request: {test_request}")
-        print("\n🤖 Processing request through LangGraph workflow...")
-        
-        result = await manager.process_request(test_request)
+        async with SmartURLManager(checkpoint_db=None) as manager:
+            print("✅ Smart URL Manager initialized successfully")
+            
+            # Test simple URL validation workflow
+            print("\n📝 Testing URL Validation Workflow...")
+            test_request = "Please check if this URL works: https://www.python.org"
+            
+            print(f"Request: {test_request}")
+            print("\n🤖 Processing request through LangGraph workflow...")
+            
+            result = await manager.process_request(test_request)
         
         print("\n📊 Workflow Result:")
         print("-" * 40)
@@ -49,7 +49,7 @@ async def test_intent_detection():
         ("Organize these links collection: docs", "organize")
     ]
     
-    manager = SmartURLManager()
+    manager = SmartURLManager(checkpoint_db=None)
     
     for request, expected_intent in test_cases:
         print(f"\n📝 Request: '{request}'")
@@ -94,7 +94,7 @@ async def test_workflow_routing():
     print("\n🛤️  Testing Workflow Routing")
     print("=" * 40)
     
-    manager = SmartURLManager()
+    manager = SmartURLManager(checkpoint_db=None)
     
     test_states = [
         {"user_intent": "validate", "urls": ["https://example.com"]},
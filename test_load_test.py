@@ -0,0 +1,25 @@
+from load_test import parse_mix, start_offsets, summarize
+
+def test_mix_and_ramp_profiles():
+    """Mix weights default to 1; ramps spread user start times over the ramp period"""
+    assert parse_mix("shorten_url=3, list_my_urls") == {'shorten_url': 3.0, 'list_my_urls': 1.0}
+    assert start_offsets(4, 'none', 10) == [0.0] * 4
+    assert start_offsets(4, 'linear', 8) == [0.0, 2.0, 4.0, 6.0]
+    assert start_offsets(4, 'step', 8, steps=2) == [0.0, 0.0, 4.0, 4.0]
+
+def test_summary_rates():
+    """RPS is over the window; error rate over the requests in it"""
+    samples = [(0.1, 'shorten_url', 0.010, False, None), (0.2, 'shorten_url', 0.030, True, "boom"),
+               (0.3, 'list_my_urls', 0.020, False, None), (0.4, 'list_my_urls', 0.040, False, None)]
+    summary = summarize(samples, 2.0)
+    assert summary['rps'] == 2.0
+    assert summary['error_rate'] == 0.25
+    assert summary['latency_ms']['p50'] == 20.0
+    assert summary['latency_ms']['max'] == 40.0
+
+if __name__ == "__main__":
+    print("🧪 Testing Load Generator")
+    print("=" * 40)
+    test_mix_and_ramp_profiles()
+    test_summary_rates()
+    print("✅ All load generator tests passed!")
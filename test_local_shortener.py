@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import tempfile
+from local_shortener import LocalShortener, code_for_id, CODE_LENGTH
+from url_storage import URLStorage
+
+def _make_shortener() -> LocalShortener:
+    db_dir = tempfile.mkdtemp()
+    return LocalShortener(os.path.join(db_dir, "urls.db"), base_url="https://sho.rt/")
+
+def test_generated_codes_are_unique():
+    """Sequential ids map to distinct fixed-width codes"""
+    codes = {code_for_id(i) for i in range(1, 20001)}
+    assert len(codes) == 20000
+    assert all(len(code) == CODE_LENGTH for code in codes)
+
+def test_shorten_and_resolve():
+    """Shortening is stable per URL and resolves back in-process"""
+    shortener = _make_shortener()
+
+    code = shortener.shorten("https://www.python.org")
+    assert shortener.shorten("https://www.python.org") == code
+    assert shortener.shorten("https://pytorch.org") != code
+
+    resolved = shortener.resolve(shortener.short_url(code))
+    assert resolved['original_url'] == "https://www.python.org"
+    assert not resolved['is_custom']
+    assert shortener.resolve("missing") is None
+
+def test_custom_alias_reservation():
+    """Aliases are unique and share the generated code namespace"""
+    shortener = _make_shortener()
+
+    assert shortener.reserve_alias("https://www.python.org", "py-docs")
+    assert not shortener.reserve_alias("https://pytorch.org", "py-docs")
+    assert shortener.resolve("py-docs")['original_url'] == "https://www.python.org"
+
+    # An alias squatting on the next generated code forces the generator to skip it
+    assert shortener.reserve_alias("https://example.org", code_for_id(3))
+    code = shortener.shorten("https://fastapi.tiangolo.com")
+    assert code != code_for_id(3)
+    assert shortener.resolve(code)['original_url'] == "https://fastapi.tiangolo.com"
+
+    try:
+        shortener.reserve_alias("https://www.python.org", "not a valid alias")
+        assert False, "invalid alias accepted"
+    except ValueError:
+        pass
+
+def test_failed_save_releases_the_alias():
+    """An alias whose link was never saved can be reserved again; unserved links carry a warning"""
+    import server
+
+    shortener = _make_shortener()
+    storage = URLStorage(os.path.join(os.path.dirname(shortener.db_path), "urls.db"))
+
+    class FailingStorage:
+        def save_urls(self, records):
+            raise sqlite3.OperationalError("database is locked")
+
+    def analyze(url, custom_alias="", mirror_external=False):
+        return {'url': url, 'metadata': {}, 'safety': {'is_safe': True}, 'mirror': {}}
+
+    patched = {'local_shortener': lambda: shortener, 'url_storage': lambda: FailingStorage(), '_analyze_link': analyze}
+    originals = {name: getattr(server, name) for name in patched}
+    short_url_base = os.environ.pop('SHORT_URL_BASE', None)
+    try:
+        for name, value in patched.items():
+            setattr(server, name, value)
+        failed = server.shorten_url("https://www.python.org", custom_alias="py-docs")
+        released = shortener.resolve("py-docs") is None
+        server.url_storage = lambda: storage
+        saved = server.shorten_url("https://www.python.org", custom_alias="py-docs")
+    finally:
+        for name, value in originals.items():
+            setattr(server, name, value)
+        if short_url_base is not None:
+            os.environ['SHORT_URL_BASE'] = short_url_base
+
+    assert "database is locked" in failed.error and released
+    assert saved.error is None and saved.shortened_url == "https://sho.rt/py-docs"
+    assert "SHORT_URL_BASE" in saved.link_warning and saved.link_warning in saved.result
+
+def test_duplicate_collection_releases_the_database():
+    """A rejected collection name leaves no open write transaction behind"""
+    storage = URLStorage(os.path.join(tempfile.mkdtemp(), "urls.db"))
+    assert storage.create_collection("docs")
+    assert not storage.create_collection("docs")
+
+    conn = sqlite3.connect(storage.db_path, timeout=0)
+    with conn:
+        conn.execute("INSERT INTO collections (name) VALUES ('other')")
+    conn.close()
+
+if __name__ == "__main__":
+    print("🧪 Testing Local Shortener")
+    print("=" * 40)
+    test_generated_codes_are_unique()
+    test_shorten_and_resolve()
+    test_custom_alias_reservation()
+    test_failed_save_releases_the_alias()
+    test_duplicate_collection_releases_the_database()
+    print("✅ All local shortener tests passed!")
@@ -0,0 +1,57 @@
+import random
+from metrics import Metrics, LatencyHistogram
+
+def test_histogram_quantiles_within_precision():
+    """Reported quantiles stay within the histogram's relative error"""
+    values = [random.uniform(0.0001, 5.0) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for q in (0.5, 0.9, 0.99):
+        exact = values[int(q * len(values)) - 1]
+        assert abs(histogram.quantile(q) - exact) / exact < 2 / histogram.sub_buckets
+    assert histogram.count == len(values)
+    assert histogram.quantile(1.0) == max(values)
+
+def test_spans_are_attributed_to_the_calling_tool():
+    """Operations record under the tool whose call they ran in, errors are counted"""
+    metrics = Metrics()
+
+    class Storage:
+        def save(self, fail=False):
+            if fail:
+                raise RuntimeError("disk full")
+            return 1
+
+    storage = metrics.instrument(Storage(), 'url_storage', ['save'])
+    with metrics.tool_call('shorten_url'):
+        storage.save()
+    try:
+        with metrics.tool_call('shorten_url'):
+            storage.save(fail=True)
+    except RuntimeError:
+        pass
+    storage.save()
+
+    snapshot = metrics.snapshot()
+    assert snapshot['tools'][0]['name'] == 'shorten_url'
+    assert snapshot['tools'][0]['count'] == 2
+    assert snapshot['tools'][0]['errors'] == 1
+    operations = {(op['name'], op['tool']): op for op in snapshot['operations']}
+    assert operations[('url_storage.save', 'shorten_url')]['count'] == 2
+    assert operations[('url_storage.save', 'shorten_url')]['errors'] == 1
+    assert operations[('url_storage.save', '-')]['count'] == 1
+
+    exported = metrics.prometheus({'search_cache_hits_total': 3})
+    assert 'mcp_tool_calls_total{tool="shorten_url",status="error"} 1' in exported
+    assert 'mcp_operation_duration_seconds_count{operation="url_storage.save",tool="shorten_url"} 2' in exported
+    assert 'mcp_search_cache_hits_total 3' in exported
+
+if __name__ == "__main__":
+    print("🧪 Testing Metrics")
+    print("=" * 40)
+    test_histogram_quantiles_within_precision()
+    test_spans_are_attributed_to_the_calling_tool()
+    print("✅ All metrics tests passed!")
@@ -0,0 +1,64 @@
+import os
+import pstats
+import tempfile
+from profiling import ToolProfiler
+
+def _busy(n: int = 200000) -> int:
+    return sum(i * i for i in range(n))
+
+def test_armed_tool_is_profiled_for_n_calls():
+    """Arming a tool for N calls writes N pstats dumps, then it disarms itself"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        profiler = ToolProfiler(output_dir)
+        profiler.arm('shorten_url', calls=2)
+        for _ in range(3):
+            with profiler.profile_call('shorten_url'):
+                _busy()
+        with profiler.profile_call('web_search'):
+            _busy()
+
+        dumps = sorted(os.listdir(output_dir))
+        assert len(dumps) == 2
+        assert all(name.startswith('shorten_url-') and name.endswith('.pstats') for name in dumps)
+        assert not profiler.armed()
+        stats = pstats.Stats(os.path.join(output_dir, dumps[0]))
+        assert any(function[2] == '_busy' for function in stats.stats)
+
+def test_sampling_mode_writes_collapsed_stacks():
+    """Sampling mode writes 'frame;frame count' lines that include the profiled code"""
+    import threading
+    with tempfile.TemporaryDirectory() as output_dir:
+        profiler = ToolProfiler(output_dir)
+        profiler.arm('expand_url', mode='sampling', interval=0.001)
+        with profiler.profile_call('expand_url'):
+            _busy(2000000)
+
+        [dump] = profiler.recent_dumps
+        assert dump.endswith('.collapsed')
+        with open(dump) as f:
+            lines = f.read().splitlines()
+        assert lines and all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+        assert any(threading.main_thread().name in line and '_busy' in line for line in lines)
+
+def test_disarm_and_invalid_mode():
+    """calls=0 disarms a tool; unknown modes are rejected"""
+    with tempfile.TemporaryDirectory() as output_dir:
+        profiler = ToolProfiler(output_dir)
+        profiler.arm('web_search', calls=5)
+        profiler.arm('web_search', calls=0)
+        with profiler.profile_call('web_search'):
+            _busy()
+        assert os.listdir(output_dir) == []
+        try:
+            profiler.arm('web_search', mode='perf')
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+
+if __name__ == "__main__":
+    print("🧪 Testing Tool Profiling")
+    print("=" * 40)
+    test_armed_tool_is_profiled_for_n_calls()
+    test_sampling_mode_writes_collapsed_stacks()
+    test_disarm_and_invalid_mode()
+    print("✅ All profiling tests passed!")
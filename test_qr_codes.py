@@ -0,0 +1,151 @@
+import os
+import base64
+import tempfile
+from enhanced_url_tools import EnhancedURLTools, QR_BATCH_POOL_THRESHOLD
+from qr_codes import QRCodeCache, png_dimensions
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+def _tools(workdir: str) -> EnhancedURLTools:
+    return EnhancedURLTools(qr_cache_dir=os.path.join(workdir, "cache"), qr_output_dir=os.path.join(workdir, "out"))
+
+def test_cache_miss_then_hit():
+    """The first request renders and stores the code; the same request is then served from disk"""
+    with tempfile.TemporaryDirectory() as workdir:
+        first = _tools(workdir).generate_qr_code("https://python.org", size=4)
+        # A new instance reads the cache directory left by the first one
+        tools = _tools(workdir)
+        second = tools.generate_qr_code("https://python.org", size=4)
+        stats = tools.qr_cache.stats()
+        cache_files = os.listdir(os.path.join(workdir, "cache"))
+
+    assert not first['cached'] and second['cached']
+    assert first['qr_code_base64'] == second['qr_code_base64']
+    assert stats['hits'] == 1 and stats['misses'] == 0
+    assert len(cache_files) == 1
+
+def test_cache_key_changes_with_options():
+    """Size, error correction and format each get their own entry; the bit matrix ignores size"""
+    with tempfile.TemporaryDirectory() as workdir:
+        tools = _tools(workdir)
+        key = lambda size, level, fmt: tools._qr_cache_key("https://python.org", size, level, fmt)
+        keys = {key(4, 'L', 'png'), key(8, 'L', 'png'), key(4, 'H', 'png'), key(4, 'L', 'svg'), key(4, 'L', 'matrix')}
+        assert len(keys) == 5
+        assert key(4, 'L', 'matrix') == key(8, 'L', 'matrix')
+        # File output is written from the PNG rendering
+        assert key(4, 'L', 'file') == key(4, 'L', 'png')
+
+        assert not tools.generate_qr_code("https://python.org", size=4)['cached']
+        assert not tools.generate_qr_code("https://python.org", size=5)['cached']
+        assert not tools.generate_qr_code("https://python.org", size=4, error_correction='h')['cached']
+        assert tools.generate_qr_code("https://python.org", size=4, error_correction='H')['cached']
+
+def test_output_formats():
+    """PNG, SVG, bit matrix and file outputs describe the same code"""
+    url = "https://python.org"
+    with tempfile.TemporaryDirectory() as workdir:
+        tools = _tools(workdir)
+        png = tools.generate_qr_code(url, size=3)
+        svg = tools.generate_qr_code(url, size=3, output_format='svg')
+        matrix = tools.generate_qr_code(url, output_format='matrix')
+        file = tools.generate_qr_code(url, size=3, output_format='FILE')
+        with open(file['file_path'], 'rb') as f:
+            file_content = f.read()
+        assert os.path.dirname(file['file_path']) == os.path.abspath(os.path.join(workdir, "out"))
+
+    # 18 bytes need a version 2 code: 25 modules, plus a 4-module quiet zone on each side
+    assert matrix['format'] == "MATRIX" and matrix['modules'] == 25
+    assert len(base64.b64decode(matrix['qr_matrix_base64'])) == (25 * 25 + 7) // 8
+
+    png_bytes = base64.b64decode(png['qr_code_base64'])
+    assert png_bytes.startswith(PNG_SIGNATURE)
+    assert png_dimensions(png_bytes) == (33 * 3, 33 * 3)
+    assert png['format'] == "PNG" and png['size'] == "99x99"
+
+    assert svg['format'] == "SVG" and svg['size'] == "99x99"
+    assert svg['qr_code_svg'].startswith("<svg") and 'viewBox="0 0 33 33"' in svg['qr_code_svg']
+
+    assert file['format'] == "PNG" and 'qr_code_base64' not in file
+    assert file_content == png_bytes
+
+def test_summary_text_leaves_the_payload_to_structured_content():
+    """The tool text names the field that holds the payload instead of repeating it"""
+    import server
+
+    with tempfile.TemporaryDirectory() as workdir:
+        tools = _tools(workdir)
+        url_tools, server.url_tools = server.url_tools, lambda: tools
+        try:
+            results = [server.generate_qr_code("https://python.org", output_format=fmt) for fmt in ('png', 'svg', 'matrix')]
+            batch = server.generate_qr_codes_batch("https://python.org,https://docs.python.org", output_format='svg')
+        finally:
+            server.url_tools = url_tools
+
+    png, svg, matrix = results
+    assert png.qr_code_base64 not in png.result and "qr_code_base64" in png.result
+    assert "<svg" not in svg.result and "qr_code_svg" in svg.result
+    assert matrix.qr_matrix_base64 not in matrix.result and "25x25" in matrix.result
+    assert "<svg" not in batch.result and all(code.qr_code_svg for code in batch.codes)
+    # The packed matrix is the smallest payload and SVG the largest
+    assert len(matrix.qr_matrix_base64) < len(png.qr_code_base64) < len(svg.qr_code_svg)
+
+def test_invalid_options_are_errors():
+    with tempfile.TemporaryDirectory() as workdir:
+        tools = _tools(workdir)
+        assert "error correction" in tools.generate_qr_code("https://python.org", error_correction='Z')['error']
+        batch = tools.generate_qr_codes_batch(["https://a.org", "https://b.org"], output_format='gif')
+    assert all("output format" in item['error'] for item in batch)
+
+def test_batch_renders_misses_in_the_process_pool():
+    """A large batch renders in worker processes, once per distinct URL, in input order"""
+    urls = [f"https://example.org/{i}" for i in range(QR_BATCH_POOL_THRESHOLD + 2)]
+    with tempfile.TemporaryDirectory() as workdir:
+        tools = _tools(workdir)
+        try:
+            first = tools.generate_qr_codes_batch(urls + urls[:2], size=2)
+            used_pool = tools._qr_pool is not None
+            second = tools.generate_qr_codes_batch(urls, size=2)
+            single = tools.generate_qr_code(urls[0], size=2)
+        finally:
+            if tools._qr_pool is not None:
+                tools._qr_pool.shutdown()
+
+    assert used_pool
+    assert [item['url'] for item in first] == urls + urls[:2]
+    assert not any(item['cached'] for item in first)
+    assert first[-2]['qr_code_base64'] == first[0]['qr_code_base64']
+    assert all(item['cached'] for item in second)
+    assert single['qr_code_base64'] == first[0]['qr_code_base64']
+
+def test_cache_evicts_least_recently_used():
+    with tempfile.TemporaryDirectory() as workdir:
+        cache = QRCodeCache(workdir, max_entries=2)
+        cache.put("a.png", b"a")
+        cache.put("b.png", b"b")
+        assert cache.get("a.png") == b"a"
+        cache.put("c.png", b"c")
+        assert cache.get("b.png") is None
+        assert sorted(os.listdir(workdir)) == ["a.png", "c.png"]
+
+def test_cache_bound_holds_across_processes():
+    """Caches sharing a directory (one per worker process) count each other's entries"""
+    with tempfile.TemporaryDirectory() as workdir:
+        caches = [QRCodeCache(workdir, max_bytes=4, rescan_interval=0) for _ in range(2)]
+        for i in range(4):
+            caches[i % 2].put(f"{i}.png", b"xx")
+        sizes = [os.path.getsize(os.path.join(workdir, name)) for name in os.listdir(workdir)]
+
+    assert sum(sizes) <= 4
+
+if __name__ == "__main__":
+    print("🧪 Testing QR Codes")
+    print("=" * 40)
+    test_cache_miss_then_hit()
+    test_cache_key_changes_with_options()
+    test_output_formats()
+    test_summary_text_leaves_the_payload_to_structured_content()
+    test_invalid_options_are_errors()
+    test_batch_renders_misses_in_the_process_pool()
+    test_cache_evicts_least_recently_used()
+    test_cache_bound_holds_across_processes()
+    print("✅ QR code tests passed!")
@@ -0,0 +1,75 @@
+import os
+import time
+import tempfile
+import threading
+from search_cache import SearchCache, normalize_query
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def _db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "urls.db")
+
+def test_normalize_query():
+    """Case, whitespace, articles and politeness words do not change the key; everything else does"""
+    assert normalize_query("Please find  the Python\trelease") == normalize_query("find python RELEASE")
+    assert normalize_query("python vs java") != normalize_query("java vs python")
+    assert normalize_query("latest python release") != normalize_query("python release")
+    assert normalize_query("python release?") != normalize_query("python release")
+    assert normalize_query("python not java") != normalize_query("python java")
+    assert normalize_query("the") == "the"
+    assert normalize_query("vitamin a") != normalize_query("vitamin")
+    assert normalize_query("hepatitis a vaccine") != normalize_query("hepatitis vaccine")
+
+def test_ttl_and_lru_eviction():
+    """Entries expire after the TTL and the least recently used go first when full"""
+    clock = FakeClock()
+    cache = SearchCache(db_path=_db_path(), ttl_seconds=60, max_entries=2, clock=clock)
+
+    cache.put("python", "p")
+    clock.now += 1
+    cache.put("rust", "r")
+    clock.now += 1
+    assert cache.get("Python") == "p"
+    clock.now += 1
+    cache.put("go", "g")
+    assert cache.get("rust") is None
+    assert cache.get("python") == "p"
+
+    clock.now += 61
+    assert cache.get("go") is None
+
+def test_concurrent_misses_share_one_fetch():
+    """Identical in-flight queries cause a single upstream call"""
+    cache = SearchCache(db_path=_db_path())
+    calls = []
+
+    def fetch(query):
+        calls.append(query)
+        time.sleep(0.2)
+        return f"results for {query}"
+
+    results = []
+    threads = [threading.Thread(target=lambda q=q: results.append(cache.get_or_fetch(q, fetch)))
+               for q in ["Python asyncio", "python  ASYNCIO", "the python asyncio"] * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({result for result, _ in results}) == 1
+    assert cache.get_or_fetch("Please python asyncio", fetch)[1] is True
+    assert cache.stats()['coalesced'] == 5
+
+if __name__ == "__main__":
+    print("🧪 Testing Search Cache")
+    print("=" * 40)
+    test_normalize_query()
+    test_ttl_and_lru_eviction()
+    test_concurrent_misses_share_one_fetch()
+    print("✅ All search cache tests passed!")
@@ -0,0 +1,58 @@
+import asyncio
+from mcp.server.fastmcp import FastMCP
+from mcp_session_pool import MCPSessionPool
+
+def _echo_server() -> FastMCP:
+    server = FastMCP("echo")
+
+    @server.tool()
+    async def echo(text: str) -> str:
+        await asyncio.sleep(0.05)
+        return text
+
+    @server.tool()
+    def fail() -> str:
+        raise ValueError("nope")
+
+    return server
+
+def test_sessions_are_reused_and_bounded():
+    """Concurrent calls share at most `size` sessions, which stay open across calls"""
+    async def run():
+        async with MCPSessionPool(_echo_server(), size=2) as pool:
+            results = await asyncio.gather(*(pool.call_tool("echo", {'text': str(i)}) for i in range(6)))
+            await pool.call_tool("echo", {'text': "again"})
+            return [result.content[0].text for result in results], pool.stats()
+
+    texts, stats = asyncio.run(run())
+    assert texts == [str(i) for i in range(6)]
+    assert stats['connects'] == 2
+    assert stats['calls'] == 7
+
+def test_broken_session_reconnects_and_tool_errors_do_not():
+    """A dead session is replaced and the call retried; a failing tool keeps its session"""
+    async def run():
+        async with MCPSessionPool(_echo_server(), size=1) as pool:
+            await pool.call_tool("echo", {'text': "a"})
+            # Simulate the server going away under an idle session
+            await pool._idle[0].close()
+            result = await pool.call_tool("echo", {'text': "b"})
+            try:
+                await pool.call_tool("fail")
+                assert False, "expected ToolError"
+            except Exception as e:
+                assert "nope" in str(e)
+            return result.content[0].text, pool.stats()
+
+    text, stats = asyncio.run(run())
+    assert text == "b"
+    assert stats['reconnects'] == 1
+    assert stats['connects'] == 2
+    assert stats['sessions'] == 1
+
+if __name__ == "__main__":
+    print("🧪 Testing MCP Session Pool")
+    print("=" * 40)
+    test_sessions_are_reused_and_bounded()
+    test_broken_session_reconnects_and_tool_errors_do_not()
+    print("✅ All session pool tests passed!")
@@ -0,0 +1,119 @@
+import time
+from shortener_services import CircuitBreaker, ExternalShortenerPool
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_breaker_opens_and_recovers():
+    """Failures open the breaker, a successful trial call closes it again"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=4, error_rate_threshold=0.5, open_seconds=30, clock=clock)
+
+    for success in (True, False, True, False):
+        assert breaker.allow_request()
+        breaker.record(success, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.now += 31
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    # Only one trial call at a time
+    assert not breaker.allow_request()
+    breaker.record(True, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+def test_breaker_trial_failure_reopens():
+    """A failed half-open trial sends the breaker straight back to open"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(min_calls=2, open_seconds=10, clock=clock)
+    breaker.record(False, 0.1)
+    breaker.record(False, 0.1)
+    clock.now += 11
+    assert breaker.allow_request()
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.snapshot()['times_opened'] == 2
+
+def test_breaker_opens_on_slow_calls():
+    """Calls that succeed but are consistently slow also trip the breaker"""
+    breaker = CircuitBreaker(min_calls=3, slow_call_seconds=1.0, slow_call_rate_threshold=0.6)
+    for _ in range(3):
+        breaker.record(True, 2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+
+def test_pool_skips_open_backends():
+    """Backends with an open circuit are not called at all"""
+    pool = ExternalShortenerPool()
+    calls = []
+
+    def fake_short_with(name, url):
+        calls.append(name)
+        if name == 'tinyurl':
+            raise RuntimeError("down")
+        return f"https://{name}.example/abc"
+
+    pool._short_with = fake_short_with
+    for _ in range(5):
+        pool.breakers['tinyurl'].record(False, 0.1)
+    assert pool.breakers['tinyurl'].state == CircuitBreaker.OPEN
+
+    result = pool.shorten("https://www.python.org")
+    assert result['shortened_url'].startswith("https://chilpit")
+    assert 'tinyurl' not in calls
+
+def test_pool_hedges_slow_backend():
+    """A slow preferred backend is hedged by the next one after its latency budget"""
+    pool = ExternalShortenerPool()
+
+    def fake_short_with(name, url):
+        time.sleep(2.0 if name == 'tinyurl' else 0.01)
+        return f"https://{name}.example/abc"
+
+    pool._short_with = fake_short_with
+    for _ in range(3):
+        pool.stats['tinyurl'].record(True, 0.05)
+
+    started = time.perf_counter()
+    result = pool.shorten("https://www.python.org")
+    assert result['service'] == 'Chilp.it'
+    assert time.perf_counter() - started < 1.0
+
+def test_hedge_skips_open_backends_without_waiting():
+    """An open circuit between the slow backend and the next one costs no extra hedge delay"""
+    pool = ExternalShortenerPool()
+    calls = []
+
+    def fake_short_with(name, url):
+        calls.append(name)
+        time.sleep(3.0 if name == 'tinyurl' else 0.01)
+        return f"https://{name}.example/abc"
+
+    pool._short_with = fake_short_with
+    for _ in range(3):
+        pool.stats['tinyurl'].record(True, 0.5)
+    for _ in range(5):
+        pool.breakers['chilpit'].record(False, 0.1)
+
+    started = time.perf_counter()
+    result = pool.shorten("https://www.python.org")
+    elapsed = time.perf_counter() - started
+    assert result['service'] == 'V.gd'
+    assert calls == ['tinyurl', 'vgd']
+    # One hedge delay (0.5s) of the slow backend, not a second one for the refused backend
+    assert elapsed < 0.9, elapsed
+
+if __name__ == "__main__":
+    print("🧪 Testing Shortener Services")
+    print("=" * 40)
+    test_breaker_opens_and_recovers()
+    test_breaker_trial_failure_reopens()
+    test_breaker_opens_on_slow_calls()
+    test_pool_skips_open_backends()
+    test_pool_hedges_slow_backend()
+    test_hedge_skips_open_backends_without_waiting()
+    print("✅ All shortener service tests passed!")
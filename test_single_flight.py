@@ -0,0 +1,66 @@
+import time
+import threading
+from single_flight import SingleFlight
+from enhanced_url_tools import EnhancedURLTools
+
+def _run_concurrently(target, count: int) -> list:
+    results = [None] * count
+    def run(i):
+        try:
+            results[i] = target()
+        except Exception as e:
+            results[i] = e
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_calls_share_result_and_error():
+    """Callers arriving during a flight get its result or exception; later calls run again"""
+    flight = SingleFlight()
+    calls = []
+
+    def slow(value):
+        calls.append(value)
+        time.sleep(0.2)
+        if value == 'bad':
+            raise RuntimeError("boom")
+        return value.upper()
+
+    assert _run_concurrently(lambda: flight.do('a', slow, 'ok'), 5) == ['OK'] * 5
+    errors = _run_concurrently(lambda: flight.do('b', slow, 'bad'), 3)
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    assert calls == ['ok', 'bad']
+    assert flight.stats() == {'executed': 2, 'shared': 6, 'in_flight': 0}
+
+    flight.do('a', slow, 'ok')
+    assert calls == ['ok', 'bad', 'ok']
+
+def test_url_tools_coalesce_metadata_fetches():
+    """Concurrent metadata requests for one URL (with or without scheme) cause one fetch"""
+    tools = EnhancedURLTools()
+    fetches = []
+
+    def fake_metadata(url):
+        fetches.append(url)
+        time.sleep(0.2)
+        return {'url': url, 'title': 'Python'}
+
+    tools._get_url_metadata = fake_metadata
+    results = _run_concurrently(lambda: tools.get_url_metadata("www.python.org"), 3)
+    results += _run_concurrently(lambda: tools.get_url_metadata("https://www.python.org"), 1)
+
+    assert len(fetches) == 2
+    assert all(result['title'] == 'Python' for result in results)
+    # Every caller owns its copy
+    assert len({id(result) for result in results}) == 4
+    assert tools.fetch_stats()['metadata']['shared'] == 2
+
+if __name__ == "__main__":
+    print("🧪 Testing Single-Flight")
+    print("=" * 40)
+    test_concurrent_calls_share_result_and_error()
+    test_url_tools_coalesce_metadata_fetches()
+    print("✅ All single-flight tests passed!")
@@ -0,0 +1,16 @@
+import os
+import tempfile
+from benchmark_startup import measure_import
+
+def test_import_defers_heavy_modules():
+    """Importing the server loads no deferred modules and touches no database"""
+    with tempfile.TemporaryDirectory() as workdir:
+        probe = measure_import(workdir)
+        assert probe['loaded'] == []
+        assert os.listdir(workdir) == []
+
+if __name__ == "__main__":
+    print("🧪 Testing Server Startup")
+    print("=" * 40)
+    test_import_defers_heavy_modules()
+    print("✅ Startup test passed!")
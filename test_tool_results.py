@@ -0,0 +1,40 @@
+import asyncio
+from tool_results import SummaryFastMCP, SafetyReport, SavedURL
+
+def test_text_content_is_the_summary():
+    """Tools send their summary only as text and every other field as structured content"""
+    from fastmcp import Client
+
+    mcp = SummaryFastMCP("test")
+
+    @mcp.tool()
+    def check(url: str) -> SafetyReport:
+        return SafetyReport(result=f"🔒 {url} looks fine", url=url, is_safe=True, risk_level='low')
+
+    async def call():
+        async with Client(mcp) as client:
+            tools = await client.list_tools()
+            return tools[0].outputSchema, await client.call_tool("check", {"url": "https://www.python.org"})
+
+    schema, result = asyncio.run(call())
+    assert result.content[0].text == "🔒 https://www.python.org looks fine"
+    structured = result.structured_content
+    assert 'result' not in structured and 'result' not in schema['properties']
+    assert structured['is_safe'] is True
+    assert structured['risk_level'] == 'low'
+    assert structured['warnings'] == []
+
+def test_saved_url_from_storage_row():
+    """JSON-encoded tags and extra columns of a storage row are handled"""
+    row = {'id': 3, 'original_url': "https://www.python.org", 'tags': '["python", "docs"]',
+           'is_safe': 1, 'metadata': '{}'}
+    saved = SavedURL.from_row(row)
+    assert saved.tags == ["python", "docs"]
+    assert saved.is_safe is True
+
+if __name__ == "__main__":
+    print("🧪 Testing Tool Results")
+    print("=" * 40)
+    test_text_content_is_the_summary()
+    test_saved_url_from_storage_row()
+    print("✅ All tool result tests passed!")
@@ -0,0 +1,308 @@
+import json
+from typing import List, Dict, Any, Optional, Sequence
+from pydantic import BaseModel
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ContentBlock, TextContent, Tool as MCPTool
+
+class ToolResult(BaseModel):
+    """Fields shared by every tool result.
+
+    `result` is the human-readable summary (the text the tools always returned),
+    `error` is set when the call failed.
+    """
+    result: str
+    error: Optional[str] = None
+
+class SearchResult(ToolResult):
+    query: str = ""
+    cached: bool = False
+
+class DiceResult(ToolResult):
+    notation: str = ""
+    num_rolls: int = 1
+
+class ShortenResult(ToolResult):
+    id: Optional[int] = None
+    url: Optional[str] = None
+    shortened_url: Optional[str] = None
+    service: Optional[str] = None
+    custom_alias: Optional[str] = None
+    mirror_url: Optional[str] = None
+    mirror_service: Optional[str] = None
+    mirror_error: Optional[str] = None
+    title: Optional[str] = None
+    collection_name: Optional[str] = None
+    tags: List[str] = []
+    is_safe: Optional[bool] = None
+    safety_warnings: List[str] = []
+    link_warning: Optional[str] = None
+
+class ResolveResult(ToolResult):
+    code: Optional[str] = None
+    short_url: Optional[str] = None
+    original_url: Optional[str] = None
+    is_custom: bool = False
+    created_at: Optional[str] = None
+
+class BackendStatus(BaseModel):
+    name: str
+    service: str
+    state: str
+    window_calls: int = 0
+    error_rate: float = 0.0
+    slow_call_rate: float = 0.0
+    p50_seconds: Optional[float] = None
+    p95_seconds: Optional[float] = None
+    retry_in_seconds: Optional[float] = None
+    times_opened: int = 0
+
+class ShortenerStatusResult(ToolResult):
+    local_base_url: Optional[str] = None
+    backends: List[BackendStatus] = []
+
+class BatchItem(BaseModel):
+    """Outcome of one URL in a batch call"""
+    index: int
+    url: str
+    shortened_url: Optional[str] = None
+    summary: Optional[str] = None  # metadata and safety batches: the title or risk level
+    error: Optional[str] = None
+
+    def line(self) -> str:
+        """One-line summary, as shown in progress messages"""
+        if self.error is not None:
+            return f"{self.index + 1}. {self.url} → ERROR: {self.error}"
+        return f"{self.index + 1}. {self.url} → {self.shortened_url or self.summary}"
+
+class BatchShortenResult(ToolResult):
+    batch_id: Optional[str] = None
+    total: int = 0
+    succeeded: int = 0
+    collection_name: Optional[str] = None
+    tags: List[str] = []
+    items: List[BatchItem] = []
+    link_warning: Optional[str] = None
+
+class BatchResultsPage(ToolResult):
+    batch_id: str = ""
+    tool_name: Optional[str] = None
+    status: Optional[str] = None
+    completed: int = 0
+    total: int = 0
+    items: List[BatchItem] = []
+
+class JobSubmitted(ToolResult):
+    job_id: Optional[str] = None
+    kind: Optional[str] = None
+    total: int = 0
+
+class JobStatusResult(ToolResult):
+    job_id: str = ""
+    kind: Optional[str] = None
+    status: Optional[str] = None
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    created_at: Optional[str] = None
+    updated_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+class JobItem(BaseModel):
+    index: int
+    input: str
+    status: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class JobResultsPage(ToolResult):
+    job_id: str = ""
+    status: Optional[str] = None
+    completed: int = 0
+    total: int = 0
+    items: List[JobItem] = []
+
+class ValidationResult(ToolResult):
+    url: Optional[str] = None
+    is_valid: bool = False
+    is_reachable: bool = False
+    final_url: Optional[str] = None
+    status_code: Optional[int] = None
+    redirected: bool = False
+
+class URLMetadata(ToolResult):
+    url: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    domain: Optional[str] = None
+    is_secure: Optional[bool] = None
+    content_type: Optional[str] = None
+    content_length: Optional[int] = None
+    body_truncated: Optional[bool] = None
+    favicon_url: Optional[str] = None
+    image_url: Optional[str] = None
+    status_code: Optional[int] = None
+
+class SafetyReport(ToolResult):
+    url: Optional[str] = None
+    domain: Optional[str] = None
+    is_safe: Optional[bool] = None
+    risk_level: Optional[str] = None
+    warnings: List[str] = []
+
+class MetadataBatchResult(ToolResult):
+    batch_id: Optional[str] = None
+    total: int = 0
+    succeeded: int = 0
+    items: List[URLMetadata] = []
+
+class SafetyBatchResult(ToolResult):
+    batch_id: Optional[str] = None
+    total: int = 0
+    safe: int = 0
+    items: List[SafetyReport] = []
+
+class QRCode(BaseModel):
+    """One generated QR code; exactly one payload field is set for its format"""
+    url: Optional[str] = None
+    format: Optional[str] = None
+    size: Optional[str] = None
+    cached: Optional[bool] = None
+    qr_code_base64: Optional[str] = None
+    qr_code_svg: Optional[str] = None
+    qr_matrix_base64: Optional[str] = None
+    modules: Optional[int] = None
+    file_path: Optional[str] = None
+    error: Optional[str] = None
+
+class QRCodeResult(QRCode, ToolResult):
+    pass
+
+class QRBatchResult(ToolResult):
+    total: int = 0
+    succeeded: int = 0
+    cached: int = 0
+    codes: List[QRCode] = []
+
+class ExpandResult(ToolResult):
+    original_shortened: Optional[str] = None
+    final_url: Optional[str] = None
+    redirect_count: int = 0
+    redirect_chain: List[str] = []
+    status_code: Optional[int] = None
+
+class CollectionResult(ToolResult):
+    name: str = ""
+    description: Optional[str] = None
+    created: bool = False
+
+class SavedURL(BaseModel):
+    id: Optional[int] = None
+    original_url: Optional[str] = None
+    shortened_url: Optional[str] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    collection_name: Optional[str] = None
+    tags: List[str] = []
+    is_safe: Optional[bool] = None
+    created_at: Optional[str] = None
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "SavedURL":
+        """Build from a URLStorage row, whose tags column holds a JSON list"""
+        tags = row.get('tags')
+        if isinstance(tags, str):
+            try:
+                tags = json.loads(tags)
+            except ValueError:
+                tags = []
+        return cls(**{**{key: row.get(key) for key in cls.model_fields}, 'tags': tags or []})
+
+class URLListResult(ToolResult):
+    count: int = 0
+    urls: List[SavedURL] = []
+
+class Collection(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    created_at: Optional[str] = None
+
+class CollectionListResult(ToolResult):
+    collections: List[Collection] = []
+
+class LatencyStats(BaseModel):
+    """Latency summary of one tool, or of one operation within a tool"""
+    name: str
+    tool: Optional[str] = None
+    count: int = 0
+    errors: int = 0
+    mean_ms: float = 0.0
+    p50_ms: float = 0.0
+    p90_ms: float = 0.0
+    p99_ms: float = 0.0
+    max_ms: float = 0.0
+
+class MetricsResult(ToolResult):
+    uptime_seconds: float = 0.0
+    tools: List[LatencyStats] = []
+    operations: List[LatencyStats] = []
+    counters: Dict[str, float] = {}
+
+class ArmedProfile(BaseModel):
+    tool: str
+    remaining: int
+    mode: str
+
+class ProfilingStatus(ToolResult):
+    output_dir: Optional[str] = None
+    armed: List[ArmedProfile] = []
+    recent_dumps: List[str] = []
+
+class SummaryFastMCP(FastMCP):
+    """FastMCP server that sends a tool's text summary as its text content.
+
+    Structured content carries every other field of the result model, so the summary
+    goes over the wire once and the JSON is not dumped a second time as text. The
+    advertised output schemas leave `result` out to match. When a metrics.Metrics
+    registry is given, every tool call is timed and counted by outcome; a
+    profiling.ToolProfiler profiles the calls of the tools armed on it.
+    """
+
+    def __init__(self, name: str = None, metrics=None, profiler=None, **settings):
+        super().__init__(name, **settings)
+        self.metrics = metrics
+        self.profiler = profiler
+
+    async def _run_tool(self, name: str, arguments: Dict[str, Any]):
+        if self.profiler is not None and self.profiler.is_armed(name):
+            with self.profiler.profile_call(name):
+                return self._summarize(await super().call_tool(name, arguments))
+        return self._summarize(await super().call_tool(name, arguments))
+
+    @staticmethod
+    def _summarize(result):
+        if isinstance(result, tuple) and isinstance(result[1], dict) and isinstance(result[1].get('result'), str):
+            structured = {key: value for key, value in result[1].items() if key != 'result'}
+            return [TextContent(type="text", text=result[1]['result'])], structured
+        return result
+
+    async def list_tools(self) -> List[MCPTool]:
+        tools = await super().list_tools()
+        for tool in tools:
+            schema = tool.outputSchema
+            if schema and 'result' in schema.get('properties', {}):
+                tool.outputSchema = {
+                    **schema,
+                    'properties': {key: value for key, value in schema['properties'].items() if key != 'result'},
+                    'required': [key for key in schema.get('required', []) if key != 'result']
+                }
+        return tools
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[ContentBlock] | Dict[str, Any]:
+        if self.metrics is None:
+            return await self._run_tool(name, arguments)
+
+        with self.metrics.tool_call(name) as outcome:
+            result = await self._run_tool(name, arguments)
+            if isinstance(result, tuple) and result[1].get('error'):
+                outcome['status'] = 'error'
+            return result
@@ -1,12 +1,117 @@
 from langgraph.graph import StateGraph, END
-from typing import TypedDict, Annotated, Sequence, List, Optional
+from langchain_core.runnables import RunnableConfig
+from typing import TypedDict, Annotated, Sequence, Dict, List, Optional
 import operator
+import uuid
 import json
 import re
+import time
 import asyncio
-import subprocess
 from datetime import datetime
-from fastmcp import Client
+from mcp_session_pool import MCPSessionPool, DEFAULT_POOL_SIZE
+from graph_checkpoints import WorkflowCheckpoints, DEFAULT_CHECKPOINT_DB, DEFAULT_MAX_CHECKPOINT_AGE
+
+# Seconds a single tool call may take before the node records it as failed
+DEFAULT_CALL_TIMEOUT = 30.0
+# URLs fetched at once by a node's validate_url calls, or by the server for one batch call
+DEFAULT_URL_CONCURRENCY = 16
+# URLs per get_url_metadata_batch / check_url_safety_batch / generate_qr_codes_batch call
+URL_BATCH_SIZE = 20
+# Only URLs that look like documentation get a QR code during content analysis
+QR_URL_KEYWORDS = ('github', 'docs', 'python')
+# Seconds an analysis node may spend fetching URL details before deferring the rest
+DEFAULT_ANALYSIS_DEADLINE = 20.0
+# Share of the deadline (or call timeout) the server may spend on one URL, so slow URLs come back
+# as per-item errors instead of failing the whole batch call
+ITEM_DEADLINE_SHARE = 0.75
+# Uncached URLs an analysis node fetches at most; None for no limit
+DEFAULT_MAX_URL_FETCHES = 50
+# Successful URL details are reused across nodes and requests for this long
+URL_CACHE_TTL = 600.0
+MAX_CACHED_URLS = 1024
+# Requests process_requests runs at once
+DEFAULT_REQUEST_CONCURRENCY = 8
+
+# One pass over a request finds URLs, bare domains and "collection:"/"tags:" mentions.
+# Keyword values are captured in lookaheads, so URLs and domains inside them are still found.
+INPUT_TOKEN_PATTERN = re.compile(r'''
+    (?P<url>https?://[^\s<>"{}|\\^`\[\]]+)
+  | (?i:collection)[:\s]+(?=(?P<collection_quote>["']?)(?P<collection>[^"'\s]+)(?P=collection_quote))
+  | (?i:tags?)[:\s]+(?=(?P<tags_quote>["']?)(?P<tags>[^"'\n]+)(?P=tags_quote))
+  | (?P<domain>\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}\b)
+''', re.VERBOSE)
+# A keyword at the end of a line whose value may follow on the next one
+PENDING_KEYWORD_PATTERN = re.compile(r'(?<!\S)(?i:collection|tags?)[:\s]*\Z')
+MAX_PENDING_KEYWORD_LENGTH = 256
+# Buffered input is tokenized once it grows past this many characters
+INPUT_CHUNK_SIZE = 64 * 1024
+IGNORED_DOMAINS = frozenset({'example.com', 'test.com'})
+
+def _domain_suffixes(host: str) -> List[str]:
+    """'docs.python.org' -> ['docs.python.org', 'python.org', 'org']"""
+    parts = host.lower().split('.')
+    return ['.'.join(parts[i:]) for i in range(len(parts))]
+
+class InputParser:
+    """Incremental single-pass tokenizer for user requests.
+    
+    feed() the text in chunks of any size, then close() for (urls, collection_name, tags).
+    URLs keep their order of appearance without duplicates and are followed by bare domains
+    (as https URLs) that no URL or earlier domain covers. The first collection and tags
+    mentions win. Only the unfinished last line is held back between chunks.
+    """
+    
+    def __init__(self):
+        # Dicts as insertion-ordered sets
+        self._urls = {}
+        self._domains = {}
+        self.collection_name = None
+        self.tags = None
+        self._buffer = ""
+    
+    def feed(self, text: str) -> "InputParser":
+        self._buffer += text
+        if len(self._buffer) >= INPUT_CHUNK_SIZE:
+            cut = self._buffer.rfind('\n') + 1
+            if cut:
+                pending = PENDING_KEYWORD_PATTERN.search(self._buffer, max(0, cut - MAX_PENDING_KEYWORD_LENGTH), cut)
+                if pending:
+                    cut = pending.start()
+                self._scan(cut)
+                self._buffer = self._buffer[cut:]
+        return self
+    
+    def close(self) -> tuple:
+        self._scan(len(self._buffer))
+        self._buffer = ""
+        
+        urls = list(self._urls)
+        covered = set()
+        for url in urls:
+            host = url.split('/', 3)[2].rpartition('@')[2].split(':')[0]
+            covered.update(_domain_suffixes(host))
+        for domain in self._domains:
+            if domain.lower() not in covered and domain not in IGNORED_DOMAINS:
+                urls.append(f"https://{domain}")
+                covered.update(_domain_suffixes(domain))
+        return urls, self.collection_name, self.tags
+    
+    def _scan(self, end: int):
+        for match in INPUT_TOKEN_PATTERN.finditer(self._buffer, 0, end):
+            kind = match.lastgroup
+            if kind == 'url':
+                self._urls[match.group('url')] = None
+            elif kind == 'domain':
+                self._domains[match.group('domain')] = None
+            elif kind == 'collection':
+                if self.collection_name is None:
+                    self.collection_name = match.group('collection')
+            elif self.tags is None:
+                self.tags = match.group('tags')
+
+def parse_user_input(text: str) -> tuple:
+    """(urls, collection_name, tags) mentioned in a request; see InputParser"""
+    return InputParser().feed(text).close()
 
 class URLManagerState(TypedDict):
     """State for the URL Manager workflow"""
@@ -20,23 +125,203 @@ class URLManagerState(TypedDict):
     processed_urls: List[dict]
     workflow_summary: str
     error_messages: List[str]
+    deferred_urls: List[str]  # URLs left unanalyzed by the deadline or fetch budget
 
 class SmartURLManager:
-    def __init__(self, mcp_server_path: str = "server.py"):
-        """Initialize the Smart URL Manager with MCP integration"""
+    def __init__(self, mcp_server_path: str = "server.py", pool_size: int = DEFAULT_POOL_SIZE,
+                 url_concurrency: int = DEFAULT_URL_CONCURRENCY, call_timeout: float = DEFAULT_CALL_TIMEOUT,
+                 analysis_deadline: float = DEFAULT_ANALYSIS_DEADLINE,
+                 max_url_fetches: Optional[int] = DEFAULT_MAX_URL_FETCHES,
+                 checkpoint_db: Optional[str] = DEFAULT_CHECKPOINT_DB):
+        """Initialize the Smart URL Manager with MCP integration.
+        
+        Tool calls share a pool of long-lived server sessions across nodes and requests.
+        Use the manager as an async context manager (or call aclose()) to shut them down.
+        Nodes fetch up to `url_concurrency` URLs at once and give up on a tool call (or a
+        single URL in a batch call) after `call_timeout` seconds. Metadata, safety and QR
+        codes come from batch tools, one call per tool for every URL_BATCH_SIZE URLs.
+        An analysis node fetches details for at most
+        `max_url_fetches` uncached URLs within `analysis_deadline` seconds and defers the rest.
+        Runs are checkpointed after every node in the SQLite file `checkpoint_db` (None to
+        turn this off), so a failed run resumes where it stopped; see process_request.
+        """
         self.mcp_server_path = mcp_server_path
+        self.sessions = MCPSessionPool(mcp_server_path, size=pool_size)
+        self.url_concurrency = url_concurrency
+        self.call_timeout = call_timeout
+        self.analysis_deadline = analysis_deadline
+        self.max_url_fetches = max_url_fetches
+        self._url_cache = {}  # url -> {field: (stored_at, value)}
+        self._runs: Dict[str, asyncio.Future] = {}  # run ID -> workflow run in flight
+        self.checkpoints = WorkflowCheckpoints(checkpoint_db) if checkpoint_db else None
+        # Compiled again with the checkpointer once the checkpoint file is opened
         self.workflow = self._create_workflow()
-        
-    async def _call_mcp_tool(self, tool_name: str, parameters: dict):
-        """Call MCP tool using fastmcp client"""
+    
+    async def __aenter__(self):
+        await self.sessions.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the MCP server sessions and the checkpoint file"""
+        await self.sessions.close()
+        if self.checkpoints:
+            await self.checkpoints.close()
+        
+    async def _call_mcp_tool(self, tool_name: str, parameters: dict, timeout: Optional[float] = None) -> dict:
+        """Call MCP tool on a pooled session and return its structured result.
+        
+        Every tool result has an `error` field plus typed fields for its payload (see
+        tool_results.py); its text content is returned as `result`, the text summary.
+        `timeout` defaults to call_timeout.
+        """
+        timeout = timeout or self.call_timeout
         try:
-            async with Client(self.mcp_server_path) as client:
-                result = await client.call_tool(tool_name, parameters)
-                return result.data.result
+            result = await asyncio.wait_for(self.sessions.call_tool(tool_name, parameters), timeout)
+            summary = "".join(block.text for block in result.content if block.type == "text")
+            return {**(result.structured_content or {}), 'result': summary}
+        except asyncio.TimeoutError:
+            error = f"{tool_name} timed out after {timeout:g}s"
+            return {'result': f"Error calling {tool_name}: {error}", 'error': error}
         except Exception as e:
-            return f"Error calling {tool_name}: {str(e)}"
+            return {'result': f"Error calling {tool_name}: {str(e)}", 'error': str(e)}
+    
+    async def _map_urls(self, urls: List[str], work) -> list:
+        """Run `work(url)` for every URL, at most url_concurrency at once; results keep the input order"""
+        slots = asyncio.Semaphore(self.url_concurrency)
+        
+        async def run(url):
+            async with slots:
+                return await work(url)
+        
+        return await asyncio.gather(*(run(url) for url in urls))
+    
+    def _cached_details(self, url: str) -> dict:
+        now = time.monotonic()
+        return {field: value for field, (stored_at, value) in self._url_cache.get(url, {}).items()
+                if now - stored_at < URL_CACHE_TTL}
+    
+    @staticmethod
+    def _successful_fields(details: dict) -> dict:
+        return {field: value for field, value in details.items()
+                if field in ("metadata", "safety", "qr_code") and value and not (isinstance(value, dict) and value.get("error"))}
+    
+    def _cache_details(self, url: str, details: dict):
+        """Keep the fields of `details` that succeeded, for later nodes and requests"""
+        kept = self._successful_fields(details)
+        if not kept:
+            return
+        # Each field keeps its own timestamp, so refreshing one does not extend the others
+        now = time.monotonic()
+        fields = self._url_cache.pop(url, {})
+        fields.update((field, (now, value)) for field, value in kept.items())
+        self._url_cache[url] = fields
+        while len(self._url_cache) > MAX_CACHED_URLS:
+            self._url_cache.pop(next(iter(self._url_cache)))
+    
+    @staticmethod
+    def _run_id(config: Optional[RunnableConfig]) -> Optional[str]:
+        return ((config or {}).get("configurable") or {}).get("thread_id")
+    
+    async def _memoized(self, run_id: Optional[str], field: str, urls: List[str]) -> dict:
+        """Results of `field` this run already has, by URL (nothing without checkpoints)"""
+        if not (self.checkpoints and run_id and urls):
+            return {}
+        return await asyncio.to_thread(self.checkpoints.get_url_results, run_id, field, urls)
+    
+    async def _memoize(self, run_id: Optional[str], field: str, results: dict):
+        """Record finished per-URL results, so a resumed node does not fetch them again"""
+        if self.checkpoints and run_id and results:
+            await asyncio.to_thread(self.checkpoints.put_url_results, run_id, field, results)
+    
+    @staticmethod
+    def _wants_qr(url: str) -> bool:
+        return any(keyword in url.lower() for keyword in QR_URL_KEYWORDS)
+    
+    @staticmethod
+    def _missing_fields(details: dict, with_qr: bool) -> List[str]:
+        fields = ["metadata", "safety"] + (["qr_code"] if with_qr else [])
+        return [field for field in fields if field not in details]
+    
+    async def _inspect_urls(self, known: Dict[str, dict], with_qr, run_id: Optional[str] = None) -> List[dict]:
+        """Fetch the metadata, safety and QR codes missing from `known` (url -> details), one batch call per tool"""
+        urls = list(known)
+        details = {url: {**known[url], "url": url} for url in urls}
+        missing = {url: self._missing_fields(details[url], with_qr(url)) for url in urls}
+        per_url = {"max_concurrency": self.url_concurrency,
+                   "item_timeout": min(self.call_timeout, self.analysis_deadline * ITEM_DEADLINE_SHARE)}
+        batch_tools = {
+            "metadata": ("get_url_metadata_batch", "items", per_url),
+            "safety": ("check_url_safety_batch", "items", per_url),
+            "qr_code": ("generate_qr_codes_batch", "codes", {"size": 8})
+        }
         
-    def _create_workflow(self) -> StateGraph:
+        needed = {field: [url for url in urls if field in missing[url]] for field in batch_tools}
+        needed = {field: field_urls for field, field_urls in needed.items() if field_urls}
+        
+        async def fetch(field: str, field_urls: List[str]):
+            tool_name, items_key, parameters = batch_tools[field]
+            # One URL per line; the trailing newline keeps a single URL containing commas intact
+            batch = await self._call_mcp_tool(tool_name, {"urls": "\n".join(field_urls) + "\n", **parameters},
+                                              timeout=self.analysis_deadline)
+            # Items come back in request order; a failed call leaves none
+            items = batch.get(items_key) or []
+            for index, url in enumerate(field_urls):
+                item = items[index] if index < len(items) else {"result": batch["result"], "error": batch.get("error") or "Missing from batch result"}
+                # QR code generation is optional
+                details[url][field] = ("Generated" if not item.get("error") else None) if field == "qr_code" else item
+                # Cached per call, so a chunk cut off at the deadline keeps the fields that did arrive
+                self._cache_details(url, {field: details[url][field]})
+        
+        await asyncio.gather(*(fetch(field, field_urls) for field, field_urls in needed.items()))
+        await self._memoize(run_id, "details", {url: kept for url in urls if (kept := self._successful_fields(details[url]))})
+        return [details[url] for url in urls]
+    
+    async def _analyze_within_budget(self, urls: List[str], with_qr=lambda url: False,
+                                     run_id: Optional[str] = None) -> tuple:
+        """Fetch URL details for as many URLs as fit the fetch budget and deadline.
+        
+        URLs whose details are fully cached, or memoized by an earlier attempt of run
+        `run_id`, cost nothing and are always returned. The rest
+        are sent in batches of URL_BATCH_SIZE, uncached first, then partially cached; those
+        over max_url_fetches, or still missing fields when analysis_deadline cuts their batch
+        off, are deferred.
+        Returns (details, deferred URLs), both in input order.
+        """
+        urls = list(dict.fromkeys(urls))
+        memoized = await self._memoized(run_id, "details", urls)
+        cached = {url: {**memoized.get(url, {}), **self._cached_details(url)} for url in urls}
+        free = {url for url in urls if not self._missing_fields(cached[url], with_qr(url))}
+        # sorted() is stable, so URLs keep their input order within each priority
+        pending = sorted((url for url in urls if url not in free), key=lambda url: bool(cached[url]))
+        if self.max_url_fetches is not None:
+            pending = pending[:self.max_url_fetches]
+        
+        details = {url: {**cached[url], "url": url} for url in free}
+        tasks = {}
+        for start in range(0, len(pending), URL_BATCH_SIZE):
+            chunk = tuple(pending[start:start + URL_BATCH_SIZE])
+            tasks[chunk] = asyncio.ensure_future(self._inspect_urls({url: cached[url] for url in chunk}, with_qr, run_id))
+        
+        if tasks:
+            done, unfinished = await asyncio.wait(tasks.values(), timeout=self.analysis_deadline)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+            for chunk, task in tasks.items():
+                if task in done:
+                    details.update(zip(chunk, task.result()))
+                    continue
+                for url in chunk:
+                    fetched = {**cached[url], **self._cached_details(url)}
+                    if not self._missing_fields(fetched, with_qr(url)):
+                        details[url] = {**fetched, "url": url}
+        
+        return [details[url] for url in urls if url in details], [url for url in urls if url not in details]
+    
+    def _create_workflow(self, checkpointer=None) -> StateGraph:
         """Create the LangGraph workflow"""
         workflow = StateGraph(URLManagerState)
         
@@ -71,33 +356,14 @@ class SmartURLManager:
         workflow.add_edge("organize_urls", "generate_summary")
         workflow.add_edge("generate_summary", END)
         
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
     
     def _parse_input_node(self, state: URLManagerState) -> URLManagerState:
         """Parse user input to extract URLs and understand the request"""
         user_input = state["messages"][-1] if state["messages"] else ""
         
-        # Extract URLs using regex
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, user_input)
-        
-        # Also look for domain names that might need protocol
-        domain_pattern = r'\b(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,}\b'
-        potential_domains = re.findall(domain_pattern, user_input)
-        
-        # Filter out URLs already found and add protocol
-        for domain in potential_domains:
-            full_url = f"https://{domain}"
-            if not any(domain in url for url in urls) and domain not in ['example.com', 'test.com']:
-                urls.append(full_url)
-        
-        # Extract collection name if mentioned
-        collection_match = re.search(r'collection[:\s]+(["\']?)([^"\'\\s]+)\1', user_input, re.IGNORECASE)
-        collection_name = collection_match.group(2) if collection_match else None
-        
-        # Extract tags if mentioned  
-        tags_match = re.search(r'tags?[:\s]+(["\']?)([^"\'\\n]+)\1', user_input, re.IGNORECASE)
-        tags = tags_match.group(2) if tags_match else None
+        # URLs, bare domains (given an https:// scheme), collection name and tags in one pass
+        urls, collection_name, tags = parse_user_input(user_input)
         
         state["urls"] = urls
         state["collection_name"] = collection_name
@@ -105,6 +371,7 @@ class SmartURLManager:
         state["analysis_results"] = {}
         state["processed_urls"] = []
         state["error_messages"] = []
+        state["deferred_urls"] = []
         
         return state
     
@@ -153,7 +420,7 @@ class SmartURLManager:
         else:
             return "batch_process"  # Default fallback
     
-    async def _validate_urls_node(self, state: URLManagerState) -> URLManagerState:
+    async def _validate_urls_node(self, state: URLManagerState, config: Optional[RunnableConfig] = None) -> URLManagerState:
         """Validate URLs for format and reachability"""
         urls = state["urls"]
         
@@ -161,29 +428,29 @@ class SmartURLManager:
             state["error_messages"].append("No URLs provided for validation")
             return state
         
-        validation_results = []
+        run_id = self._run_id(config)
+        memoized = await self._memoized(run_id, "validation", urls)
         
-        for url in urls:
-            try:
+        async def validate(url: str) -> dict:
+            result = memoized.get(url)
+            if result is None:
                 result = await self._call_mcp_tool("validate_url", {"url": url})
-                validation_results.append({
-                    "url": url,
-                    "validation": result,
-                    "status": "validated"
-                })
-            except Exception as e:
-                validation_results.append({
-                    "url": url,
-                    "validation": {"error": str(e)},
-                    "status": "error"
-                })
+                if not result.get("error"):
+                    await self._memoize(run_id, "validation", {url: result})
+            return {
+                "url": url,
+                "validation": result,
+                "status": "validated"
+            }
+        
+        validation_results = await self._map_urls(urls, validate)
         
         state["processed_urls"] = validation_results
         state["analysis_results"]["validation"] = validation_results
         
         return state
     
-    async def _process_batch_node(self, state: URLManagerState) -> URLManagerState:
+    async def _process_batch_node(self, state: URLManagerState, config: Optional[RunnableConfig] = None) -> URLManagerState:
         """Process multiple URLs for shortening"""
         urls = state["urls"]
         
@@ -193,44 +460,40 @@ class SmartURLManager:
         
         # Prepare batch input
         urls_text = "\n".join(urls)
+        run_id = self._run_id(config)
         
-        try:
+        async def shorten() -> dict:
+            # A resumed run must not save the same URLs twice; the batch is recorded under ""
+            memoized = await self._memoized(run_id, "batch_processing", [""])
+            if "" in memoized:
+                return memoized[""]
             result = await self._call_mcp_tool("shorten_url_batch", {
                 "urls": urls_text,
-                "collection_name": state.get("collection_name", ""),
-                "tags": state.get("tags", "")
+                "collection_name": state.get("collection_name") or "",
+                "tags": state.get("tags") or "",
+                "item_timeout": self.call_timeout * ITEM_DEADLINE_SHARE
             })
+            if not result.get("error"):
+                await self._memoize(run_id, "batch_processing", {"": result})
+            return result
+        
+        try:
+            # Shorten the batch while individual URL details are fetched for further analysis
+            result, (url_details, deferred) = await asyncio.gather(
+                shorten(),
+                self._analyze_within_budget(urls, run_id=run_id)
+            )
             
             state["analysis_results"]["batch_processing"] = result
-            
-            # Also get individual URL details for further analysis
-            url_details = []
-            for url in urls[:3]:  # Limit to first 3 for performance
-                try:
-                    metadata = await self._call_mcp_tool("get_url_metadata", {"url": url})
-                    safety = await self._call_mcp_tool("check_url_safety", {"url": url})
-                    
-                    url_details.append({
-                        "url": url,
-                        "metadata": metadata,
-                        "safety": safety,
-                        "status": "processed"
-                    })
-                except Exception as e:
-                    url_details.append({
-                        "url": url,
-                        "error": str(e),
-                        "status": "error"
-                    })
-            
-            state["processed_urls"] = url_details
+            state["processed_urls"] = [{**details, "status": "processed"} for details in url_details]
+            state["deferred_urls"] = deferred
             
         except Exception as e:
             state["error_messages"].append(f"Batch processing failed: {str(e)}")
         
         return state
     
-    async def _analyze_content_node(self, state: URLManagerState) -> URLManagerState:
+    async def _analyze_content_node(self, state: URLManagerState, config: Optional[RunnableConfig] = None) -> URLManagerState:
         """Analyze content of URLs for metadata and safety"""
         urls = state["urls"]
         
@@ -238,38 +501,13 @@ class SmartURLManager:
             # If no new URLs, work with already processed ones
             urls = [item["url"] for item in state.get("processed_urls", []) if "url" in item]
         
-        analysis_results = []
-        
-        for url in urls[:3]:  # Limit for performance
-            try:
-                # Get comprehensive metadata
-                metadata = await self._call_mcp_tool("get_url_metadata", {"url": url})
-                safety = await self._call_mcp_tool("check_url_safety", {"url": url})
-                
-                # Generate QR code for important URLs
-                qr_code = None
-                if any(keyword in url.lower() for keyword in ['github', 'docs', 'python']):
-                    try:
-                        qr_result = await self._call_mcp_tool("generate_qr_code", {"url": url, "size": 8})
-                        qr_code = "Generated" if "QR Code Generated" in str(qr_result) else None
-                    except:
-                        pass  # QR code generation is optional
-                
-                analysis_results.append({
-                    "url": url,
-                    "metadata": metadata,
-                    "safety": safety,
-                    "qr_code": qr_code,
-                    "analysis_timestamp": datetime.now().isoformat(),
-                    "status": "analyzed"
-                })
-                
-            except Exception as e:
-                analysis_results.append({
-                    "url": url,
-                    "error": str(e),
-                    "status": "error"
-                })
+        # Generate QR codes for important URLs alongside metadata and safety
+        url_details, state["deferred_urls"] = await self._analyze_within_budget(urls, self._wants_qr, self._run_id(config))
+        analysis_timestamp = datetime.now().isoformat()
+        analysis_results = [
+            {"qr_code": None, **details, "analysis_timestamp": analysis_timestamp, "status": "analyzed"}
+            for details in url_details
+        ]
         
         # Update or extend processed URLs
         if state.get("processed_urls"):
@@ -297,13 +535,9 @@ class SmartURLManager:
             processed_urls = state.get("processed_urls", [])
             domains = set()
             for item in processed_urls:
-                if isinstance(item.get("metadata"), str) and "Domain:" in item["metadata"]:
-                    # Extract domain from metadata string
-                    lines = item["metadata"].split('\n')
-                    domain_line = next((line for line in lines if 'Domain:' in line), None)
-                    if domain_line:
-                        domain = domain_line.split('Domain:')[-1].strip()
-                        domains.add(domain)
+                domain = (item.get("metadata") or {}).get("domain")
+                if domain:
+                    domains.add(domain)
             
             if domains:
                 if len(domains) == 1:
@@ -319,7 +553,7 @@ class SmartURLManager:
                 "name": collection_name,
                 "description": f"Auto-created collection for workflow on {datetime.now().strftime('%Y-%m-%d %H:%M')}"
             })
-        except:
+        except Exception:
             pass  # Collection might already exist
         
         # Update state with final collection name
@@ -360,30 +594,28 @@ class SmartURLManager:
             for item in processed_urls:
                 url = item.get("url", "Unknown URL")
                 validation = item.get("validation", {})
-                if isinstance(validation, str) and "❌" in validation:
+                if validation.get("error"):
                     summary += f"❌ **{url}**: Validation failed\n"
-                elif isinstance(validation, str) and "✅" in validation:
+                elif validation.get("is_reachable"):
                     summary += f"✅ **{url}**: Valid and reachable\n"
+                elif validation.get("is_valid"):
+                    summary += f"⚠️ **{url}**: Valid but not reachable\n"
                 else:
                     summary += f"ℹ️ **{url}**: Validation completed\n"
         
         elif operation == "batch_process":
-            batch_result = analysis_results.get("batch_processing", "No batch results")
-            if isinstance(batch_result, str) and len(batch_result) > 100:
-                # Truncate long results
-                summary += f"📊 **Batch Processing**: Successfully processed {len(urls)} URLs\n\n"
+            batch_result = analysis_results.get("batch_processing") or {"result": "No batch results"}
+            if batch_result.get("error") or "items" not in batch_result:
+                summary += f"📊 **Batch Processing Results**:\n{batch_result['result']}\n\n"
             else:
-                summary += f"📊 **Batch Processing Results**:\n{batch_result}\n\n"
+                summary += f"📊 **Batch Processing**: Successfully processed {batch_result['succeeded']}/{batch_result['total']} URLs\n\n"
             
             if processed_urls:
                 summary += "📄 **Content Analysis Summary**:\n"
                 for item in processed_urls[:3]:  # Show first 3
                     url = item.get("url", "Unknown")
-                    if isinstance(item.get("metadata"), str):
-                        # Extract title from metadata string
-                        metadata = item["metadata"]
-                        title_line = next((line for line in metadata.split('\n') if 'Title:' in line), None)
-                        title = title_line.split('Title:')[-1].strip() if title_line else "No title"
+                    if item.get("metadata"):
+                        title = item["metadata"].get("title") or "No title"
                         summary += f"• **{title[:50]}...** ({url})\n"
                     else:
                         summary += f"• **{url}**\n"
@@ -395,23 +627,16 @@ class SmartURLManager:
                 summary += f"### URL Analysis\n"
                 summary += f"**URL**: {url}\n"
                 
-                if isinstance(item.get("metadata"), str):
-                    metadata = item["metadata"]
-                    lines = metadata.split('\n')
-                    
-                    title_line = next((line for line in lines if 'Title:' in line), None)
-                    if title_line:
-                        title = title_line.split('Title:')[-1].strip()
-                        summary += f"**Title**: {title}\n"
-                    
-                    desc_line = next((line for line in lines if 'Description:' in line), None)
-                    if desc_line:
-                        desc = desc_line.split('Description:')[-1].strip()
-                        summary += f"**Description**: {desc[:100]}...\n"
+                metadata = item.get("metadata") or {}
+                if metadata.get("title"):
+                    summary += f"**Title**: {metadata['title']}\n"
+                if metadata.get("description"):
+                    summary += f"**Description**: {metadata['description'][:100]}...\n"
                 
-                if isinstance(item.get("safety"), str) and "✅" in item["safety"]:
+                safety = item.get("safety") or {}
+                if safety.get("is_safe") is True:
                     summary += f"**Safety**: ✅ Safe\n"
-                elif isinstance(item.get("safety"), str) and "⚠️" in item["safety"]:
+                elif safety.get("is_safe") is False:
                     summary += f"**Safety**: ⚠️ Warning\n"
                     
                 if item.get("qr_code"):
@@ -424,6 +649,16 @@ class SmartURLManager:
             summary += f"Collection: {state.get('collection_name', 'None')}\n"
             summary += f"URLs organized: {len(processed_urls)}\n\n"
         
+        deferred_urls = state.get("deferred_urls") or []
+        if deferred_urls:
+            budget = f"{self.analysis_deadline:g}s"
+            if self.max_url_fetches is not None:
+                budget += f", {self.max_url_fetches} URL fetches"
+            summary += f"\n⏳ **Deferred**: {len(deferred_urls)} URLs were not analyzed within the budget ({budget}):\n"
+            for url in deferred_urls:
+                summary += f"• {url}\n"
+            summary += "\n"
+        
         # Add error summary if any
         if error_messages:
             summary += "## ⚠️ Errors Encountered\n\n"
@@ -451,8 +686,26 @@ class SmartURLManager:
         
         return state
     
-    async def process_request(self, user_input: str) -> str:
-        """Process a user request through the workflow"""
+    async def process_request(self, user_input: str, request_id: Optional[str] = None) -> str:
+        """Process a user request through the workflow.
+        
+        `request_id` names the run; without one every call is a new run. If an earlier run
+        with that ID failed within DEFAULT_MAX_CHECKPOINT_AGE, this call resumes it after its
+        last completed node, and URLs it already fetched are not fetched again. Concurrent
+        calls with the same ID share one run. Checkpoints are dropped once a run completes.
+        """
+        run_id = request_id or uuid.uuid4().hex
+        if run_id in self._runs:
+            return await asyncio.shield(self._runs[run_id])
+        
+        run = self._runs[run_id] = asyncio.ensure_future(self._run_workflow(user_input, run_id))
+        try:
+            return await run
+        finally:
+            self._runs.pop(run_id, None)
+    
+    async def _run_workflow(self, user_input: str, run_id: str) -> str:
+        config = {"configurable": {"thread_id": run_id}}
         initial_state = URLManagerState(
             messages=[user_input],
             urls=[],
@@ -463,16 +716,68 @@ class SmartURLManager:
             analysis_results={},
             processed_urls=[],
             workflow_summary="",
-            error_messages=[]
+            error_messages=[],
+            deferred_urls=[]
         )
         
+        if self.checkpoints:
+            saver = await self.checkpoints.open()
+            if self.workflow.checkpointer is not saver:
+                self.workflow = self._create_workflow(saver)
+            age = await self.checkpoints.last_checkpoint_age(run_id)
+            if age is not None:
+                snapshot = await self.workflow.aget_state(config)
+                if snapshot.next and age < DEFAULT_MAX_CHECKPOINT_AGE:
+                    # Continue from the last completed node with the checkpointed state
+                    initial_state = None
+                else:
+                    await self.checkpoints.delete_thread(run_id)
+        
         # Run the workflow
-        final_state = await self.workflow.ainvoke(initial_state)
+        final_state = await self.workflow.ainvoke(initial_state, config)
         
+        if self.checkpoints:
+            await self.checkpoints.delete_thread(run_id)
         return final_state["workflow_summary"]
+    
+    async def process_requests(self, user_inputs: List[str],
+                               max_concurrency: int = DEFAULT_REQUEST_CONCURRENCY) -> List[str]:
+        """Process many requests concurrently; each runs the workflow with its own state.
+        
+        The requests share the compiled workflow, the session pool and the URL cache.
+        Summaries are returned in input order.
+        """
+        slots = asyncio.Semaphore(max_concurrency)
+        
+        async def run(user_input):
+            async with slots:
+                return await self.process_request(user_input)
+        
+        return await asyncio.gather(*(run(user_input) for user_input in user_inputs))
+
+_shared_manager = None
+_shared_loop = None
+
+def shared_manager() -> SmartURLManager:
+    """The SmartURLManager reused by run_smart_url_manager calls on the running event loop.
+    
+    Sessions belong to the loop that opened them, so a new event loop gets a new manager.
+    """
+    global _shared_manager, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_manager is None or _shared_loop is not loop:
+        # Sessions open on the first tool call, so concurrent first callers share this one
+        _shared_manager, _shared_loop = SmartURLManager(), loop
+    return _shared_manager
+
+async def close_shared_manager():
+    """Close the sessions of the shared manager, e.g. before the event loop ends"""
+    global _shared_manager, _shared_loop
+    if _shared_manager is not None:
+        manager, _shared_manager, _shared_loop = _shared_manager, None, None
+        await manager.aclose()
 
-# Helper function to create and run the URL manager
+# Helper function to run the URL manager
 async def run_smart_url_manager(user_input: str) -> str:
-    """Convenience function to run the Smart URL Manager"""
-    manager = SmartURLManager()
-    return await manager.process_request(user_input) 
\ No newline at end of file
+    """Convenience function to run the Smart URL Manager on the shared manager"""
+    return await shared_manager().process_request(user_input) 
\ No newline at end of file
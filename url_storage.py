@@ -10,7 +10,7 @@ class URLStorage:
     
     def init_database(self):
         """Create tables for URL storage"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -43,18 +43,13 @@ class URLStorage:
         conn.commit()
         conn.close()
     
-    def save_url(self, original: str, shortened: str, **kwargs) -> int:
-        """Save URL information to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO urls (
-                original_url, shortened_url, custom_alias, title, 
-                description, tags, collection_name, service_used, 
-                is_safe, metadata
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+    def connect(self) -> sqlite3.Connection:
+        """Open a connection to the URL database"""
+        # Wait for other writers (threads or server worker processes) rather than failing fast
+        return sqlite3.connect(self.db_path, timeout=30)
+    
+    def _url_row(self, original: str, shortened: str, kwargs: Dict[str, Any]) -> tuple:
+        return (
             original,
             shortened,
             kwargs.get('custom_alias'),
@@ -65,16 +60,45 @@ class URLStorage:
             kwargs.get('service_used'),
             kwargs.get('is_safe', True),
             json.dumps(kwargs.get('metadata', {}))
-        ))
+        )
+    
+    def save_url(self, original: str, shortened: str, **kwargs) -> int:
+        """Save URL information to database"""
+        return self.save_urls([dict(kwargs, original=original, shortened=shortened)])[0]
+    
+    def save_urls(self, records: List[Dict[str, Any]], conn: sqlite3.Connection = None) -> List[int]:
+        """Save many URL records in a single transaction and return their IDs in order.
+        
+        When a connection is passed, the caller owns the transaction and commits it.
+        """
+        own_connection = conn is None
+        if own_connection:
+            conn = self.connect()
+        cursor = conn.cursor()
         
-        url_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return url_id
+        url_ids = []
+        try:
+            for record in records:
+                cursor.execute('''
+                    INSERT INTO urls (
+                        original_url, shortened_url, custom_alias, title, 
+                        description, tags, collection_name, service_used, 
+                        is_safe, metadata
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', self._url_row(record['original'], record['shortened'], record))
+                url_ids.append(cursor.lastrowid)
+            
+            if own_connection:
+                conn.commit()
+        finally:
+            if own_connection:
+                conn.close()
+        
+        return url_ids
     
     def get_urls(self, collection: str = None, tags: List[str] = None, limit: int = 100) -> List[Dict]:
         """Retrieve URLs with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
         
         query = "SELECT * FROM urls WHERE 1=1"
@@ -102,7 +126,7 @@ class URLStorage:
     
     def search_urls(self, search_term: str, limit: int = 50) -> List[Dict]:
         """Search URLs by title, description, or original URL"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -119,8 +143,8 @@ class URLStorage:
     
     def create_collection(self, name: str, description: str = "") -> bool:
         """Create a new URL collection"""
+        conn = self.connect()
         try:
-            conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -128,14 +152,16 @@ class URLStorage:
             ''', (name, description))
             
             conn.commit()
-            conn.close()
             return True
         except sqlite3.IntegrityError:
             return False  # Collection already exists
+        finally:
+            # A failed INSERT leaves its transaction open, locking the database until closed
+            conn.close()
     
     def get_collections(self) -> List[Dict]:
         """Get all collections"""
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
         
         cursor.execute("SELECT * FROM collections ORDER BY created_at DESC")